@@ -2,6 +2,8 @@
 ASGI config for backend_project project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+/api/tasks/events (Server-Sent Events) is served by tasks.sse; everything
+else goes to Django.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
@@ -13,4 +15,14 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend_project.settings')
 
-application = get_asgi_application()
\ No newline at end of file
+django_application = get_asgi_application()
+
+# Imported after Django is set up
+from tasks.sse import EVENTS_PATH, task_events_app  # noqa: E402
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'http' and scope['path'].rstrip('/') == EVENTS_PATH:
+        await task_events_app(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)
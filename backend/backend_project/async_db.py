@@ -0,0 +1,31 @@
+"""
+Motor (async pymongo) access for the async views.
+
+Motor clients are bound to an event loop, so one client is kept per loop.
+The database is the one MongoEngine is configured with, so both stacks
+read and write the same collections.
+"""
+import asyncio
+import weakref
+
+from django.conf import settings
+
+_clients = weakref.WeakKeyDictionary()
+
+
+def get_database():
+    """Motor database for the running event loop"""
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from mongoengine.connection import get_db
+
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = AsyncIOMotorClient(settings.MONGODB_URI, io_loop=loop, **settings.MONGODB_CLIENT_OPTIONS)
+        _clients[loop] = client
+    return client[get_db().name]
+
+
+def get_collection(document):
+    """Motor collection backing a MongoEngine document class"""
+    return get_database()[document._get_collection_name()]
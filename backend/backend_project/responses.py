@@ -0,0 +1,71 @@
+"""
+JSON response layer shared by the API views.
+
+Encodes with orjson when it is installed and falls back to the stdlib json
+module otherwise. Both paths handle datetime and ObjectId values.
+"""
+import json
+import time
+from datetime import date, datetime
+
+from bson import ObjectId
+from django.http import HttpResponse
+from django.utils.functional import Promise
+from rest_framework.renderers import JSONRenderer
+
+from monitoring.context import current
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _default(value):
+    """Encode types neither encoder handles on its own"""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Promise):
+        return str(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def _dumps(data):
+    if orjson is not None:
+        return orjson.dumps(data, default=_default)
+    return json.dumps(data, default=_default, separators=(',', ':')).encode('utf-8')
+
+
+def dumps(data):
+    """Serialize data to JSON bytes, timed against the current request"""
+    metrics = current()
+    if metrics is None:
+        return _dumps(data)
+    start = time.perf_counter()
+    try:
+        return _dumps(data)
+    finally:
+        metrics.add_serialization(time.perf_counter() - start)
+
+
+class JsonResponse(HttpResponse):
+    """
+    Drop-in replacement for django.http.JsonResponse using the fast encoder
+    """
+
+    def __init__(self, data, safe=True, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError('In order to allow non-dict objects to be serialized set the safe parameter to False.')
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=dumps(data), **kwargs)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """DRF renderer using the same encoder as JsonResponse"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return dumps(data)
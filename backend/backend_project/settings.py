@@ -1,6 +1,6 @@
 import os
 from pathlib import Path
-from decouple import config
+from decouple import Csv, config
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend_project.settings')
 
@@ -29,9 +29,11 @@ INSTALLED_APPS = [
     'corsheaders',
     'users',
     'tasks',
+    'monitoring',
 ]
 
 MIDDLEWARE = [
+    'monitoring.middleware.RequestMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -39,6 +41,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'users.middleware.JWTAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'django_ratelimit.middleware.RatelimitMiddleware',
@@ -76,8 +79,25 @@ if 'mongodb://' in MONGODB_URI:
 else:
     db_name = 'sessions'
 
-# Connect to MongoDB
-mongoengine.connect(host=MONGODB_URI)
+# Connection pool settings shared by MongoEngine and the Motor client
+MONGODB_CLIENT_OPTIONS = {
+    'maxPoolSize': config('MONGODB_MAX_POOL_SIZE', default=100, cast=int),
+    'minPoolSize': config('MONGODB_MIN_POOL_SIZE', default=0, cast=int),
+    'maxIdleTimeMS': config('MONGODB_MAX_IDLE_TIME_MS', default=60000, cast=int),
+    'connectTimeoutMS': config('MONGODB_CONNECT_TIMEOUT_MS', default=5000, cast=int),
+    'socketTimeoutMS': config('MONGODB_SOCKET_TIMEOUT_MS', default=30000, cast=int),
+    'serverSelectionTimeoutMS': config('MONGODB_SERVER_SELECTION_TIMEOUT_MS', default=5000, cast=int),
+    'waitQueueTimeoutMS': config('MONGODB_WAIT_QUEUE_TIMEOUT_MS', default=5000, cast=int),
+}
+
+# Register the connection without opening it; MongoEngine creates the
+# client on first use, so commands and workers that never query skip it
+mongoengine.register_connection(
+    mongoengine.DEFAULT_CONNECTION_NAME,
+    host=MONGODB_URI,
+    connect=False,
+    **MONGODB_CLIENT_OPTIONS
+)
 
 # Dummy database config for Django (required but not used)
 DATABASES = {
@@ -104,6 +124,17 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing: the iteration count is tunable and existing hashes are
+# upgraded on login; hashing runs in a bounded pool (users/hashing.py)
+PASSWORD_HASHERS = [
+    'users.hashers.TunablePBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+PASSWORD_HASH_ITERATIONS = config('PASSWORD_HASH_ITERATIONS', default=260000, cast=int)
+PASSWORD_HASH_WORKERS = config('PASSWORD_HASH_WORKERS', default=os.cpu_count() or 2, cast=int)
+PASSWORD_HASH_QUEUE_SIZE = config('PASSWORD_HASH_QUEUE_SIZE', default=16, cast=int)
+PASSWORD_HASH_QUEUE_TIMEOUT = config('PASSWORD_HASH_QUEUE_TIMEOUT', default=2.0, cast=float)
+
 # Internationalization
 # https://docs.djangoproject.com/en/3.2/topics/i18n/
 
@@ -133,7 +164,7 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'backend_project.responses.ORJSONRenderer',
     ],
 }
 
@@ -176,11 +207,15 @@ CORS_ALLOW_HEADERS = [
     'authorization',
     'content-type',
     'dnt',
+    'if-match',
     'origin',
     'user-agent',
     'x-csrftoken',
     'x-requested-with',
 ]
+CORS_EXPOSE_HEADERS = [
+    'etag',
+]
 CORS_ALLOW_METHODS = [
     'DELETE',
     'GET',
@@ -211,13 +246,102 @@ SECURE_CONTENT_TYPE_NOSNIFF = True
 X_FRAME_OPTIONS = 'DENY'
 
 # Rate limiting
-RATELIMIT_ENABLE = True
+RATELIMIT_ENABLE = config('RATELIMIT_ENABLE', default=True, cast=bool)
 RATELIMIT_USE_CACHE = 'default'
 
+# Authenticated user cache
+USER_CACHE_ENABLED = config('USER_CACHE_ENABLED', default=True, cast=bool)
+USER_CACHE_TTL = config('USER_CACHE_TTL', default=60, cast=int)
+USER_CACHE_MAX_SIZE = config('USER_CACHE_MAX_SIZE', default=1024, cast=int)
+# 'local' (in-process LRU) or the alias of a Django cache in CACHES, e.g.
+# 'default' with a shared CACHE_BACKEND so profile updates invalidate the
+# cached user in every worker
+USER_CACHE_BACKEND = config('USER_CACHE_BACKEND', default='local')
+
+# OAuth login: dotted path of the Firebase ID token verifier (point it at
+# benchmarks.stub_firebase.verify_id_token to run without Google), and the
+# cache of verified claims keyed by token hash
+FIREBASE_TOKEN_VERIFIER = config('FIREBASE_TOKEN_VERIFIER', default='firebase_admin.auth.verify_id_token')
+OAUTH_TOKEN_CACHE_TTL = config('OAUTH_TOKEN_CACHE_TTL', default=300, cast=int)
+OAUTH_TOKEN_CACHE_SIZE = config('OAUTH_TOKEN_CACHE_SIZE', default=1024, cast=int)
+OAUTH_CERTS_REFRESH_SECONDS = config('OAUTH_CERTS_REFRESH_SECONDS', default=3600, cast=int)
+
+# Prometheus endpoint (/api/metrics/): off by default. When enabled, scrapers
+# must send METRICS_TOKEN as a bearer token, or, if no token is set, connect
+# from one of METRICS_ALLOWED_IPS (REMOTE_ADDR, so the proxy's address
+# when behind one)
+METRICS_ENABLED = config('METRICS_ENABLED', default=False, cast=bool)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+METRICS_ALLOWED_IPS = config('METRICS_ALLOWED_IPS', default='127.0.0.1,::1', cast=Csv())
+
+# Mongo diagnostics: 'off', 'production' (slow command log and query budget
+# warnings) or 'development' (adds explain() plans to slow commands)
+MONGO_DIAGNOSTICS = config('MONGO_DIAGNOSTICS', default='development' if DEBUG else 'production')
+MONGO_SLOW_QUERY_MS = config('MONGO_SLOW_QUERY_MS', default=100, cast=int)
+# Default queries allowed per request before it is flagged as a possible N+1
+MONGO_QUERY_BUDGET = config('MONGO_QUERY_BUDGET', default=10, cast=int)
+
+# Verified JWT claims kept per token until the token expires (0 disables)
+JWT_VERIFY_CACHE_SIZE = config('JWT_VERIFY_CACHE_SIZE', default=4096, cast=int)
+
+# Conditional GET: stats ETags also rotate on this interval because the
+# overdue count changes with the clock
+TASK_STATS_ETAG_SECONDS = config('TASK_STATS_ETAG_SECONDS', default=60, cast=int)
+
+# Largest ?limit= accepted by the task list and search; bigger values are clamped
+TASK_MAX_PAGE_SIZE = config('TASK_MAX_PAGE_SIZE', default=100, cast=int)
+
+# Delta sync (GET /api/tasks/changes/)
+TASK_TOMBSTONE_TTL_DAYS = config('TASK_TOMBSTONE_TTL_DAYS', default=30, cast=int)
+TASK_SYNC_PAGE_SIZE = config('TASK_SYNC_PAGE_SIZE', default=500, cast=int)
+# next_since is rewound by this much so writes committed while a sync
+# request was running are picked up by the following one
+TASK_SYNC_OVERLAP_SECONDS = config('TASK_SYNC_OVERLAP_SECONDS', default=2, cast=int)
+
+# Bulk task endpoints (/api/tasks/bulk/...)
+TASK_BULK_MAX_ITEMS = config('TASK_BULK_MAX_ITEMS', default=500, cast=int)
+# Rows accepted per import upload; the rest of a larger file is skipped
+TASK_IMPORT_MAX_ROWS = config('TASK_IMPORT_MAX_ROWS', default=100000, cast=int)
+
+# Live task events (/api/tasks/events, served by backend_project.asgi).
+# auto uses a Mongo change stream when the server is a replica set and
+# falls back to in-process events, which only see this worker's writes.
+TASK_EVENTS_SOURCE = config('TASK_EVENTS_SOURCE', default='auto')
+TASK_EVENTS_HEARTBEAT_SECONDS = config('TASK_EVENTS_HEARTBEAT_SECONDS', default=15, cast=int)
+TASK_EVENTS_RETRY_MS = config('TASK_EVENTS_RETRY_MS', default=5000, cast=int)
+# Events buffered per connection; a client that falls further behind gets tasks.reset
+TASK_EVENTS_QUEUE_SIZE = config('TASK_EVENTS_QUEUE_SIZE', default=100, cast=int)
+TASK_EVENTS_MAX_CONNECTIONS = config('TASK_EVENTS_MAX_CONNECTIONS', default=1000, cast=int)
+# Lifetime of the single-use ticket a browser opens the stream with
+TASK_EVENTS_TICKET_SECONDS = config('TASK_EVENTS_TICKET_SECONDS', default=30, cast=int)
+
 # Cache
-CACHES = {
-    'default': {
+# locmem keeps a private cache per worker process, so with several workers
+# rate limits are multiplied by the worker count. sqlite shares one file
+# between all workers on a host (no external service); redis shares it
+# across hosts.
+CACHE_BACKEND = config('CACHE_BACKEND', default='locmem')
+
+if CACHE_BACKEND == 'sqlite':
+    DEFAULT_CACHE = {
+        'BACKEND': 'backend_project.cache.SQLiteCache',
+        # Values are pickled, so the file must live in a directory only this
+        # app can write to; the cache refuses group/world-writable locations
+        'LOCATION': config('CACHE_LOCATION', default=os.path.join(BASE_DIR, 'var', 'cache.sqlite3')),
+    }
+elif CACHE_BACKEND == 'redis':
+    DEFAULT_CACHE = {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': config('REDIS_URL', default='redis://127.0.0.1:6379/1'),
+    }
+elif CACHE_BACKEND == 'locmem':
+    DEFAULT_CACHE = {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
         'LOCATION': 'unique-snowflake',
     }
-}
\ No newline at end of file
+else:
+    raise ValueError(f'Unknown CACHE_BACKEND "{CACHE_BACKEND}" (expected locmem, sqlite or redis)')
+
+CACHES = {
+    'default': DEFAULT_CACHE,
+}
@@ -0,0 +1,112 @@
+import json
+import os
+import stat
+import tempfile
+from datetime import date, datetime
+from decimal import Decimal
+from unittest import mock
+
+from bson import ObjectId
+from django.core.exceptions import ImproperlyConfigured
+from django.test import Client, SimpleTestCase
+from django.utils.translation import gettext_lazy
+
+from monitoring.context import end_request, start_request
+from . import responses
+from .cache import SQLiteCache
+
+
+class SQLiteCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def make_cache(self, **options):
+        return SQLiteCache(os.path.join(self.directory, 'cache', 'cache.sqlite3'), {'OPTIONS': options})
+
+    def test_creates_private_directory_and_file(self):
+        cache = self.make_cache()
+        cache.set('key', {'value': 1})
+        self.assertEqual(cache.get('key'), {'value': 1})
+        path = os.path.join(self.directory, 'cache')
+        self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o700)
+        self.assertEqual(stat.S_IMODE(os.stat(os.path.join(path, 'cache.sqlite3')).st_mode), 0o600)
+
+    def test_refuses_world_writable_directory(self):
+        path = os.path.join(self.directory, 'cache')
+        os.makedirs(path)
+        os.chmod(path, 0o777)
+        with self.assertRaises(ImproperlyConfigured):
+            self.make_cache().get('key')
+
+    def test_cull_frequency_zero_clears(self):
+        cache = self.make_cache(MAX_ENTRIES=10, CULL_FREQUENCY=0)
+        for i in range(100):
+            cache.set(f'key-{i}', i)
+        self.assertIsNone(cache.get('key-0'))
+        self.assertIsNone(cache.get('key-98'))
+
+
+class JsonResponseTests(SimpleTestCase):
+    data = {
+        'id': ObjectId('0123456789abcdef01234567'),
+        'created_at': datetime(2024, 5, 6, 7, 8, 9, 123000),
+        'due': date(2024, 5, 7),
+        'label': gettext_lazy('Tasks'),
+        'title': 'Caf\u00e9',
+        'count': 3,
+        'tags': [None, True],
+    }
+    expected = {
+        'id': '0123456789abcdef01234567',
+        'created_at': '2024-05-06T07:08:09.123000',
+        'due': '2024-05-07',
+        'label': 'Tasks',
+        'title': 'Caf\u00e9',
+        'count': 3,
+        'tags': [None, True],
+    }
+
+    def test_encodes_bson_and_dates(self):
+        response = responses.JsonResponse(self.data, status=201)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(response.content), self.expected)
+
+    def test_stdlib_fallback_matches(self):
+        with mock.patch.object(responses, 'orjson', None):
+            fallback = responses.dumps(self.data)
+        self.assertEqual(json.loads(fallback), self.expected)
+        self.assertNotIn(b' ', fallback.replace(b'Caf', b''))
+
+    def test_unsupported_type(self):
+        for encoder in (responses.orjson, None):
+            with mock.patch.object(responses, 'orjson', encoder), self.assertRaises(TypeError):
+                responses.dumps({'amount': Decimal('1.5')})
+
+    def test_non_dict_needs_safe_false(self):
+        with self.assertRaises(TypeError):
+            responses.JsonResponse([1, 2])
+        self.assertEqual(json.loads(responses.JsonResponse([1, 2], safe=False).content), [1, 2])
+
+    def test_encoding_time_is_recorded(self):
+        metrics, token = start_request()
+        try:
+            responses.dumps(self.data)
+        finally:
+            end_request(token)
+        self.assertGreater(metrics.serialize_time, 0)
+
+    def test_drf_renderer(self):
+        renderer = responses.ORJSONRenderer()
+        self.assertEqual(json.loads(renderer.render(self.data)), self.expected)
+        self.assertEqual(renderer.render(None), b'')
+
+    def test_drf_responses_use_the_renderer(self):
+        # DRF renders its own 405 for a GET on a POST-only view
+        with mock.patch.object(responses, 'dumps', wraps=responses.dumps) as dumps:
+            response = Client(HTTP_HOST='localhost').get('/api/users/login/')
+        self.assertEqual(response.status_code, 405)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertIn('detail', json.loads(response.content))
+        dumps.assert_called_once()
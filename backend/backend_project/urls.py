@@ -16,6 +16,7 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from django.http import JsonResponse
+from monitoring.views import metrics
 
 def health_check(request):
     """Health check endpoint"""
@@ -29,6 +30,10 @@ def health_check(request):
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/health/', health_check, name='health_check'),
+    path('api/metrics/', metrics, name='metrics'),
     path('api/users/', include('users.urls')),
     path('api/tasks/', include('tasks.urls')),
+    # Async (Motor) variants; run them under backend_project.asgi
+    path('api/async/users/', include('users.async_urls')),
+    path('api/async/tasks/', include('tasks.async_urls')),
 ]
\ No newline at end of file
@@ -0,0 +1,57 @@
+"""
+Sync (gthread workers, /api/tasks/) versus async (uvicorn workers,
+/api/async/tasks/) under high concurrency against a local mongod.
+
+    python -m benchmarks.bench_async --email bench@example.com --password secret123
+
+Both servers use the same worker count, so the difference comes from
+overlapping in-flight Mongo calls on the event loop.
+"""
+import argparse
+import json
+
+from .common import DEFAULT_BENCH_URI
+from .load_test import obtain_token, run_load, start_server
+
+STACKS = [
+    ('sync', 'gthread', '/api/tasks/'),
+    ('async', 'asgi', '/api/async/tasks/'),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--email', required=True)
+    parser.add_argument('--password', required=True)
+    parser.add_argument('--mongodb-uri', default=DEFAULT_BENCH_URI)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[16, 64, 256])
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--port', type=int, default=5099)
+    args = parser.parse_args()
+
+    env = {
+        'MONGODB_URI': args.mongodb_uri,
+        'WEB_CONCURRENCY': str(args.workers),
+        'RATELIMIT_ENABLE': 'false',
+    }
+    base_url = f'http://127.0.0.1:{args.port}'
+
+    results = {}
+    for name, mode, path in STACKS:
+        process = start_server(mode, args.port, env)
+        try:
+            headers = {'Authorization': f'Bearer {obtain_token(base_url, args.email, args.password)}'}
+            results[name] = {
+                str(concurrency): run_load(base_url + path, headers, concurrency, args.duration)
+                for concurrency in args.concurrency
+            }
+        finally:
+            process.terminate()
+            process.wait()
+
+    print(json.dumps({'workers': args.workers, 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Task write throughput: one Task.save() per task (the create_task path)
+versus tasks.bulk.bulk_create batches.
+
+    python -m benchmarks.bench_bulk --tasks 5000 --batch-size 500
+"""
+import argparse
+import json
+import time
+
+from .common import reset_tasks, setup_django
+
+USER_ID = 'bench-user'
+
+
+def payloads(count):
+    return [
+        {'title': f'Task {i}', 'description': 'Bulk benchmark', 'priority': 'high', 'dueDate': '2030-01-01T00:00:00Z'}
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tasks', type=int, default=5000)
+    parser.add_argument('--batch-size', type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django()
+    from tasks.bulk import bulk_create
+    from tasks.models import Task
+    from tasks.validation import clean_new_task
+
+    items = payloads(args.tasks)
+
+    reset_tasks()
+    start = time.perf_counter()
+    for item in items:
+        Task(user_id=USER_ID, **clean_new_task(item)).save()
+    single = time.perf_counter() - start
+
+    reset_tasks()
+    start = time.perf_counter()
+    for offset in range(0, len(items), args.batch_size):
+        results = bulk_create(USER_ID, items[offset:offset + args.batch_size])
+        assert all(result['success'] for result in results)
+    bulk = time.perf_counter() - start
+
+    print(json.dumps({
+        'tasks': args.tasks,
+        'batch_size': args.batch_size,
+        'one_at_a_time_tasks_per_sec': round(args.tasks / single, 1),
+        'bulk_tasks_per_sec': round(args.tasks / bulk, 1),
+        'speedup': round(single / bulk, 2),
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
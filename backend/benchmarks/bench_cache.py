@@ -0,0 +1,65 @@
+"""
+Per-lookup overhead of the cache backends behind rate limiting and the
+app caches: get, set and the add+incr pair django_ratelimit issues.
+
+    python -m benchmarks.bench_cache
+    REDIS_URL=redis://127.0.0.1:6379/1 python -m benchmarks.bench_cache --backends locmem sqlite redis
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+
+from .common import setup_django, summarize, time_call
+
+# Locations of the on-disk backends are relative to a private (0700)
+# scratch directory; SQLiteCache refuses world-writable ones such as /tmp
+BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'bench'),
+    'sqlite': ('backend_project.cache.SQLiteCache', 'bench-cache.sqlite3'),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', 'bench-cache'),
+    'redis': ('django_redis.cache.RedisCache', os.environ.get('REDIS_URL', 'redis://127.0.0.1:6379/1')),
+}
+ON_DISK = {'sqlite', 'file'}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backends', nargs='+', default=['locmem', 'sqlite', 'file'], choices=sorted(BACKENDS))
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.utils.module_loading import import_string
+
+    user = {'_id': 'x' * 24, 'name': 'Bench User', 'email': 'bench@example.com', 'password': 'p' * 88}
+    results = {}
+    scratch = tempfile.mkdtemp(prefix='bench-cache-')
+    try:
+        for name in args.backends:
+            path, location = BACKENDS[name]
+            if name in ON_DISK:
+                location = os.path.join(scratch, location)
+            cache = import_string(path)(location, {})
+            cache.clear()
+            cache.set('user', user, 60)
+
+            def ratelimit_hit():
+                if not cache.add('ratelimit', 1, 60):
+                    cache.incr('ratelimit')
+
+            results[name] = {
+                'get': summarize(time_call(lambda: cache.get('user'), args.repeat)),
+                'set': summarize(time_call(lambda: cache.set('user', user, 60), args.repeat)),
+                'ratelimit_add_incr': summarize(time_call(ratelimit_hit, args.repeat)),
+            }
+            cache.clear()
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Memory check for the streaming export: peak RSS while exporting must not
+grow with the number of tasks.
+
+    python -m benchmarks.bench_export --sizes 100000 1000000
+
+For each size the tasks are seeded, then every format is exported in a
+fresh child process that samples its RSS while draining the stream. The
+run fails if the 1M export peaks more than --max-growth-mb above the
+smallest size's peak.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+from .common import make_task_documents, reset_tasks, setup_django
+
+USER_ID = 'bench-user'
+EXPORTS = [('ndjson', False), ('csv', False), ('ndjson', True)]
+
+
+def rss_mb():
+    """Current resident set size (Linux), or the peak where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def seed(size, batch_size=10000):
+    from tasks.models import Task
+
+    collection = Task._get_collection()
+    for start in range(0, size, batch_size):
+        collection.insert_many(make_task_documents(USER_ID, min(batch_size, size - start), seed=start), ordered=False)
+
+
+def measure(export_format, gzip):
+    """Drain one export in this process and report RSS samples"""
+    setup_django()
+    from tasks.export import export_stream
+
+    baseline = rss_mb()
+    peak = baseline
+    total_bytes = 0
+    start = time.perf_counter()
+    for index, chunk in enumerate(export_stream(USER_ID, export_format, gzip)):
+        total_bytes += len(chunk)
+        if index % 16 == 0:
+            peak = max(peak, rss_mb())
+    elapsed = time.perf_counter() - start
+    peak = max(peak, rss_mb())
+    return {
+        'format': export_format + ('+gzip' if gzip else ''),
+        'bytes': total_bytes,
+        'seconds': round(elapsed, 2),
+        'mb_per_sec': round(total_bytes / 2 ** 20 / elapsed, 1) if elapsed else None,
+        'baseline_rss_mb': round(baseline, 1),
+        'peak_rss_mb': round(peak, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument('--max-growth-mb', type=float, default=16.0)
+    parser.add_argument('--child', nargs=2, metavar=('FORMAT', 'GZIP'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.child[0], args.child[1] == '1')))
+        return
+
+    setup_django()
+    results = {}
+    for size in sorted(args.sizes):
+        reset_tasks()
+        seed(size)
+        results[size] = []
+        for export_format, gzip in EXPORTS:
+            output = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.bench_export', '--child', export_format, '1' if gzip else '0'],
+                capture_output=True, text=True, check=True,
+            ).stdout
+            results[size].append(json.loads(output))
+
+    smallest, largest = min(results), max(results)
+    growth = {
+        run['format']: round(run['peak_rss_mb'] - base['peak_rss_mb'], 1)
+        for base, run in zip(results[smallest], results[largest])
+    }
+    flat = all(value <= args.max_growth_mb for value in growth.values())
+    print(json.dumps({'results': results, 'peak_growth_mb': growth, 'flat': flat}, indent=2))
+    if not flat:
+        raise SystemExit(f'Peak RSS grew by more than {args.max_growth_mb} MB between {smallest} and {largest} tasks')
+
+
+if __name__ == '__main__':
+    main()
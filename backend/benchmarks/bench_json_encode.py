@@ -0,0 +1,58 @@
+"""
+Encode time for a 1,000-task list response: django.http.JsonResponse
+(stdlib json + DjangoJSONEncoder) versus backend_project.responses with and
+without orjson. No database is needed.
+
+    python -m benchmarks.bench_json_encode
+"""
+import argparse
+import json
+
+from bson import ObjectId
+
+from .common import make_task_documents, setup_django, summarize, time_call
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=100)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.http import JsonResponse as DjangoJsonResponse
+
+    from backend_project import responses
+    from tasks.serializers import serialize_task
+
+    docs = make_task_documents('bench-user', args.rows)
+    for doc in docs:
+        doc['_id'] = ObjectId()
+    payload = {
+        'success': True,
+        'data': [serialize_task(doc) for doc in docs],
+        'pagination': {'page': 1, 'limit': args.rows, 'total': args.rows, 'pages': 1},
+    }
+
+    orjson = responses.orjson
+    candidates = [('django_json_response', lambda: DjangoJsonResponse(payload))]
+    if orjson is not None:
+        candidates.append(('responses_orjson', lambda: responses.JsonResponse(payload)))
+
+    def stdlib_fallback():
+        responses.orjson = None
+        try:
+            return responses.JsonResponse(payload)
+        finally:
+            responses.orjson = orjson
+
+    candidates.append(('responses_stdlib', stdlib_fallback))
+
+    assert all(json.loads(fn().content) == payload for _, fn in candidates)
+
+    results = {name: summarize(time_call(fn, args.repeat)) for name, fn in candidates}
+    print(json.dumps({'rows': args.rows, 'orjson_installed': orjson is not None, 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
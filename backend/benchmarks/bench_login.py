@@ -0,0 +1,63 @@
+"""
+Login throughput and tail latency under concurrent logins.
+
+Starts gthread workers once per hashing configuration and POSTs
+/api/users/login/ from many connections at once::
+
+    python -m benchmarks.bench_login --email bench@example.com --password secret123
+
+Compare PASSWORD_HASH_WORKERS (pool size per worker) and
+PASSWORD_HASH_ITERATIONS; 503 responses from a saturated pool are
+counted as errors. Rate limiting is disabled for the run.
+"""
+import argparse
+import json
+
+from .common import DEFAULT_BENCH_URI
+from .load_test import obtain_token, run_load, start_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--email', required=True)
+    parser.add_argument('--password', required=True)
+    parser.add_argument('--mongodb-uri', default=DEFAULT_BENCH_URI)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--hash-workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--iterations', type=int, nargs='+', default=[260000])
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[8, 32])
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--port', type=int, default=5099)
+    args = parser.parse_args()
+
+    base_url = f'http://127.0.0.1:{args.port}'
+    body = {'email': args.email, 'password': args.password}
+
+    results = {}
+    for iterations in args.iterations:
+        for hash_workers in args.hash_workers:
+            env = {
+                'MONGODB_URI': args.mongodb_uri,
+                'WEB_CONCURRENCY': str(args.workers),
+                'RATELIMIT_ENABLE': 'false',
+                'PASSWORD_HASH_ITERATIONS': str(iterations),
+                'PASSWORD_HASH_WORKERS': str(hash_workers),
+            }
+            process = start_server('gthread', args.port, env)
+            try:
+                # Registers the user on first use and upgrades its hash to this iteration count
+                obtain_token(base_url, args.email, args.password)
+                results[f'iterations={iterations},hash_workers={hash_workers}'] = {
+                    str(concurrency): run_load(base_url + '/api/users/login/', None, concurrency,
+                                               args.duration, method='POST', body=body)
+                    for concurrency in args.concurrency
+                }
+            finally:
+                process.terminate()
+                process.wait()
+
+    print(json.dumps({'workers': args.workers, 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
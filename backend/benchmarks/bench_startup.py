@@ -0,0 +1,136 @@
+"""
+Startup cost of the backend: import time of the Django app and time to
+the first HTTP response from a fresh gunicorn.
+
+    python -m benchmarks.bench_startup --token <jwt> --output startup.json
+
+* ``imports`` runs ``python -X importtime`` over django.setup() plus the
+  URLconf and lists the slowest top-level imports
+* ``check`` times ``manage.py check``, which loads settings and apps
+* ``first_response`` starts gunicorn per worker mode and times the first
+  /api/health/ answer, then the first authenticated request (which opens
+  the lazy Mongo connection) when --token is given
+
+Neither step needs Mongo or Firebase until a request actually uses them.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+from .common import summarize
+from .load_test import BACKEND_DIR
+
+SETUP_CODE = (
+    "import os, django; "
+    "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend_project.settings'); "
+    "django.setup(); "
+    "import backend_project.urls"
+)
+
+
+def measure_imports(top=15):
+    """Total and slowest top-level imports reported by -X importtime"""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', SETUP_CODE],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    )
+    wall = time.perf_counter() - start
+
+    total_us = 0
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        total_us += int(self_us)
+        # Nested imports are indented under the module that triggered them
+        if not name[1:].startswith(' '):
+            modules.append((int(cumulative_us), name.strip()))
+
+    modules.sort(reverse=True)
+    return {
+        'wall_ms': round(wall * 1000, 1),
+        'import_ms': round(total_us / 1000, 1),
+        'slowest': [{'module': name, 'cumulative_ms': round(us / 1000, 1)} for us, name in modules[:top]],
+    }
+
+
+def measure_check(repeat=3):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, 'manage.py', 'check'], cwd=BACKEND_DIR,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def _poll(url, headers, deadline):
+    """Seconds until url first answers with a non-error status"""
+    start = time.perf_counter()
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=5) as response:
+                if response.status < 400:
+                    return time.perf_counter() - start
+        except (OSError, urllib.error.HTTPError):
+            pass
+        time.sleep(0.01)
+    raise SystemExit(f'{url} did not answer in time')
+
+
+def measure_first_response(mode, port, token=None, timeout=60.0):
+    env = dict(os.environ, GUNICORN_WORKER_MODE=mode, GUNICORN_BIND=f'127.0.0.1:{port}',
+               GUNICORN_ACCESS_LOG='', WEB_CONCURRENCY='1')
+    base_url = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + timeout
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py'],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        _poll(f'{base_url}/api/health/', {}, deadline)
+        result = {'health_ms': round((time.perf_counter() - started) * 1000, 1)}
+        if token:
+            elapsed = _poll(f'{base_url}/api/tasks/', {'Authorization': f'Bearer {token}'}, deadline)
+            result['first_query_ms'] = round(elapsed * 1000, 1)
+        return result
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modes', nargs='+', default=['sync', 'gthread', 'asgi'])
+    parser.add_argument('--port', type=int, default=5099)
+    parser.add_argument('--token', help='Access token for the first authenticated request')
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--output', help='Also write the results to this JSON file')
+    args = parser.parse_args()
+
+    results = {
+        'imports': measure_imports(),
+        'check': measure_check(args.runs),
+        'first_response': {
+            mode: [measure_first_response(mode, args.port, args.token) for _ in range(args.runs)]
+            for mode in args.modes
+        },
+    }
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+
+
+if __name__ == '__main__':
+    main()
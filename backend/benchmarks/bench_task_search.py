@@ -0,0 +1,80 @@
+"""
+Full-text search (get_tasks?q=) at 100k tasks per user: confirms the
+text index is used and times ranked pages against a latency budget,
+with an unindexed case-insensitive $regex scan for comparison.
+
+    python -m benchmarks.bench_task_search --size 100000 --budget-ms 50
+"""
+import argparse
+import json
+import re
+
+from .common import reset_tasks, setup_django, summarize, time_call
+
+USER_ID = 'bench-user'
+TERMS = ['report', 'fix login', 'budget review', 'deploy dashboard']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=100000, help='Tasks for the searching user')
+    parser.add_argument('--other-users', type=int, default=1, help='Users with the same number of tasks, to check scoping')
+    parser.add_argument('--terms', nargs='+', default=TERMS)
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--budget-ms', type=float, default=50.0, help='p95 latency budget per page')
+    args = parser.parse_args()
+
+    setup_django()
+    from monitoring.diagnostics import winning_plan_stages
+    from tasks.models import Task
+    from tasks.queries import task_search_pipeline
+    from tasks.search import search_tasks
+    from tasks.seeding import seed_tasks
+
+    reset_tasks()
+    seed_tasks([USER_ID] + [f'other-user-{i}' for i in range(args.other_users)], args.size)
+    collection = Task._get_collection()
+
+    results = []
+    for term in args.terms:
+        explain = collection.database.command({
+            'aggregate': collection.name,
+            'pipeline': task_search_pipeline(USER_ID, term, limit=args.limit),
+            'explain': True,
+        })
+        stages = winning_plan_stages(explain)
+
+        first_page, _, next_cursor = search_tasks(USER_ID, term, limit=args.limit)
+        assert all(doc['user_id'] == USER_ID for doc in first_page)
+
+        first = summarize(time_call(lambda: search_tasks(USER_ID, term, limit=args.limit), args.repeat))
+        second = None
+        if next_cursor:
+            second = summarize(time_call(
+                lambda: search_tasks(USER_ID, term, cursor=next_cursor, limit=args.limit), args.repeat))
+
+        pattern = '|'.join(re.escape(word) for word in term.split())
+        regex_query = {'user_id': USER_ID, '$or': [
+            {'title': {'$regex': pattern, '$options': 'i'}},
+            {'description': {'$regex': pattern, '$options': 'i'}},
+        ]}
+        regex = summarize(time_call(lambda: list(collection.find(regex_query).limit(args.limit + 1)), args.repeat))
+
+        slowest_p95 = max(first['p95_ms'], second['p95_ms'] if second else 0)
+        results.append({
+            'term': term,
+            'plan': ' <- '.join(stages),
+            'text_index_used': bool({'TEXT', 'TEXT_MATCH', 'TEXT_OR'}.intersection(stages)),
+            'matches': collection.count_documents(task_search_pipeline(USER_ID, term)[0]['$match']),
+            'first_page': first,
+            'next_page': second,
+            'regex_scan': regex,
+            'within_budget': slowest_p95 <= args.budget_ms,
+        })
+
+    print(json.dumps({'tasks_per_user': args.size, 'budget_ms': args.budget_ms, 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
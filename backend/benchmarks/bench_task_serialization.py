@@ -0,0 +1,48 @@
+"""
+Per-row serialization cost for a 1,000-task page: building Task documents
+and calling to_dict() versus serializing the raw as_pymongo() documents.
+No database is needed; rows are synthesised in memory.
+
+    python -m benchmarks.bench_task_serialization
+"""
+import argparse
+import json
+
+from bson import ObjectId
+
+from .common import make_task_documents, setup_django, summarize, time_call
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    from tasks.models import Task
+    from tasks.serializers import serialize_task
+
+    docs = make_task_documents('bench-user', args.rows)
+    for doc in docs:
+        doc['_id'] = ObjectId()
+
+    def documents():
+        return [Task._from_son(doc).to_dict() for doc in docs]
+
+    def raw():
+        return [serialize_task(doc) for doc in docs]
+
+    assert documents() == raw()
+
+    results = {}
+    for name, fn in (('document_to_dict', documents), ('raw_serializer', raw)):
+        summary = summarize(time_call(fn, args.repeat))
+        summary['per_row_us'] = round(summary['p50_ms'] * 1000 / args.rows, 3)
+        results[name] = summary
+
+    print(json.dumps({'rows': args.rows, 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
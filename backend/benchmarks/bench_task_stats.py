@@ -0,0 +1,98 @@
+"""
+Compare get_task_stats implementations: five count() queries, one
+aggregation over the user's tasks, and the incrementally maintained
+UserTaskStats counters plus an overdue count (the current one).
+
+    python -m benchmarks.bench_task_stats --sizes 10000 100000
+"""
+import argparse
+import json
+from datetime import datetime
+
+from .common import reset_tasks, seed_tasks, setup_django, summarize, time_call
+
+USER_ID = 'bench-user'
+
+
+def legacy_task_stats(user_id):
+    """The previous implementation: one count() per counter"""
+    from tasks.models import Task
+
+    all_tasks = Task.objects(user_id=user_id)
+    return {
+        'total': all_tasks.count(),
+        'pending': all_tasks.filter(status='pending').count(),
+        'inProgress': all_tasks.filter(status='in-progress').count(),
+        'completed': all_tasks.filter(status='completed').count(),
+        'overdue': all_tasks.filter(due_date__lt=datetime.utcnow(), status__ne='completed').count(),
+    }
+
+
+def task_stats_pipeline(user_id, now):
+    """Single $group pass computing per-status counts and overdue tasks"""
+    is_overdue = {
+        '$and': [
+            {'$eq': [{'$type': '$due_date'}, 'date']},
+            {'$lt': ['$due_date', now]},
+            {'$ne': ['$status', 'completed']},
+        ]
+    }
+    return [
+        {'$match': {'user_id': user_id}},
+        {'$group': {
+            '_id': '$status',
+            'count': {'$sum': 1},
+            'overdue': {'$sum': {'$cond': [is_overdue, 1, 0]}},
+        }},
+    ]
+
+
+def aggregate_task_stats(user_id):
+    """The aggregation variant: one $group pass over all of the user's tasks"""
+    from tasks.models import Task
+    from tasks.queries import TASK_STATS_HINT
+    from tasks.stats import build_stats
+
+    status_counts = {}
+    overdue = 0
+    pipeline = task_stats_pipeline(user_id, datetime.utcnow())
+    for row in Task._get_collection().aggregate(pipeline, hint=TASK_STATS_HINT):
+        status = row['_id'] or 'pending'
+        status_counts[status] = status_counts.get(status, 0) + row['count']
+        overdue += row['overdue']
+    return build_stats(status_counts, overdue)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from tasks.stats import compute_task_stats
+
+    results = []
+    for size in args.sizes:
+        reset_tasks()
+        seed_tasks(USER_ID, size)
+
+        legacy = legacy_task_stats(USER_ID)
+        aggregated = aggregate_task_stats(USER_ID)
+        # The first call also builds the counters document
+        counted = compute_task_stats(USER_ID)
+        for stats in (aggregated, counted):
+            assert all(stats[key] == value for key, value in legacy.items()), (legacy, stats)
+
+        results.append({
+            'tasks_per_user': size,
+            'five_counts': summarize(time_call(lambda: legacy_task_stats(USER_ID), args.repeat)),
+            'aggregation': summarize(time_call(lambda: aggregate_task_stats(USER_ID), args.repeat)),
+            'counters': summarize(time_call(lambda: compute_task_stats(USER_ID), args.repeat)),
+        })
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Run benchmarks from the backend directory, e.g.::
+
+    python -m benchmarks.bench_task_stats
+
+They connect to BENCH_MONGODB_URI (default: a local ``taskmanager_bench``
+database) and drop the collections they seed, so they refuse to run
+against a database whose name does not mention "bench" or "test".
+"""
+import os
+import random
+import time
+from datetime import datetime
+
+DEFAULT_BENCH_URI = 'mongodb://localhost:27017/taskmanager_bench'
+
+
+def setup_django(mongodb_uri=None):
+    """Point the settings at the benchmark database and initialise Django"""
+    uri = mongodb_uri or os.environ.get('BENCH_MONGODB_URI', DEFAULT_BENCH_URI)
+    db_name = uri.split('/')[-1].split('?')[0]
+    if 'bench' not in db_name and 'test' not in db_name:
+        raise SystemExit(f'Refusing to benchmark against database "{db_name}"')
+
+    os.environ['MONGODB_URI'] = uri
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend_project.settings')
+
+    import django
+    django.setup()
+
+
+def make_task_documents(user_id, count, seed=0):
+    """Build raw task documents ready for insert_many, using the seed_tasks generator"""
+    from tasks.seeding import make_task_document
+
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    return [make_task_document(rng, user_id, now) for _ in range(count)]
+
+
+def reset_tasks():
+    """Drop the tasks collection (and its counters) and recreate the declared indexes"""
+    from tasks.models import Task, UserTaskStats
+
+    Task.drop_collection()
+    UserTaskStats.drop_collection()
+    Task.ensure_indexes()
+
+
+def seed_tasks(user_id, count, batch_size=5000, seed=0):
+    """Insert count synthetic tasks for user_id"""
+    from tasks.models import Task
+
+    collection = Task._get_collection()
+    docs = make_task_documents(user_id, count, seed=seed)
+    for start in range(0, len(docs), batch_size):
+        collection.insert_many(docs[start:start + batch_size], ordered=False)
+
+
+def time_call(fn, repeat=20, warmup=2):
+    """Return per-call wall times in seconds"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(samples):
+    """Latency summary in milliseconds"""
+    return {
+        'count': len(samples),
+        'mean_ms': round(sum(samples) / len(samples) * 1000, 3) if samples else 0.0,
+        'p50_ms': round(percentile(samples, 50) * 1000, 3),
+        'p95_ms': round(percentile(samples, 95) * 1000, 3),
+        'p99_ms': round(percentile(samples, 99) * 1000, 3),
+    }
@@ -0,0 +1,178 @@
+"""
+HTTP load test for the API under each gunicorn worker model.
+
+Starts ``gunicorn -c gunicorn.conf.py`` once per GUNICORN_WORKER_MODE,
+hammers an endpoint (``/api/tasks/`` by default) with keep-alive
+connections and reports requests/sec and latency percentiles::
+
+    python -m benchmarks.load_test --email bench@example.com --password secret123
+
+Pass --url to test an already running server instead. Requests need a
+token: --token, or --email/--password to log in (registering the user
+if necessary). Set RATELIMIT_ENABLE=false on the server for login-heavy
+runs.
+"""
+import argparse
+import http.client
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from urllib.parse import urlsplit
+
+from .common import summarize
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _post_json(url, payload):
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode(),
+        headers={'Content-Type': 'application/json'},
+        method='POST',
+    )
+    try:
+        with urllib.request.urlopen(request) as response:
+            return json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return json.loads(e.read() or b'{}')
+
+
+def obtain_token(base_url, email, password, name='Load Test'):
+    """Log in (registering first if needed) and return an access token"""
+    body = _post_json(f'{base_url}/api/users/login/', {'email': email, 'password': password})
+    if not body.get('token'):
+        body = _post_json(f'{base_url}/api/users/register/', {'name': name, 'email': email, 'password': password})
+    if not body.get('token'):
+        raise SystemExit(f'Could not obtain a token: {body}')
+    return body['token']
+
+
+def wait_for_health(base_url, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f'{base_url}/api/health/', timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise SystemExit(f'Server at {base_url} did not become healthy')
+
+
+def start_server(mode, port, extra_env=None):
+    """Launch gunicorn in the given worker mode and wait until it answers"""
+    env = dict(os.environ, GUNICORN_WORKER_MODE=mode, GUNICORN_BIND=f'127.0.0.1:{port}',
+               GUNICORN_ACCESS_LOG='', **(extra_env or {}))
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py'],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_health(f'http://127.0.0.1:{port}')
+    except SystemExit:
+        process.terminate()
+        raise
+    return process
+
+
+def run_load(url, headers=None, concurrency=16, duration=10.0, method='GET', body=None):
+    """Drive url from `concurrency` keep-alive connections for `duration` seconds"""
+    parts = urlsplit(url)
+    path = parts.path + (f'?{parts.query}' if parts.query else '')
+    headers = dict(headers or {})
+    if body is not None:
+        body = json.dumps(body).encode() if not isinstance(body, bytes) else body
+        headers.setdefault('Content-Type', 'application/json')
+
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def worker():
+        connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+        local = []
+        local_errors = 0
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                connection.request(method, path, body=body, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                if response.status >= 400:
+                    local_errors += 1
+            except (OSError, http.client.HTTPException):
+                local_errors += 1
+                connection.close()
+                connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+                continue
+            local.append(time.perf_counter() - start)
+        connection.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += local_errors
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    return dict(
+        summarize(latencies),
+        requests=len(latencies),
+        errors=errors[0],
+        requests_per_sec=round(len(latencies) / elapsed, 1),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modes', nargs='+', default=['sync', 'gthread', 'asgi'])
+    parser.add_argument('--url', help='Benchmark an already running server at this base URL')
+    parser.add_argument('--path', default='/api/tasks/')
+    parser.add_argument('--port', type=int, default=5099)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--token')
+    parser.add_argument('--email')
+    parser.add_argument('--password')
+    args = parser.parse_args()
+
+    def headers_for(base_url):
+        token = args.token or obtain_token(base_url, args.email, args.password)
+        return {'Authorization': f'Bearer {token}'}
+
+    if args.url:
+        base_url = args.url.rstrip('/')
+        results = {'external': run_load(base_url + args.path, headers_for(base_url), args.concurrency, args.duration)}
+    else:
+        if not (args.token or (args.email and args.password)):
+            parser.error('--token or --email/--password is required')
+        results = {}
+        for mode in args.modes:
+            base_url = f'http://127.0.0.1:{args.port}'
+            process = start_server(mode, args.port)
+            try:
+                headers = headers_for(base_url)
+                args.token = headers['Authorization'].split(' ')[1]
+                results[mode] = run_load(base_url + args.path, headers, args.concurrency, args.duration)
+            finally:
+                process.terminate()
+                process.wait()
+
+    print(json.dumps({'path': args.path, 'concurrency': args.concurrency, 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,29 @@
+"""
+Local stand-in for firebase_admin.auth.verify_id_token::
+
+    FIREBASE_TOKEN_VERIFIER=benchmarks.stub_firebase.verify_id_token
+
+Tokens are unsigned urlsafe-base64 JSON claims made with make_token().
+STUB_FIREBASE_LATENCY_MS adds a delay per verification to mimic the
+real verifier.
+"""
+import base64
+import json
+import os
+import time
+
+
+def make_token(uid, email, name='Stub User', picture='', ttl=3600):
+    claims = {'uid': uid, 'email': email, 'name': name, 'picture': picture, 'exp': int(time.time()) + ttl}
+    return base64.urlsafe_b64encode(json.dumps(claims).encode()).decode()
+
+
+def verify_id_token(id_token):
+    time.sleep(float(os.environ.get('STUB_FIREBASE_LATENCY_MS', 0)) / 1000)
+    try:
+        claims = json.loads(base64.urlsafe_b64decode(id_token.encode()))
+    except (ValueError, TypeError):
+        raise ValueError('Malformed stub token')
+    if not isinstance(claims, dict) or claims.get('exp', 0) <= time.time():
+        raise ValueError('Expired or invalid stub token')
+    return claims
@@ -0,0 +1,69 @@
+"""
+Gunicorn configuration for production serving::
+
+    gunicorn -c gunicorn.conf.py
+
+GUNICORN_WORKER_MODE picks the worker model:
+
+* ``sync``    - one request at a time per process (2 * CPUs + 1 processes)
+* ``gthread`` - GUNICORN_THREADS threads per process (default)
+* ``asgi``    - uvicorn workers serving backend_project.asgi
+
+WEB_CONCURRENCY overrides the computed number of worker processes.
+"""
+import multiprocessing
+import os
+
+
+def _env_int(name, default):
+    return int(os.environ.get(name, default))
+
+
+cpu_count = multiprocessing.cpu_count()
+worker_mode = os.environ.get('GUNICORN_WORKER_MODE', 'gthread')
+
+if worker_mode == 'sync':
+    worker_class = 'sync'
+    wsgi_app = 'backend_project.wsgi:application'
+    default_workers = cpu_count * 2 + 1
+elif worker_mode == 'gthread':
+    worker_class = 'gthread'
+    wsgi_app = 'backend_project.wsgi:application'
+    threads = _env_int('GUNICORN_THREADS', 4)
+    default_workers = cpu_count + 1
+elif worker_mode == 'asgi':
+    worker_class = 'uvicorn.workers.UvicornWorker'
+    wsgi_app = 'backend_project.asgi:application'
+    default_workers = cpu_count
+else:
+    raise ValueError(f'Unknown GUNICORN_WORKER_MODE "{worker_mode}" (expected sync, gthread or asgi)')
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5001')
+workers = _env_int('WEB_CONCURRENCY', default_workers)
+
+# Connection handling
+keepalive = _env_int('GUNICORN_KEEPALIVE', 5)
+timeout = _env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = _env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+
+# Recycle workers periodically to bound memory growth; jitter keeps them
+# from restarting all at once
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', 100)
+
+# Heartbeat files on tmpfs avoid stalls on slow container filesystems
+worker_tmp_dir = os.environ.get('GUNICORN_WORKER_TMP_DIR', '/dev/shm' if os.path.isdir('/dev/shm') else None)
+
+# An empty GUNICORN_ACCESS_LOG disables access logging
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-') or None
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def post_worker_init(worker):
+    """Fetch Firebase signing certs before the worker takes requests"""
+    try:
+        from users.oauth import start_cert_refresh
+        start_cert_refresh()
+    except Exception:
+        worker.log.warning('Firebase cert prewarm failed', exc_info=True)
@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+
+
+class MonitoringConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'monitoring'
+
+    def ready(self):
+        from pymongo import monitoring
+        from .listener import MongoCommandListener
+
+        # Must run before the first MongoClient is created; the Mongo
+        # connection is lazy, so app loading is early enough
+        monitoring.register(MongoCommandListener())
@@ -0,0 +1,54 @@
+"""
+Per-request measurements, carried in a contextvar so the pymongo listener
+and the JSON encoder can add to the request that triggered them.
+"""
+import time
+from contextvars import ContextVar
+
+_current = ContextVar('request_metrics', default=None)
+
+# Commands that read or write documents; index builds, session cleanup
+# and the like don't count against a request's query budget
+QUERY_COMMANDS = {
+    'find', 'getMore', 'aggregate', 'count', 'distinct',
+    'insert', 'update', 'delete', 'findAndModify',
+}
+
+
+class RequestMetrics:
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.view = None
+        self.mongo_commands = 0
+        self.mongo_time = 0.0
+        self.query_count = 0
+        self.query_budget = None
+        self.serialize_time = 0.0
+
+    def add_mongo_command(self, command_name, duration):
+        self.mongo_commands += 1
+        self.mongo_time += duration
+        if command_name in QUERY_COMMANDS:
+            self.query_count += 1
+
+    def add_serialization(self, duration):
+        self.serialize_time += duration
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+
+def start_request():
+    """Begin measuring the current request; returns a token for end_request"""
+    metrics = RequestMetrics()
+    return metrics, _current.set(metrics)
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+def current():
+    """Metrics of the request being handled, or None outside a request"""
+    return _current.get()
@@ -0,0 +1,198 @@
+"""
+Slow Mongo command log and per-request query budgets (N+1 detection).
+
+MONGO_DIAGNOSTICS selects the mode:
+
+* ``off``         - nothing is logged
+* ``production``  - commands slower than MONGO_SLOW_QUERY_MS are logged with
+  their redacted filter shape and the calling view, and requests that issue
+  more queries than their budget are flagged
+* ``development`` - as production, plus an explain() plan summary for each
+  slow command, logged from a background thread so the request that ran
+  the command never waits for it
+
+Budgets default to MONGO_QUERY_BUDGET and are set per view with
+@query_budget(n).
+"""
+import asyncio
+import logging
+import queue
+import threading
+from functools import wraps
+
+from django.conf import settings
+
+from .context import current
+
+logger = logging.getLogger('monitoring.queries')
+
+EXPLAINABLE_COMMANDS = {'find', 'aggregate', 'count', 'distinct', 'update', 'delete', 'findAndModify'}
+# Keys that carry query values rather than shape
+VALUE_KEYS = ('filter', 'query', 'q', 'pipeline', 'updates', 'deletes', 'sort', 'hint', 'projection')
+SESSION_KEYS = ('lsid', '$clusterTime', '$db', 'txnNumber', '$readPreference', 'readConcern', 'writeConcern')
+# Slow commands waiting for explain(); more are dropped rather than queued
+EXPLAIN_QUEUE_SIZE = 100
+
+_explain_queue = queue.Queue(maxsize=EXPLAIN_QUEUE_SIZE)
+_explain_thread = None
+_explain_lock = threading.Lock()
+
+
+def mode():
+    return getattr(settings, 'MONGO_DIAGNOSTICS', 'off')
+
+
+def enabled():
+    return mode() in ('production', 'development')
+
+
+def redact(value):
+    """Replace every literal in a filter with '?' while keeping field names and operators"""
+    if isinstance(value, dict):
+        return {key: redact(item) for key, item in value.items()}
+    if isinstance(value, str) and value.startswith('$'):
+        return value  # field path in a pipeline, not a value
+    if isinstance(value, (list, tuple)):
+        if value and all(isinstance(item, dict) for item in value):
+            return [redact(item) for item in value]
+        return '?'
+    return '?'
+
+
+def command_shape(command_name, command):
+    """Collection, and the redacted filter/pipeline of a command document"""
+    shape = {'collection': command.get(command_name)}
+    for key in VALUE_KEYS:
+        if key in command:
+            shape[key] = redact(command[key]) if key not in ('sort', 'hint', 'projection') else command[key]
+    return shape
+
+
+def winning_plan_stages(explain):
+    """Collect stage names from every winningPlan in an explain() document"""
+    stages = []
+
+    def walk_plan(node):
+        if isinstance(node, dict):
+            if 'stage' in node:
+                stages.append(node['stage'])
+            for value in node.values():
+                walk_plan(value)
+        elif isinstance(node, list):
+            for item in node:
+                walk_plan(item)
+
+    def find_plans(node):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key == 'winningPlan':
+                    walk_plan(value)
+                elif key not in ('rejectedPlans', 'allPlansExecution'):
+                    find_plans(value)
+        elif isinstance(node, list):
+            for item in node:
+                find_plans(item)
+
+    find_plans(explain)
+    return stages
+
+
+def explainable(command):
+    """The command without session fields if explain() supports it, else None"""
+    body = {key: value for key, value in command.items() if key not in SESSION_KEYS}
+    if command.get('explain') or next(iter(body), None) not in EXPLAINABLE_COMMANDS:
+        return None
+    return body
+
+
+def explain_summary(database_name, body):
+    """'FETCH <- IXSCAN' style plan for an explainable() command body"""
+    from mongoengine.connection import get_connection
+
+    try:
+        explain = get_connection()[database_name].command({'explain': body, 'verbosity': 'queryPlanner'})
+        return ' <- '.join(winning_plan_stages(explain)) or 'EOF'
+    except Exception as e:
+        return f'explain failed: {e}'
+
+
+def _explain_worker():
+    while True:
+        database_name, body, description = _explain_queue.get()
+        try:
+            logger.warning('Plan for slow Mongo %s: %s', description, explain_summary(database_name, body))
+        finally:
+            _explain_queue.task_done()
+
+
+def queue_explain(database_name, command, description):
+    """
+    Explain a slow command on the background thread. Its explain runs
+    outside any request, so it is neither timed nor logged as slow itself.
+    """
+    global _explain_thread
+
+    body = explainable(command)
+    if body is None:
+        return
+    with _explain_lock:
+        if _explain_thread is None or not _explain_thread.is_alive():
+            _explain_thread = threading.Thread(target=_explain_worker, name='mongo-explain', daemon=True)
+            _explain_thread.start()
+    try:
+        _explain_queue.put_nowait((database_name, body, description))
+    except queue.Full:
+        pass
+
+
+def log_slow_command(command_name, database_name, command, duration):
+    if not enabled() or duration * 1000 < settings.MONGO_SLOW_QUERY_MS:
+        return
+    metrics = current()
+    view = metrics.view if metrics is not None else None
+    logger.warning(
+        'Slow Mongo %s (%.1f ms) in %s: %s',
+        command_name,
+        duration * 1000,
+        view or 'no request',
+        command_shape(command_name, command) if command is not None else '?',
+    )
+    if command is not None and mode() == 'development':
+        queue_explain(database_name, command, f"{command_name} in {view or 'no request'}")
+
+
+def check_query_budget(metrics):
+    """Warn when a request issued more queries than its view allows"""
+    if not enabled():
+        return
+    budget = metrics.query_budget
+    if budget is None:
+        budget = settings.MONGO_QUERY_BUDGET
+    if budget and metrics.query_count > budget:
+        logger.warning(
+            'Possible N+1: %s issued %d Mongo queries (budget %d)',
+            metrics.view or 'unmatched', metrics.query_count, budget,
+        )
+
+
+def query_budget(limit):
+    """Set the number of Mongo queries a view is expected to stay within"""
+    def set_budget():
+        metrics = current()
+        if metrics is not None:
+            metrics.query_budget = limit
+
+    def decorator(view):
+        if asyncio.iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(*args, **kwargs):
+                set_budget()
+                return await view(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            set_budget()
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,37 @@
+from pymongo import monitoring
+
+from . import diagnostics
+from .context import current
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """
+    Adds each Mongo command's server round trip to the current request
+    and hands slow ones to the diagnostics log.
+
+    Commands issued by Motor run on its executor threads without the
+    request's context, so the async views only report their HTTP timings
+    (slow commands are still logged, without a view name).
+    """
+
+    def __init__(self):
+        self._commands = {}
+
+    def started(self, event):
+        if diagnostics.enabled():
+            self._commands[(event.connection_id, event.request_id)] = (event.database_name, event.command)
+
+    def succeeded(self, event):
+        self._finished(event)
+
+    def failed(self, event):
+        self._finished(event)
+
+    def _finished(self, event):
+        duration = event.duration_micros / 1e6
+        database_name, command = self._commands.pop((event.connection_id, event.request_id), (None, None))
+
+        metrics = current()
+        if metrics is not None:
+            metrics.add_mongo_command(event.command_name, duration)
+        diagnostics.log_slow_command(event.command_name, database_name, command, duration)
@@ -0,0 +1,140 @@
+"""
+Minimal Prometheus-style metric registry rendered by /api/metrics/.
+
+Each worker process keeps its own counts, so scrape every worker (or run a
+single one) when comparing totals.
+"""
+import threading
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    body = ','.join('{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+                    for name, value in pairs)
+    return '{' + body + '}'
+
+
+def _format_number(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value)) if abs(value) < 1e15 else repr(value)
+    return repr(value)
+
+
+class Histogram:
+
+    def __init__(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * len(self.buckets), 0, 0.0]
+            counts = series[0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            series[1] += 1
+            series[2] += value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series = sorted((key, [list(value[0]), value[1], value[2]]) for key, value in self._series.items())
+        for label_values, (counts, count, total) in series:
+            for bound, bucket_count in zip(self.buckets, counts):
+                labels = _format_labels(self.labels, label_values, ('le', _format_number(float(bound))))
+                lines.append(f'{self.name}_bucket{labels} {bucket_count}')
+            labels = _format_labels(self.labels, label_values, ('le', '+Inf'))
+            lines.append(f'{self.name}_bucket{labels} {count}')
+            labels = _format_labels(self.labels, label_values)
+            lines.append(f'{self.name}_sum{labels} {_format_number(total)}')
+            lines.append(f'{self.name}_count{labels} {count}')
+        return lines
+
+
+class Gauge:
+    """Gauge whose samples are read from a callback at scrape time"""
+
+    def __init__(self, name, documentation, collect, metric_type='gauge'):
+        self.name = name
+        self.documentation = documentation
+        self.collect = collect
+        self.metric_type = metric_type
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.metric_type}']
+        for labels, value in self.collect():
+            lines.append(f'{self.name}{_format_labels(list(labels), list(labels.values()))} {_format_number(value)}')
+        return lines
+
+
+class Registry:
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+request_duration = registry.register(Histogram(
+    'http_request_duration_seconds', 'Wall time per request', ('view', 'method', 'status')))
+mongo_commands = registry.register(Histogram(
+    'mongo_commands_per_request', 'Mongo commands issued per request', ('view',), COUNT_BUCKETS))
+mongo_duration = registry.register(Histogram(
+    'mongo_duration_seconds', 'Total Mongo command time per request', ('view',)))
+serialize_duration = registry.register(Histogram(
+    'response_serialization_seconds', 'JSON encoding time per request', ('view',)))
+response_size = registry.register(Histogram(
+    'response_size_bytes', 'Response body size', ('view',), SIZE_BUCKETS))
+
+
+def _user_cache_samples(field):
+    def collect():
+        from users.cache import user_cache
+        stats = user_cache.stats()
+        return [({}, stats[field])] if field in stats else []
+    return collect
+
+
+registry.register(Gauge('user_cache_hits_total', 'Authenticated user cache hits',
+                        _user_cache_samples('hits'), 'counter'))
+registry.register(Gauge('user_cache_misses_total', 'Authenticated user cache misses',
+                        _user_cache_samples('misses'), 'counter'))
+registry.register(Gauge('user_cache_size', 'Entries in the in-process user cache',
+                        _user_cache_samples('size')))
+
+
+def record_request(metrics, method, status, size):
+    view = metrics.view or 'unmatched'
+    request_duration.observe(metrics.elapsed(), view, method, status)
+    mongo_commands.observe(metrics.mongo_commands, view)
+    mongo_duration.observe(metrics.mongo_time, view)
+    serialize_duration.observe(metrics.serialize_time, view)
+    if size is not None:
+        response_size.observe(size, view)
@@ -0,0 +1,62 @@
+import asyncio
+
+from .context import end_request, start_request
+from .diagnostics import check_query_budget
+from .metrics import record_request
+
+
+class RequestMetricsMiddleware:
+    """
+    Measures each request: wall time, Mongo command count and time (via
+    MongoCommandListener), JSON serialization time and response size.
+
+    Timings go to the /api/metrics/ histograms under the resolved view and
+    into the response's Server-Timing header.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(self.get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        metrics, token = start_request()
+        request.request_metrics = metrics
+        try:
+            response = self.get_response(request)
+        finally:
+            end_request(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics, token = start_request()
+        request.request_metrics = metrics
+        try:
+            response = await self.get_response(request)
+        finally:
+            end_request(token)
+        return self.finish(request, response, metrics)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.request_metrics.view = f'{view_func.__module__}.{view_func.__name__}'
+        return None
+
+    def finish(self, request, response, metrics):
+        size = None if response.streaming else len(response.content)
+        record_request(metrics, request.method, response.status_code, size)
+        check_query_budget(metrics)
+
+        entries = [
+            f'app;dur={metrics.elapsed() * 1000:.3f}',
+            f'db;dur={metrics.mongo_time * 1000:.3f};desc="{metrics.mongo_commands} commands"',
+            f'serialize;dur={metrics.serialize_time * 1000:.3f}',
+        ]
+        existing = response.get('Server-Timing')
+        if existing:
+            entries.insert(0, existing)
+        response['Server-Timing'] = ', '.join(entries)
+        return response
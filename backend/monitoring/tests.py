@@ -0,0 +1,151 @@
+import threading
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.test import Client, SimpleTestCase, override_settings
+
+from monitoring import diagnostics
+from monitoring.context import end_request, start_request
+
+
+class MetricsEndpointTests(SimpleTestCase):
+
+    def setUp(self):
+        self.client = Client(HTTP_HOST='localhost')
+
+    def test_disabled_by_default(self):
+        response = self.client.get('/api/metrics/')
+        self.assertEqual(response.status_code, 401)
+
+    @override_settings(METRICS_ENABLED=True, METRICS_TOKEN='', METRICS_ALLOWED_IPS=['10.0.0.5'])
+    def test_ip_allowlist(self):
+        self.assertEqual(self.client.get('/api/metrics/').status_code, 403)
+        response = self.client.get('/api/metrics/', REMOTE_ADDR='10.0.0.5')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('text/plain', response['Content-Type'])
+
+    @override_settings(METRICS_ENABLED=True, METRICS_TOKEN='scrape-secret')
+    def test_token_required_when_set(self):
+        self.assertEqual(self.client.get('/api/metrics/').status_code, 403)
+        self.assertEqual(self.client.get('/api/metrics/', HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+        response = self.client.get('/api/metrics/', HTTP_AUTHORIZATION='Bearer scrape-secret')
+        self.assertEqual(response.status_code, 200)
+
+
+class RedactionTests(SimpleTestCase):
+
+    def test_values_are_replaced_and_names_kept(self):
+        self.assertEqual(
+            diagnostics.redact({'user_id': 'abc', 'status': {'$in': ['pending', 'completed']}, 'n': 3}),
+            {'user_id': '?', 'status': {'$in': '?'}, 'n': '?'},
+        )
+
+    def test_pipeline_field_paths_are_kept(self):
+        pipeline = [{'$match': {'user_id': 'abc'}}, {'$group': {'_id': '$status', 'count': {'$sum': 1}}}]
+        self.assertEqual(diagnostics.redact(pipeline), [
+            {'$match': {'user_id': '?'}},
+            {'$group': {'_id': '$status', 'count': {'$sum': '?'}}},
+        ])
+
+    def test_command_shape(self):
+        shape = diagnostics.command_shape('find', {
+            'find': 'tasks', 'filter': {'title': 'secret plans'}, 'sort': {'created_at': -1}, 'lsid': {'id': 1},
+        })
+        self.assertEqual(shape, {'collection': 'tasks', 'filter': {'title': '?'}, 'sort': {'created_at': -1}})
+
+
+@override_settings(MONGO_DIAGNOSTICS='production', MONGO_SLOW_QUERY_MS=100)
+class SlowCommandLogTests(SimpleTestCase):
+    command = {'find': 'tasks', 'filter': {'user_id': 'u-123', 'title': 'secret plans'}}
+
+    def test_slow_command_is_logged_redacted(self):
+        with self.assertLogs('monitoring.queries', 'WARNING') as logs:
+            diagnostics.log_slow_command('find', 'db', self.command, 0.25)
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn('Slow Mongo find (250.0 ms)', logs.output[0])
+        self.assertIn("'title': '?'", logs.output[0])
+        self.assertNotIn('secret plans', logs.output[0])
+        self.assertNotIn('u-123', logs.output[0])
+
+    def test_fast_command_is_not_logged(self):
+        with mock.patch.object(diagnostics.logger, 'warning') as warning:
+            diagnostics.log_slow_command('find', 'db', self.command, 0.05)
+        warning.assert_not_called()
+
+    @override_settings(MONGO_DIAGNOSTICS='off')
+    def test_off(self):
+        with mock.patch.object(diagnostics.logger, 'warning') as warning:
+            diagnostics.log_slow_command('find', 'db', self.command, 5)
+        warning.assert_not_called()
+
+    @override_settings(MONGO_DIAGNOSTICS='development')
+    def test_explain_runs_off_the_request_thread(self):
+        threads = []
+
+        def fake_explain(database_name, body):
+            threads.append(threading.get_ident())
+            return 'FETCH <- IXSCAN'
+
+        with mock.patch.object(diagnostics, 'explain_summary', fake_explain), \
+                self.assertLogs('monitoring.queries', 'WARNING') as logs:
+            diagnostics.log_slow_command('find', 'db', self.command, 0.25)
+            diagnostics._explain_queue.join()
+        self.assertEqual(len(threads), 1)
+        self.assertNotEqual(threads[0], threading.get_ident())
+        self.assertIn('Plan for slow Mongo find in no request: FETCH <- IXSCAN', logs.output[1])
+
+    @override_settings(MONGO_DIAGNOSTICS='development')
+    def test_explain_commands_are_not_explained(self):
+        with mock.patch.object(diagnostics, '_explain_queue') as explain_queue, \
+                self.assertLogs('monitoring.queries', 'WARNING'):
+            diagnostics.log_slow_command('explain', 'db', {'explain': self.command}, 0.25)
+            diagnostics.log_slow_command('insert', 'db', {'insert': 'tasks', 'documents': []}, 0.25)
+        explain_queue.put_nowait.assert_not_called()
+
+
+@override_settings(MONGO_DIAGNOSTICS='production', MONGO_QUERY_BUDGET=10)
+class QueryBudgetTests(SimpleTestCase):
+
+    def run_view(self, view, queries):
+        metrics, token = start_request()
+        try:
+            metrics.view = 'tests.view'
+            view()
+            for _ in range(queries):
+                metrics.add_mongo_command('find', 0.001)
+        finally:
+            end_request(token)
+        return metrics
+
+    def test_decorator_sets_the_budget(self):
+        metrics = self.run_view(diagnostics.query_budget(2)(lambda: None), 0)
+        self.assertEqual(metrics.query_budget, 2)
+
+    def test_decorator_on_async_views(self):
+        @diagnostics.query_budget(3)
+        async def view():
+            return diagnostics.current().query_budget
+
+        metrics, token = start_request()
+        try:
+            self.assertEqual(async_to_sync(view)(), 3)
+        finally:
+            end_request(token)
+
+    def test_over_budget_is_flagged(self):
+        metrics = self.run_view(diagnostics.query_budget(2)(lambda: None), 3)
+        with self.assertLogs('monitoring.queries', 'WARNING') as logs:
+            diagnostics.check_query_budget(metrics)
+        self.assertIn('tests.view issued 3 Mongo queries (budget 2)', logs.output[0])
+
+    def test_within_budget_and_disabled_budget_are_quiet(self):
+        for budget, queries in ((2, 2), (0, 50)):
+            metrics = self.run_view(diagnostics.query_budget(budget)(lambda: None), queries)
+            with mock.patch.object(diagnostics.logger, 'warning') as warning:
+                diagnostics.check_query_budget(metrics)
+            warning.assert_not_called()
+
+    def test_default_budget(self):
+        metrics = self.run_view(lambda: None, 11)
+        with self.assertLogs('monitoring.queries', 'WARNING'):
+            diagnostics.check_query_budget(metrics)
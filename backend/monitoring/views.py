@@ -0,0 +1,31 @@
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse
+
+from backend_project.responses import JsonResponse
+from users.tokens import get_bearer_token
+from .metrics import registry
+
+
+def _scraper_allowed(request):
+    """METRICS_TOKEN as a bearer token when set, otherwise a METRICS_ALLOWED_IPS address"""
+    if settings.METRICS_TOKEN:
+        token = get_bearer_token(request) or ''
+        return hmac.compare_digest(token.encode(), settings.METRICS_TOKEN.encode())
+    return request.META.get('REMOTE_ADDR') in settings.METRICS_ALLOWED_IPS
+
+
+def metrics(request):
+    """Prometheus text exposition of this worker's request metrics"""
+    if not settings.METRICS_ENABLED:
+        return JsonResponse({
+            'success': False,
+            'message': 'Not found'
+        }, status=404)
+    if not _scraper_allowed(request):
+        return JsonResponse({
+            'success': False,
+            'message': 'Forbidden'
+        }, status=403)
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,11 @@
+from django.urls import path
+from . import async_views
+
+urlpatterns = [
+    path('', async_views.get_tasks, name='async_get_tasks'),
+    path('create/', async_views.create_task, name='async_create_task'),
+    path('stats/', async_views.get_task_stats, name='async_get_task_stats'),
+    path('<str:task_id>/', async_views.get_task, name='async_get_task'),
+    path('<str:task_id>/update/', async_views.update_task, name='async_update_task'),
+    path('<str:task_id>/delete/', async_views.delete_task, name='async_delete_task'),
+]
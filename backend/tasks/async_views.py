@@ -0,0 +1,268 @@
+"""
+Async (ASGI) task views backed by Motor.
+
+They mirror the sync views in tasks.views and share their query shapes,
+validation and serializers. Under backend_project.asgi one worker can
+overlap many in-flight Mongo calls instead of blocking a thread on each.
+"""
+import json
+from datetime import datetime
+
+from django.utils.http import quote_etag
+from mongoengine import ValidationError
+from pymongo import ReturnDocument
+
+from backend_project.async_db import get_collection
+from backend_project.responses import JsonResponse
+from users.async_auth import async_api_view
+from .conditional import STALE, expected_version, task_etag
+from .models import Task, TaskTombstone
+from .pagination import (
+    InvalidCursor, InvalidPageParameter, decode_cursor, encode_cursor, keyset_filter, parse_bool, parse_page_params,
+)
+from .queries import (
+    TASK_LIST_SORT, TASK_SEARCH_MAX_LENGTH, TASK_STATS_HINT, mongo_now, parse_object_id, task_list_filter,
+    task_overdue_filter,
+)
+from .search import search_page, search_pipeline
+from .serializers import TASK_FIELDS, serialize_task
+from .stats import stats_from_counters
+from .validation import TaskValidationError, clean_new_task, clean_task_update
+from .bulk import build_task_document
+from .events import task_saved, tasks_deleted
+from .counters import aapply_delta, aread_counters, counter_delta
+
+PROJECTION = {field: 1 for field in TASK_FIELDS}
+
+
+def _error(message, status):
+    return JsonResponse({
+        'success': False,
+        'message': message
+    }, status=status)
+
+
+@async_api_view(['GET'])
+async def get_tasks(request):
+    try:
+        user_id = str(request.user.id)
+        try:
+            page, limit = parse_page_params(request.GET)
+        except InvalidPageParameter as e:
+            return _error(str(e), 400)
+        with_total = parse_bool(request.GET.get('with_total'))
+
+        query = task_list_filter(user_id, request.GET.get('status'), request.GET.get('priority'))
+        collection = get_collection(Task)
+
+        search = request.GET.get('q', '').strip()
+        if search:
+            if len(search) > TASK_SEARCH_MAX_LENGTH:
+                return _error('Search query is too long', 400)
+            try:
+                pipeline = search_pipeline(user_id, search, request.GET.get('status'),
+                                           request.GET.get('priority'), request.GET.get('cursor'), limit)
+            except InvalidCursor:
+                return _error('Invalid cursor', 400)
+            docs, has_more, next_cursor = search_page(await collection.aggregate(pipeline).to_list(None), limit)
+            pagination = {'limit': limit, 'next_cursor': next_cursor, 'has_more': has_more}
+            if with_total:
+                pagination['total'] = await collection.count_documents(pipeline[0]['$match'])
+            return JsonResponse({
+                'success': True,
+                'data': [serialize_task(doc) for doc in docs],
+                'pagination': pagination
+            })
+
+        if 'cursor' in request.GET:
+            find_filter = query
+            cursor = request.GET.get('cursor')
+            if cursor:
+                try:
+                    created_at, last_id = decode_cursor(cursor)
+                except InvalidCursor:
+                    return _error('Invalid cursor', 400)
+                find_filter = dict(query, **keyset_filter(created_at, last_id))
+
+            docs = await collection.find(find_filter, PROJECTION).sort(TASK_LIST_SORT).limit(limit + 1).to_list(None)
+            has_more = len(docs) > limit
+            docs = docs[:limit]
+            pagination = {
+                'limit': limit,
+                'next_cursor': encode_cursor(docs[-1]['created_at'], docs[-1]['_id']) if has_more else None,
+                'has_more': has_more,
+            }
+            if with_total:
+                pagination['total'] = await collection.count_documents(query)
+
+            return JsonResponse({
+                'success': True,
+                'data': [serialize_task(doc) for doc in docs],
+                'pagination': pagination
+            })
+
+        total = await collection.count_documents(query) if with_total else None
+        docs = await collection.find(query, PROJECTION).sort(TASK_LIST_SORT) \
+            .skip((page - 1) * limit).limit(limit).to_list(None)
+
+        return JsonResponse({
+            'success': True,
+            'data': [serialize_task(doc) for doc in docs],
+            'pagination': {
+                'page': page,
+                'limit': limit,
+                'total': total,
+                'pages': (total + limit - 1) // limit if with_total else None
+            }
+        })
+
+    except Exception as e:
+        return _error('Server error', 500)
+
+
+@async_api_view(['POST'])
+async def create_task(request):
+    """Create new task"""
+    try:
+        data = json.loads(request.body)
+        try:
+            doc = build_task_document(str(request.user.id), clean_new_task(data), datetime.utcnow())
+        except (TaskValidationError, ValidationError) as e:
+            return _error(str(e), 400)
+
+        await get_collection(Task).insert_one(doc)
+        await aapply_delta(doc['user_id'], counter_delta(after=doc))
+        task_saved(doc, created=True)
+
+        return JsonResponse({
+            'success': True,
+            'message': 'Task created successfully',
+            'data': serialize_task(doc)
+        }, status=201)
+
+    except json.JSONDecodeError:
+        return _error('Invalid JSON', 400)
+    except Exception as e:
+        return _error('Server error', 500)
+
+
+@async_api_view(['GET'])
+async def get_task(request, task_id):
+    """Get specific task"""
+    try:
+        object_id = parse_object_id(task_id)
+        doc = None
+        if object_id is not None:
+            doc = await get_collection(Task).find_one(
+                {'_id': object_id, 'user_id': str(request.user.id)}, PROJECTION)
+        if doc is None:
+            return _error('Task not found', 404)
+
+        response = JsonResponse({
+            'success': True,
+            'data': serialize_task(doc)
+        })
+        response['ETag'] = quote_etag(task_etag(doc['updated_at']))
+        return response
+
+    except Exception as e:
+        return _error('Server error', 500)
+
+
+@async_api_view(['PUT'])
+async def update_task(request, task_id):
+    """Update task"""
+    try:
+        data = json.loads(request.body)
+        user_id = str(request.user.id)
+
+        object_id = parse_object_id(task_id)
+        if object_id is None:
+            return _error('Task not found', 404)
+
+        try:
+            fields = clean_task_update(data)
+        except TaskValidationError as e:
+            return _error(str(e), 400)
+
+        task_filter = {'_id': object_id, 'user_id': user_id}
+        expected = expected_version(request)
+        if expected is STALE:
+            return _error('Task was modified by another request', 412)
+        if expected is not None:
+            task_filter['updated_at'] = expected
+
+        changes = dict(fields, updated_at=mongo_now())
+        collection = get_collection(Task)
+        before = await collection.find_one_and_update(
+            task_filter,
+            {'$set': changes},
+            projection=PROJECTION,
+            return_document=ReturnDocument.BEFORE,
+        )
+        if before is None:
+            if expected is not None and await collection.count_documents(
+                    {'_id': object_id, 'user_id': user_id}, limit=1):
+                return _error('Task was modified by another request', 412)
+            return _error('Task not found', 404)
+        doc = dict(before, **changes)
+        await aapply_delta(user_id, counter_delta(before, doc))
+        task_saved(dict(doc, user_id=user_id))
+
+        response = JsonResponse({
+            'success': True,
+            'message': 'Task updated successfully',
+            'data': serialize_task(doc)
+        })
+        response['ETag'] = quote_etag(task_etag(doc['updated_at']))
+        return response
+
+    except json.JSONDecodeError:
+        return _error('Invalid JSON', 400)
+    except Exception as e:
+        return _error('Server error', 500)
+
+
+@async_api_view(['DELETE'])
+async def delete_task(request, task_id):
+    """Delete task"""
+    try:
+        user_id = str(request.user.id)
+        object_id = parse_object_id(task_id)
+        if object_id is None:
+            return _error('Task not found', 404)
+
+        deleted = await get_collection(Task).find_one_and_delete(
+            {'_id': object_id, 'user_id': user_id},
+            projection={'status': 1, 'priority': 1},
+        )
+        if deleted is None:
+            return _error('Task not found', 404)
+        await aapply_delta(user_id, counter_delta(before=deleted))
+        await get_collection(TaskTombstone).insert_many(TaskTombstone.documents(user_id, [object_id]))
+        tasks_deleted(user_id, [object_id])
+
+        return JsonResponse({
+            'success': True,
+            'message': 'Task deleted successfully'
+        })
+
+    except Exception as e:
+        return _error('Server error', 500)
+
+
+@async_api_view(['GET'])
+async def get_task_stats(request):
+    """Get task statistics"""
+    try:
+        user_id = str(request.user.id)
+        overdue = await get_collection(Task).count_documents(
+            task_overdue_filter(user_id, datetime.utcnow()), hint=TASK_STATS_HINT)
+
+        return JsonResponse({
+            'success': True,
+            'data': stats_from_counters(await aread_counters(user_id), overdue)
+        })
+
+    except Exception as e:
+        return _error('Server error', 500)
@@ -0,0 +1,207 @@
+"""
+Bulk task writes backed by insert_many / bulk_write.
+
+Each function returns one result per input item, in input order, so
+callers can report partial failures item by item.
+"""
+from datetime import datetime
+
+from mongoengine import ValidationError
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from .counters import COUNTED_FIELDS, apply_delta, combined_delta, rebuild_counters, record_created
+from .events import task_saved, tasks_reset
+from .models import Task
+from .queries import parse_object_id
+from .serializers import serialize_task
+from .validation import TaskValidationError, clean_new_task, clean_task_update
+
+
+def _failure(index, message, task_id=None):
+    result = {'index': index, 'success': False, 'message': message}
+    if task_id is not None:
+        result['id'] = task_id
+    return result
+
+
+def _write_errors(error):
+    """Map a BulkWriteError to {operation index: message}"""
+    return {
+        item['index']: item.get('errmsg', 'Write failed')
+        for item in error.details.get('writeErrors', [])
+    }
+
+
+def _existing(user_id, ids):
+    """{_id: counted fields} for the ids owned by user_id, fetched in one query"""
+    if not ids:
+        return {}
+    cursor = Task._get_collection().find(
+        {'_id': {'$in': list(ids)}, 'user_id': user_id},
+        dict.fromkeys(COUNTED_FIELDS, 1),
+    )
+    return {doc['_id']: doc for doc in cursor}
+
+
+def build_task_document(user_id, fields, now):
+    """Raw document for insert_many, validated by the Task model"""
+    task = Task(user_id=user_id, created_at=now, updated_at=now, **fields)
+    task.validate()
+    return task.to_mongo().to_dict()
+
+
+def insert_task_documents(docs):
+    """
+    Unordered insert_many; returns {position in docs: error message} for
+    the documents that failed
+    """
+    if not docs:
+        return {}
+    errors = {}
+    try:
+        Task._get_collection().insert_many(docs, ordered=False)
+    except BulkWriteError as e:
+        errors = _write_errors(e)
+    record_created(doc for position, doc in enumerate(docs) if position not in errors)
+    return errors
+
+
+def bulk_create(user_id, items):
+    now = datetime.utcnow()
+    results = [None] * len(items)
+    docs = []
+    positions = []
+
+    for index, item in enumerate(items):
+        try:
+            docs.append(build_task_document(user_id, clean_new_task(item), now))
+            positions.append(index)
+        except (TaskValidationError, ValidationError) as e:
+            results[index] = _failure(index, str(e))
+
+    errors = insert_task_documents(docs)
+    for position, (index, doc) in enumerate(zip(positions, docs)):
+        if position in errors:
+            results[index] = _failure(index, errors[position])
+        else:
+            task_saved(doc, created=True)
+            results[index] = {'index': index, 'success': True, 'data': serialize_task(doc)}
+    return results
+
+
+def _unapplied(user_id, pending, now):
+    """
+    {position in pending: message} for the updates bulk_write did not
+    apply. Each applied update stamped updated_at with now, so a task
+    carrying another timestamp was changed or deleted by someone else
+    between the read and the write.
+    """
+    cursor = Task._get_collection().find(
+        {'_id': {'$in': [object_id for _, _, object_id, _, _ in pending]}, 'user_id': user_id},
+        {'updated_at': 1},
+    )
+    written = {doc['_id']: doc.get('updated_at') == now for doc in cursor}
+    unapplied = {}
+    for position, (_, _, object_id, _, _) in enumerate(pending):
+        if object_id not in written:
+            unapplied[position] = 'Task not found'
+        elif not written[object_id]:
+            unapplied[position] = 'Task was modified by another request'
+    return unapplied
+
+
+def bulk_update(user_id, items):
+    # Mongo stores milliseconds; truncate so _unapplied can compare exactly
+    now = datetime.utcnow()
+    now = now.replace(microsecond=now.microsecond // 1000 * 1000)
+    results = [None] * len(items)
+    updates = []
+    seen = set()
+
+    for index, item in enumerate(items):
+        task_id = item.get('id') if isinstance(item, dict) else None
+        object_id = parse_object_id(task_id)
+        if object_id is None:
+            results[index] = _failure(index, 'Task not found', task_id)
+            continue
+        if object_id in seen:
+            # Both writes would be pinned to the same stored state, so the
+            # second could never apply
+            results[index] = _failure(index, 'Duplicate task id', task_id)
+            continue
+        seen.add(object_id)
+        try:
+            fields = clean_task_update({key: value for key, value in item.items() if key != 'id'})
+        except TaskValidationError as e:
+            results[index] = _failure(index, str(e), task_id)
+            continue
+        updates.append((index, task_id, object_id, fields))
+
+    existing = _existing(user_id, [object_id for _, _, object_id, _ in updates])
+    operations = []
+    pending = []
+    for index, task_id, object_id, fields in updates:
+        before = existing.get(object_id)
+        if before is None:
+            results[index] = _failure(index, 'Task not found', task_id)
+            continue
+        task_filter = {'_id': object_id, 'user_id': user_id}
+        if any(field in fields for field in COUNTED_FIELDS):
+            # Pin the status and priority read above so the counter deltas
+            # below describe exactly the transitions that were written
+            task_filter.update((field, before.get(field)) for field in COUNTED_FIELDS)
+        operations.append(UpdateOne(task_filter, {'$set': dict(fields, updated_at=now)}))
+        pending.append((index, task_id, object_id, before, dict(before, **fields)))
+
+    errors = {}
+    if operations:
+        try:
+            matched = Task._get_collection().bulk_write(operations, ordered=False).matched_count
+        except BulkWriteError as e:
+            errors = _write_errors(e)
+            matched = e.details.get('nMatched', 0)
+        if matched == len(operations) - len(errors):
+            apply_delta(user_id, combined_delta(
+                (before, after) for position, (_, _, _, before, after) in enumerate(pending)
+                if position not in errors
+            ))
+        else:
+            # A task changed or vanished between the read and the write.
+            # Report those items as failed rather than retrying, which
+            # could overwrite the newer write.
+            unapplied = _unapplied(user_id, pending, now)
+            errors.update((position, message) for position, message in unapplied.items()
+                          if position not in errors)
+            rebuild_counters(user_id)
+        # Only the $set fields are known here, so subscribers refetch
+        tasks_reset(user_id)
+
+    for position, (index, task_id, _, _, _) in enumerate(pending):
+        if position in errors:
+            results[index] = _failure(index, errors[position], task_id)
+        else:
+            results[index] = {'index': index, 'id': task_id, 'success': True}
+    return results
+
+
+def bulk_delete(user_id, task_ids):
+    results = [None] * len(task_ids)
+    parsed = [(index, task_id, parse_object_id(task_id)) for index, task_id in enumerate(task_ids)]
+
+    existing = _existing(user_id, [object_id for _, _, object_id in parsed if object_id is not None])
+    if existing:
+        result = Task._get_collection().delete_many({'_id': {'$in': list(existing)}, 'user_id': user_id})
+        if result.deleted_count == len(existing):
+            Task.record_deletion(user_id, existing.values())
+        else:
+            # Some were deleted concurrently and already uncounted
+            Task.record_deletion(user_id, existing.values(), count=False)
+            rebuild_counters(user_id)
+
+    for index, task_id, object_id in parsed:
+        if object_id in existing:
+            results[index] = {'index': index, 'id': task_id, 'success': True}
+        else:
+            results[index] = _failure(index, 'Task not found', task_id)
+    return results
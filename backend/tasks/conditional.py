@@ -0,0 +1,142 @@
+"""
+Conditional GET support (ETag) for the task views.
+
+Validators come from cheap index-only lookups, so a poll that ends in a
+304 never runs the full query or serializes any tasks. There is no
+Last-Modified: its one-second granularity would hide writes made later
+in the same second, while the ETags carry milliseconds.
+"""
+import hashlib
+import time
+from datetime import datetime, timedelta
+from functools import wraps
+
+from bson import ObjectId
+from django.conf import settings
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
+from django.views.decorators.http import condition
+
+from .models import Task, TaskTombstone
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def _digest(*parts):
+    return hashlib.sha1('|'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+def task_etag(updated_at):
+    """ETag for a single task; encodes updated_at in milliseconds"""
+    return format((updated_at - EPOCH) // timedelta(milliseconds=1), 'x')
+
+
+def parse_task_etag(etag):
+    """updated_at encoded in a task ETag, or None if it is not one of ours"""
+    if etag.startswith('W/'):
+        etag = etag[2:]
+    try:
+        return EPOCH + timedelta(milliseconds=int(etag.strip('"'), 16))
+    except (ValueError, OverflowError):
+        return None
+
+
+# Returned by expected_version() for an If-Match that can never match
+STALE = object()
+
+
+def expected_version(request):
+    """
+    updated_at pinned by an If-Match header: None when there is no
+    precondition, STALE when the ETag is not one of ours
+    """
+    etags = parse_etags(request.META.get('HTTP_IF_MATCH', ''))
+    if not etags or etags == ['*']:
+        return None
+    return parse_task_etag(etags[0]) or STALE
+
+
+def task_list_validators(request):
+    """
+    (latest updated_at, latest deletion) for the requesting user, once per
+    request. Every write stamps updated_at and every delete leaves a
+    tombstone (Task.record_deletion), so together they change whenever
+    the user's tasks do.
+    """
+    if not hasattr(request, '_task_list_validators'):
+        validators = None
+        try:
+            user_id = str(request.user.id)
+            # Answered from the (user_id, updated_at) and
+            # (user_id, deleted_at) indexes
+            latest = Task._get_collection().find_one(
+                {'user_id': user_id},
+                {'_id': 0, 'updated_at': 1},
+                sort=[('updated_at', -1)],
+            )
+            deleted = TaskTombstone._get_collection().find_one(
+                {'user_id': user_id},
+                {'_id': 0, 'deleted_at': 1},
+                sort=[('deleted_at', -1)],
+            )
+            validators = (latest['updated_at'] if latest else None, deleted['deleted_at'] if deleted else None)
+        except Exception:
+            # Without validators the view simply runs unconditionally
+            pass
+        request._task_list_validators = validators
+    return request._task_list_validators
+
+
+def task_detail_updated_at(request, task_id):
+    if not hasattr(request, '_task_updated_at'):
+        updated_at = None
+        try:
+            doc = Task._get_collection().find_one(
+                {'_id': ObjectId(task_id), 'user_id': str(request.user.id)},
+                {'_id': 0, 'updated_at': 1},
+            )
+            updated_at = doc.get('updated_at') if doc else None
+        except Exception:
+            # Malformed ids and lookup errors fall through to the view itself
+            pass
+        request._task_updated_at = updated_at
+    return request._task_updated_at
+
+
+def task_list_etag(request, *args, **kwargs):
+    validators = task_list_validators(request)
+    if validators is None:
+        return None
+    return _digest('list', request.user.id, *validators, request.get_full_path())
+
+
+def task_stats_etag(request, *args, **kwargs):
+    validators = task_list_validators(request)
+    if validators is None:
+        return None
+    # Overdue counts change with the clock, not only with writes
+    bucket = int(time.time() // settings.TASK_STATS_ETAG_SECONDS)
+    return _digest('stats', request.user.id, *validators, bucket)
+
+
+def task_detail_etag(request, task_id, *args, **kwargs):
+    updated_at = task_detail_updated_at(request, task_id)
+    return task_etag(updated_at) if updated_at else None
+
+
+def conditional(etag_func):
+    """
+    Django's condition() plus headers keeping shared caches out of
+    per-user responses
+    """
+    def decorator(view):
+        conditional_view = condition(etag_func=etag_func)(view)
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            response = conditional_view(request, *args, **kwargs)
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ('Authorization',))
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,151 @@
+"""
+Per-user task counters (UserTaskStats) maintained incrementally.
+
+Every write that adds or removes tasks, or changes a task's status or
+priority, applies one $inc to the owner's counters document, so stats are
+a primary-key read instead of a scan of the user's tasks.
+
+Increments never create the document: while it is missing they are
+dropped and the next read rebuilds it from the tasks collection, so a
+partially counted document cannot appear. A write racing a rebuild can
+still leave the counts off by one; reconcile_task_stats rebuilds them.
+"""
+from collections import Counter, defaultdict
+from datetime import datetime
+
+from pymongo.errors import DuplicateKeyError
+
+from .models import Task, UserTaskStats
+
+COUNTED_FIELDS = ('status', 'priority')
+FIELD_DEFAULTS = {'status': 'pending', 'priority': 'medium'}
+
+
+def _counter_key(doc, field):
+    return f'{field}.{doc.get(field) or FIELD_DEFAULTS[field]}'
+
+
+def counter_delta(before=None, after=None):
+    """$inc document for one task changing from before to after (None = absent)"""
+    delta = Counter()
+    for doc, sign in ((before, -1), (after, 1)):
+        if doc is None:
+            continue
+        delta['total'] += sign
+        for field in COUNTED_FIELDS:
+            delta[_counter_key(doc, field)] += sign
+    return {key: value for key, value in delta.items() if value}
+
+
+def combined_delta(changes):
+    """One $inc document for many (before, after) pairs"""
+    delta = Counter()
+    for before, after in changes:
+        delta.update(counter_delta(before, after))
+    return {key: value for key, value in delta.items() if value}
+
+
+def apply_delta(user_id, delta):
+    if delta:
+        UserTaskStats._get_collection().update_one({'_id': str(user_id)}, {'$inc': delta})
+
+
+async def aapply_delta(user_id, delta):
+    """apply_delta for the async views"""
+    from backend_project.async_db import get_collection
+
+    if delta:
+        await get_collection(UserTaskStats).update_one({'_id': str(user_id)}, {'$inc': delta})
+
+
+def record_created(docs):
+    """Count newly inserted task documents, one update per owner"""
+    by_user = defaultdict(list)
+    for doc in docs:
+        by_user[doc['user_id']].append((None, doc))
+    for user_id, changes in by_user.items():
+        apply_delta(user_id, combined_delta(changes))
+
+
+def record_deleted(user_id, docs):
+    """Uncount deleted tasks; docs need only status and priority"""
+    apply_delta(user_id, combined_delta((doc, None) for doc in docs))
+
+
+def counters_pipeline(user_id=None):
+    """Counts per (user, status, priority); every user when user_id is None"""
+    pipeline = [
+        {'$group': {
+            '_id': {'user_id': '$user_id', 'status': '$status', 'priority': '$priority'},
+            'count': {'$sum': 1},
+        }},
+    ]
+    if user_id is not None:
+        pipeline.insert(0, {'$match': {'user_id': str(user_id)}})
+    return pipeline
+
+
+def counters_from_rows(rows):
+    """Fold counters_pipeline output into {user_id: counters document}"""
+    now = datetime.utcnow()
+    counters = {}
+    for row in rows:
+        key = row['_id']
+        doc = counters.setdefault(key['user_id'], {
+            '_id': key['user_id'], 'total': 0, 'status': {}, 'priority': {}, 'rebuilt_at': now,
+        })
+        doc['total'] += row['count']
+        for field in COUNTED_FIELDS:
+            value = key.get(field) or FIELD_DEFAULTS[field]
+            doc[field][value] = doc[field].get(value, 0) + row['count']
+    return counters
+
+
+def empty_counters(user_id):
+    return {'_id': str(user_id), 'total': 0, 'status': {}, 'priority': {}, 'rebuilt_at': datetime.utcnow()}
+
+
+def read_counters(user_id):
+    """Counters document for user_id, built from the tasks on first use"""
+    user_id = str(user_id)
+    counters = UserTaskStats._get_collection().find_one({'_id': user_id})
+    if counters is None:
+        rows = Task._get_collection().aggregate(counters_pipeline(user_id))
+        counters = counters_from_rows(rows).get(user_id) or empty_counters(user_id)
+        try:
+            UserTaskStats._get_collection().insert_one(counters)
+        except DuplicateKeyError:
+            # Rebuilt concurrently by another request; either copy will do
+            pass
+    return counters
+
+
+async def aread_counters(user_id):
+    """read_counters for the async views"""
+    from backend_project.async_db import get_collection
+
+    user_id = str(user_id)
+    collection = get_collection(UserTaskStats)
+    counters = await collection.find_one({'_id': user_id})
+    if counters is None:
+        rows = await get_collection(Task).aggregate(counters_pipeline(user_id)).to_list(None)
+        counters = counters_from_rows(rows).get(user_id) or empty_counters(user_id)
+        try:
+            await collection.insert_one(counters)
+        except DuplicateKeyError:
+            pass
+    return counters
+
+
+def rebuild_counters(user_id):
+    """Recount one user's tasks and overwrite their counters"""
+    user_id = str(user_id)
+    rows = Task._get_collection().aggregate(counters_pipeline(user_id))
+    counters = counters_from_rows(rows).get(user_id) or empty_counters(user_id)
+    UserTaskStats._get_collection().replace_one({'_id': user_id}, counters, upsert=True)
+    return counters
+
+
+def forget_counters(user_ids):
+    """Drop counters so they are rebuilt on next read, e.g. after raw inserts"""
+    UserTaskStats._get_collection().delete_many({'_id': {'$in': [str(user_id) for user_id in user_ids]}})
@@ -0,0 +1,167 @@
+"""
+Task change events for the SSE stream (tasks.sse).
+
+Events reach subscribers from one of two sources:
+
+* a Mongo change stream over tasks and task_tombstones, shared by every
+  connection on an event loop (deletes come from tombstone inserts, which
+  carry the owning user_id)
+* an in-process broker fed by the write paths (Task.save(), the views,
+  bulk writes and imports), used when change streams are unavailable
+  (standalone mongod) or TASK_EVENTS_SOURCE=local. It only sees writes
+  made by the same process, so run a single ASGI worker in that mode.
+
+Publishers may run on any thread; events are handed to each subscriber's
+event loop with call_soon_threadsafe.
+"""
+import asyncio
+import logging
+import threading
+import weakref
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+TASK_CREATED = 'task.created'
+TASK_UPDATED = 'task.updated'
+TASK_DELETED = 'task.deleted'
+# Tells clients to refetch: events were dropped or a write touched many tasks
+TASKS_RESET = 'tasks.reset'
+
+# Change stream error codes meaning "not supported here" rather than transient
+CHANGE_STREAM_UNSUPPORTED = {40573, 40324, 303}
+
+
+class Subscription:
+
+    def __init__(self, user_id, maxsize):
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def offer(self, event):
+        """Queue an event; runs on the subscriber's loop"""
+        if self.queue.full():
+            self.overflowed = True
+        else:
+            self.queue.put_nowait(event)
+
+
+class TaskEventBroker:
+
+    def __init__(self):
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id):
+        subscription = Subscription(user_id, settings.TASK_EVENTS_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscribers.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscribers[subscription.user_id]
+
+    def connection_count(self):
+        with self._lock:
+            return sum(len(subscriptions) for subscriptions in self._subscribers.values())
+
+    def publish(self, user_id, event):
+        with self._lock:
+            subscriptions = list(self._subscribers.get(user_id, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, event)
+            except RuntimeError:
+                # The subscriber's loop has shut down
+                self.unsubscribe(subscription)
+
+
+broker = TaskEventBroker()
+
+# 'change_stream' once a watcher is running in this process
+_source = None
+_watchers = weakref.WeakKeyDictionary()
+
+
+def publish_task_event(user_id, event_type, data):
+    """Deliver an event through the in-process broker unless a change stream already does"""
+    if _source == 'change_stream':
+        return
+    broker.publish(str(user_id), (event_type, data))
+
+
+def task_saved(doc, created=False):
+    """Publish a created/updated event for a raw task document"""
+    from .serializers import serialize_task
+
+    publish_task_event(doc['user_id'], TASK_CREATED if created else TASK_UPDATED, serialize_task(doc))
+
+
+def tasks_deleted(user_id, task_ids):
+    for task_id in task_ids:
+        publish_task_event(user_id, TASK_DELETED, {'id': str(task_id)})
+
+
+def tasks_reset(user_id):
+    publish_task_event(user_id, TASKS_RESET, {})
+
+
+def ensure_watcher():
+    """Start the change stream watcher for the running loop, once"""
+    if settings.TASK_EVENTS_SOURCE == 'local' or _source == 'local':
+        return
+    loop = asyncio.get_running_loop()
+    if loop not in _watchers:
+        _watchers[loop] = loop.create_task(_watch_changes())
+
+
+async def _watch_changes():
+    global _source
+    from pymongo.errors import OperationFailure, PyMongoError
+
+    from backend_project.async_db import get_database
+    from .models import Task, TaskTombstone
+    from .serializers import serialize_task
+
+    tasks_name = Task._get_collection_name()
+    tombstones_name = TaskTombstone._get_collection_name()
+    pipeline = [{'$match': {'$or': [
+        {'ns.coll': tasks_name, 'operationType': {'$in': ['insert', 'update', 'replace']}},
+        {'ns.coll': tombstones_name, 'operationType': 'insert'},
+    ]}}]
+
+    resume_token = None
+    while True:
+        try:
+            async with get_database().watch(pipeline, full_document='updateLookup',
+                                            resume_after=resume_token) as stream:
+                _source = 'change_stream'
+                async for change in stream:
+                    resume_token = stream.resume_token
+                    doc = change.get('fullDocument')
+                    if doc is None:
+                        continue  # updated, then deleted before the lookup
+                    if change['ns']['coll'] == tombstones_name:
+                        broker.publish(doc['user_id'], (TASK_DELETED, {'id': str(doc['task_id'])}))
+                    else:
+                        event_type = TASK_CREATED if change['operationType'] == 'insert' else TASK_UPDATED
+                        broker.publish(doc['user_id'], (event_type, serialize_task(doc)))
+        except OperationFailure as e:
+            if e.code in CHANGE_STREAM_UNSUPPORTED or _source is None:
+                logger.info('Change streams unavailable (%s); using in-process task events', e)
+                _source = 'local'
+                return
+            logger.warning('Task change stream failed, restarting', exc_info=True)
+            # The resume token may have aged out of the oplog; start fresh
+            resume_token = None
+        except PyMongoError:
+            logger.warning('Task change stream failed, resuming', exc_info=True)
+        await asyncio.sleep(1)
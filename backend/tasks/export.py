@@ -0,0 +1,79 @@
+"""
+Streaming task export (NDJSON or CSV, optionally gzipped).
+
+Rows come from a batched pymongo cursor and are encoded into ~64 KB
+chunks as the response is sent, so memory stays flat whatever the number
+of tasks.
+"""
+import csv
+import io
+import zlib
+
+from backend_project.responses import dumps
+from .models import Task
+from .queries import TASK_LIST_SORT
+from .serializers import TASK_FIELDS, serialize_task
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+CSV_COLUMNS = ('id',) + TASK_FIELDS
+CHUNK_SIZE = 64 * 1024
+BATCH_SIZE = 1000
+
+
+def export_cursor(user_id, batch_size=BATCH_SIZE):
+    """The user's tasks, newest first, fetched batch_size documents at a time"""
+    return Task._get_collection().find(
+        {'user_id': user_id},
+        {field: 1 for field in TASK_FIELDS},
+        sort=TASK_LIST_SORT,
+        batch_size=batch_size,
+    )
+
+
+def ndjson_chunks(docs):
+    buffer = []
+    size = 0
+    for doc in docs:
+        line = dumps(serialize_task(doc)) + b'\n'
+        buffer.append(line)
+        size += len(line)
+        if size >= CHUNK_SIZE:
+            yield b''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def csv_chunks(docs):
+    text = io.StringIO()
+    writer = csv.writer(text)
+    writer.writerow(CSV_COLUMNS)
+    for doc in docs:
+        row = serialize_task(doc)
+        writer.writerow(['' if row[column] is None else row[column] for column in CSV_COLUMNS])
+        if text.tell() >= CHUNK_SIZE:
+            yield text.getvalue().encode('utf-8')
+            text.seek(0)
+            text.truncate()
+    if text.tell():
+        yield text.getvalue().encode('utf-8')
+
+
+def gzip_chunks(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31: gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_stream(user_id, export_format, gzip=False):
+    """Iterator of encoded chunks for the user's tasks"""
+    docs = export_cursor(user_id)
+    chunks = ndjson_chunks(docs) if export_format == 'ndjson' else csv_chunks(docs)
+    return gzip_chunks(chunks) if gzip else chunks
@@ -0,0 +1,180 @@
+"""
+Streaming task import from NDJSON or CSV, shared by the import endpoint
+and the import_tasks command.
+
+Rows are parsed one line at a time, validated with the create_task rules
+and written with unordered insert_many batches, so memory is bounded by
+the batch size and MAX_LINE_BYTES rather than by the size of the upload.
+Rejected rows, including over-long lines, are reported with their line
+number.
+"""
+import csv
+import gzip
+import json
+import time
+from datetime import datetime
+
+from mongoengine import ValidationError
+
+from .bulk import build_task_document, insert_task_documents
+from .events import tasks_reset
+from .validation import TaskValidationError, clean_new_task
+
+IMPORT_FORMATS = ('ndjson', 'csv')
+BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+# Longest accepted line; a task (255 character title, 1000 character
+# description) fits comfortably even with every character escaped
+MAX_LINE_BYTES = 64 * 1024
+LINE_TOO_LONG = f'Line is longer than {MAX_LINE_BYTES} bytes'
+
+
+def detect_format(filename, default=None):
+    """ndjson or csv from a file name such as tasks.csv.gz"""
+    name = (filename or '').lower()
+    if name.endswith('.gz'):
+        name = name[:-3]
+    for export_format, extensions in (('ndjson', ('.ndjson', '.jsonl')), ('csv', ('.csv',))):
+        if name.endswith(extensions):
+            return export_format
+    return default
+
+
+def open_stream(stream, compressed=False):
+    """Binary stream, transparently gunzipped"""
+    return gzip.GzipFile(fileobj=stream, mode='rb') if compressed else stream
+
+
+def _lines(stream, max_bytes=MAX_LINE_BYTES):
+    """Lines of the stream; None in place of a line longer than max_bytes"""
+    while True:
+        line = stream.readline(max_bytes + 1)
+        if not line:
+            return
+        if len(line) > max_bytes and not line.endswith(b'\n'):
+            # Skip the rest of the line without holding it in memory
+            while line and not line.endswith(b'\n'):
+                line = stream.readline(max_bytes + 1)
+            yield None
+        else:
+            yield line
+
+
+def ndjson_rows(stream):
+    """(line number, row dict or error message) for each non-blank line"""
+    for line_number, line in enumerate(_lines(stream), start=1):
+        if line is None:
+            yield line_number, LINE_TOO_LONG
+            continue
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError:
+            yield line_number, 'Invalid JSON'
+
+
+def csv_rows(stream):
+    """
+    Same as ndjson_rows for CSV with a header row. Accepts the export's
+    due_date column as well as dueDate; empty cells count as missing.
+    """
+    too_long = []
+
+    def text():
+        for line_number, line in enumerate(_lines(stream), start=1):
+            if line is None:
+                # Reported below; the reader sees a blank line and skips it
+                too_long.append(line_number)
+                yield '\n'
+            else:
+                yield line.decode('utf-8-sig' if line_number == 1 else 'utf-8')
+
+    reader = csv.DictReader(text())
+    for row in reader:
+        while too_long:
+            yield too_long.pop(0), LINE_TOO_LONG
+        row = {key: value for key, value in row.items() if key and value != ''}
+        if 'dueDate' not in row and 'due_date' in row:
+            row['dueDate'] = row['due_date']
+        yield reader.line_num, row
+    for line_number in too_long:
+        yield line_number, LINE_TOO_LONG
+
+
+def import_tasks(user_id, rows, batch_size=BATCH_SIZE, max_rows=None):
+    """Validate and insert rows for user_id; returns a summary dict"""
+    start = time.perf_counter()
+    now = datetime.utcnow()
+    imported = 0
+    rejected = 0
+    errors = []
+    truncated = False
+    read_error = None
+    batch = []
+    batch_lines = []
+
+    def reject(line_number, message):
+        nonlocal rejected
+        rejected += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append({'line': line_number, 'message': message})
+
+    def flush():
+        nonlocal imported
+        failed = insert_task_documents(batch)
+        for position, line_number in enumerate(batch_lines):
+            if position in failed:
+                reject(line_number, failed[position])
+        imported += len(batch) - len(failed)
+        batch.clear()
+        batch_lines.clear()
+
+    rows = iter(rows)
+    count = 0
+    while True:
+        try:
+            line_number, row = next(rows)
+        except StopIteration:
+            break
+        except (UnicodeDecodeError, csv.Error, OSError, EOFError) as e:
+            # Unreadable input stops the import; rows before it are kept
+            read_error = f'Could not read the upload: {e}'
+            break
+        count += 1
+        if max_rows is not None and count > max_rows:
+            truncated = True
+            break
+        if isinstance(row, str):
+            reject(line_number, row)
+            continue
+        try:
+            batch.append(build_task_document(user_id, clean_new_task(row), now))
+            batch_lines.append(line_number)
+        except (TaskValidationError, ValidationError) as e:
+            reject(line_number, str(e))
+            continue
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    if imported:
+        # One refetch hint rather than an event per imported row
+        tasks_reset(user_id)
+
+    elapsed = time.perf_counter() - start
+    return {
+        'imported': imported,
+        'rejected': rejected,
+        'errors': errors,
+        'truncated': truncated,
+        'read_error': read_error,
+        'seconds': round(elapsed, 3),
+        'rows_per_sec': round((imported + rejected) / elapsed, 1) if elapsed else None,
+    }
+
+
+def import_stream(user_id, stream, import_format, compressed=False, **kwargs):
+    stream = open_stream(stream, compressed)
+    rows = ndjson_rows(stream) if import_format == 'ndjson' else csv_rows(stream)
+    return import_tasks(user_id, rows, **kwargs)
@@ -0,0 +1,79 @@
+from datetime import datetime
+
+from bson import ObjectId
+from django.core.management.base import BaseCommand, CommandError
+
+from monitoring.diagnostics import winning_plan_stages
+from tasks.models import Task
+from tasks.pagination import keyset_filter
+from tasks.queries import (
+    TASK_LIST_SORT, TASK_STATS_HINT, task_list_filter, task_overdue_filter, task_search_pipeline,
+)
+
+FLAGGED_STAGES = {'COLLSCAN', 'SORT'}
+TEXT_STAGES = {'TEXT', 'TEXT_MATCH', 'TEXT_OR'}
+
+
+class Command(BaseCommand):
+    help = 'Run explain() on the task view queries and flag COLLSCAN or in-memory SORT stages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user-id', help='User whose tasks to explain (default: any user with tasks)')
+        parser.add_argument('--strict', action='store_true', help='Exit non-zero when a query is flagged')
+
+    def handle(self, *args, **options):
+        collection = Task._get_collection()
+        user_id = options['user_id']
+        if not user_id:
+            sample = collection.find_one({}, {'user_id': 1})
+            user_id = sample['user_id'] if sample else 'index-audit'
+
+        def find(query, limit=10):
+            return lambda: collection.find(query).sort(TASK_LIST_SORT).limit(limit).explain()
+
+        def count(query, hint=None):
+            command = {'count': collection.name, 'query': query}
+            if hint:
+                command['hint'] = dict(hint)
+            return lambda: collection.database.command({'explain': command})
+
+        def aggregate(pipeline, hint=None):
+            command = {'aggregate': collection.name, 'pipeline': pipeline, 'explain': True}
+            if hint:
+                command['hint'] = dict(hint)
+            return lambda: collection.database.command(command)
+
+        cursor = keyset_filter(datetime.utcnow(), ObjectId())
+        shapes = [
+            ('get_tasks', find(task_list_filter(user_id))),
+            ('get_tasks?status', find(task_list_filter(user_id, status='pending'))),
+            ('get_tasks?priority', find(task_list_filter(user_id, priority='high'))),
+            ('get_tasks?status&priority', find(task_list_filter(user_id, 'pending', 'high'))),
+            ('get_tasks?cursor', find(dict(task_list_filter(user_id), **cursor))),
+            ('get_task_stats overdue', count(task_overdue_filter(user_id, datetime.utcnow()), TASK_STATS_HINT)),
+            ('get_tasks?q', aggregate(task_search_pipeline(user_id, 'report'))),
+        ]
+
+        flagged = 0
+        for name, explain in shapes:
+            stages = winning_plan_stages(explain())
+            problems = FLAGGED_STAGES.intersection(stages)
+            if name == 'get_tasks?q':
+                # Ranking by text score is always a sort; what matters is
+                # that matches come from the text index
+                problems.discard('SORT')
+                if not TEXT_STAGES.intersection(stages):
+                    problems.add('no text index')
+            if name == 'get_task_stats overdue' and 'FETCH' in stages:
+                # Counted from the index alone, without loading documents
+                problems.add('not covered')
+            problems = sorted(problems)
+            plan = ' <- '.join(stages) or 'EOF'
+            if problems:
+                flagged += 1
+                self.stdout.write(self.style.WARNING(f'{name}: {", ".join(problems)} ({plan})'))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'{name}: ok ({plan})'))
+
+        if flagged and options['strict']:
+            raise CommandError(f'{flagged} query shape(s) need an index')
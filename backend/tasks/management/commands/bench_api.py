@@ -0,0 +1,177 @@
+"""
+End-to-end API benchmark through Django's test client.
+
+Seeds users and tasks, then times each scenario through the full
+middleware stack and prints JSON with throughput, p50/p95/p99 and Mongo
+commands per request (taken from the Server-Timing header)::
+
+    python manage.py bench_api --users 2 --tasks 5000 --output before.json
+    python manage.py bench_api --mongomock
+
+Runs against --mongodb-uri (a database whose name mentions "bench" or
+"test") or an in-memory mongomock client. mongomock has no command
+monitoring, so Mongo counts are null there; compare its latencies only
+with other mongomock runs.
+"""
+import json
+import random
+import re
+import subprocess
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import override_settings
+
+from benchmarks.common import DEFAULT_BENCH_URI, summarize
+from tasks.models import Task, TaskTombstone
+from tasks.seeding import clear_seeded, is_scratch_database, seed_tasks, seed_users
+
+EMAIL_PREFIX = 'bench-api'
+PASSWORD = 'benchpass123'
+DB_COMMANDS = re.compile(r'db;dur=[\d.]+;desc="(\d+) commands"')
+
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the API views through the test client and report latency percentiles as JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=2)
+        parser.add_argument('--tasks', type=int, default=2000, help='Tasks per user')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per scenario')
+        parser.add_argument('--login-requests', type=int, default=20,
+                            help='Requests for the login scenario (each one runs the password hasher)')
+        parser.add_argument('--limit', type=int, default=10, help='Page size for get_tasks')
+        parser.add_argument('--scenarios', nargs='+', help='Only run these scenarios')
+        parser.add_argument('--mongodb-uri', default=DEFAULT_BENCH_URI)
+        parser.add_argument('--mongomock', action='store_true', help='Use an in-memory mongomock client')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Also write the JSON report to this file')
+
+    def handle(self, *args, **options):
+        backend = self._connect(options)
+        rng = random.Random(options['seed'])
+
+        clear_seeded(EMAIL_PREFIX)
+        Task.ensure_indexes()
+        TaskTombstone.ensure_indexes()
+        users = seed_users(options['users'], PASSWORD, EMAIL_PREFIX)
+        seed_tasks([doc['_id'] for doc in users], options['tasks'], seed=options['seed'])
+        email = users[0]['email']
+        task_ids = [str(doc['_id']) for doc in Task._get_collection().find(
+            {'user_id': str(users[0]['_id'])}, {'_id': 1}).limit(1000)]
+
+        client = Client(HTTP_HOST='localhost')
+        limit = options['limit']
+        last_page = max(1, -(-options['tasks'] // limit))
+        login_body = json.dumps({'email': email, 'password': PASSWORD})
+
+        with override_settings(RATELIMIT_ENABLE=False):
+            response = client.post('/api/users/login/', login_body, content_type='application/json')
+            if response.status_code != 200:
+                raise CommandError(f'Login failed: {response.status_code} {response.content[:200]!r}')
+            auth = {'HTTP_AUTHORIZATION': f'Bearer {response.json()["token"]}'}
+
+            def get(path):
+                return lambda i: client.get(path, **auth)
+
+            def create(i):
+                body = {'title': f'Bench task {i}', 'priority': rng.choice(['low', 'medium', 'high'])}
+                return client.post('/api/tasks/create/', json.dumps(body), content_type='application/json', **auth)
+
+            def update(i):
+                body = {'status': rng.choice(['pending', 'in-progress', 'completed'])}
+                return client.put(f'/api/tasks/{rng.choice(task_ids)}/update/', json.dumps(body),
+                                  content_type='application/json', **auth)
+
+            def login(i):
+                return client.post('/api/users/login/', login_body, content_type='application/json')
+
+            scenarios = [
+                ('auth', get('/api/users/me/'), options['requests']),
+                ('get_tasks', get(f'/api/tasks/?limit={limit}'), options['requests']),
+                ('get_tasks_status', get(f'/api/tasks/?status=pending&limit={limit}'), options['requests']),
+                ('get_tasks_priority', get(f'/api/tasks/?priority=high&limit={limit}'), options['requests']),
+                ('get_tasks_deep_page', get(f'/api/tasks/?page={last_page}&limit={limit}'), options['requests']),
+                ('get_tasks_cursor', get(f'/api/tasks/?cursor=&limit={limit}&with_total=false'), options['requests']),
+                ('get_task_stats', get('/api/tasks/stats/'), options['requests']),
+                ('create_task', create, options['requests']),
+                ('update_task', update, options['requests']),
+                ('login', login, options['login_requests']),
+            ]
+            if options['scenarios']:
+                unknown = set(options['scenarios']) - {name for name, _, _ in scenarios}
+                if unknown:
+                    raise CommandError(f'Unknown scenarios: {", ".join(sorted(unknown))}')
+                scenarios = [scenario for scenario in scenarios if scenario[0] in options['scenarios']]
+
+            results = {
+                name: self._run(request, count, count_mongo=backend != 'mongomock')
+                for name, request, count in scenarios
+            }
+
+        clear_seeded(EMAIL_PREFIX)
+        report = {
+            'revision': _git_revision(),
+            'backend': backend,
+            'users': options['users'],
+            'tasks_per_user': options['tasks'],
+            'scenarios': results,
+        }
+        output = json.dumps(report, indent=2)
+        self.stdout.write(output)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+
+    def _connect(self, options):
+        """Point MongoEngine at the benchmark database; returns the backend name"""
+        from mongoengine import connect, disconnect
+
+        disconnect()
+        if options['mongomock']:
+            try:
+                import mongomock
+            except ImportError:
+                raise CommandError('--mongomock needs the mongomock package (pip install mongomock)')
+            connect('bench_api', host='mongodb://localhost', mongo_client_class=mongomock.MongoClient)
+            return 'mongomock'
+
+        uri = options['mongodb_uri']
+        db_name = uri.split('/')[-1].split('?')[0]
+        if not is_scratch_database(db_name):
+            raise CommandError(f'Refusing to benchmark against database "{db_name}"')
+        connect(host=uri, **settings.MONGODB_CLIENT_OPTIONS)
+        return 'mongod'
+
+    def _run(self, request, count, count_mongo=True):
+        request(0)  # warm up caches and connections
+        latencies = []
+        mongo_ops = []
+        errors = 0
+        for i in range(count):
+            start = time.perf_counter()
+            response = request(i)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+            match = DB_COMMANDS.search(response.get('Server-Timing', ''))
+            if match:
+                mongo_ops.append(int(match.group(1)))
+
+        elapsed = sum(latencies)
+        return dict(
+            summarize(latencies),
+            errors=errors,
+            requests_per_sec=round(count / elapsed, 1) if elapsed else None,
+            mongo_ops_per_request=round(sum(mongo_ops) / len(mongo_ops), 2) if count_mongo and mongo_ops else None,
+        )
@@ -0,0 +1,58 @@
+import sys
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.importer import BATCH_SIZE, IMPORT_FORMATS, detect_format, import_stream
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = 'Import tasks for a user from an NDJSON or CSV file (gzipped if it ends in .gz)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import, or '-' for stdin")
+        parser.add_argument('--user', required=True, help='Id or email of the owning user')
+        parser.add_argument('--format', choices=IMPORT_FORMATS, help='Default: from the file extension')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        user = self._find_user(options['user'])
+        path = options['path']
+        import_format = options['format'] or detect_format(path)
+        if import_format is None:
+            raise CommandError('Cannot tell the format from the file name; pass --format')
+
+        compressed = path.lower().endswith('.gz')
+        if path == '-':
+            result = import_stream(str(user.id), sys.stdin.buffer, import_format, compressed,
+                                   batch_size=options['batch_size'])
+        else:
+            try:
+                with open(path, 'rb') as f:
+                    result = import_stream(str(user.id), f, import_format, compressed,
+                                           batch_size=options['batch_size'])
+            except FileNotFoundError:
+                raise CommandError(f'No such file: {path}')
+
+        for error in result['errors']:
+            self.stdout.write(self.style.WARNING(f"line {error['line']}: {error['message']}"))
+        if result['rejected'] > len(result['errors']):
+            self.stdout.write(f"... {result['rejected'] - len(result['errors'])} more rejected rows")
+        if result['read_error']:
+            self.stdout.write(self.style.ERROR(result['read_error']))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result['imported']} tasks for {user.email}, rejected {result['rejected']} "
+            f"in {result['seconds']}s ({result['rows_per_sec']} rows/sec)"
+        ))
+
+    def _find_user(self, value):
+        try:
+            user = User.objects(id=ObjectId(value)).first()
+        except InvalidId:
+            user = User.objects(email=value).first()
+        if user is None:
+            raise CommandError(f'No user with id or email {value!r}')
+        return user
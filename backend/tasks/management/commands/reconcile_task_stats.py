@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand
+from pymongo import ReplaceOne
+
+from tasks.counters import COUNTED_FIELDS, counters_from_rows, counters_pipeline, empty_counters
+from tasks.models import Task, UserTaskStats
+
+
+def _counts(doc):
+    """The counted part of a counters document, ignoring zero entries"""
+    return (doc.get('total', 0),) + tuple(
+        sorted((key, value) for key, value in doc.get(field, {}).items() if value)
+        for field in COUNTED_FIELDS
+    )
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-user task counters (user_task_stats) from the tasks collection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user-id', help='Only reconcile this user (default: every user)')
+        parser.add_argument('--dry-run', action='store_true', help='Report drift without writing')
+
+    def handle(self, *args, **options):
+        user_id = options['user_id']
+        rows = Task._get_collection().aggregate(counters_pipeline(user_id), allowDiskUse=True)
+        rebuilt = counters_from_rows(rows)
+
+        stats = UserTaskStats._get_collection()
+        existing = {
+            doc['_id']: doc
+            for doc in stats.find({'_id': user_id} if user_id else {})
+        }
+        # Users whose tasks are all gone still need their counters zeroed
+        for missing in existing.keys() - rebuilt.keys():
+            rebuilt[missing] = empty_counters(missing)
+        if user_id and user_id not in rebuilt:
+            rebuilt[user_id] = empty_counters(user_id)
+
+        drifted = [
+            counters for key, counters in rebuilt.items()
+            if key not in existing or _counts(existing[key]) != _counts(counters)
+        ]
+        for counters in drifted:
+            current = existing.get(counters['_id'])
+            if current is None:
+                self.stdout.write(f"{counters['_id']}: missing, total {counters['total']}")
+            else:
+                self.stdout.write(self.style.WARNING(
+                    f"{counters['_id']}: total {current.get('total', 0)} -> {counters['total']}"
+                ))
+
+        if drifted and not options['dry_run']:
+            stats.bulk_write(
+                [ReplaceOne({'_id': counters['_id']}, counters, upsert=True) for counters in drifted],
+                ordered=False,
+            )
+
+        action = 'would rebuild' if options['dry_run'] else 'rebuilt'
+        self.stdout.write(self.style.SUCCESS(
+            f'Checked {len(rebuilt)} users, {action} {len(drifted)} counters documents'
+        ))
@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from mongoengine.connection import get_db
+from pymongo.errors import BulkWriteError
+
+from tasks.models import Task
+from tasks.seeding import clear_seeded, is_scratch_database, seed_tasks, seed_users
+
+
+class Command(BaseCommand):
+    help = 'Seed N users with M tasks each, using realistic status, priority and due date distributions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10)
+        parser.add_argument('--tasks', type=int, default=1000, help='Tasks per user')
+        parser.add_argument('--password', default='seedpass123', help='Password of every seeded user')
+        parser.add_argument('--email-prefix', default='seed-user')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed, for reproducible data')
+        parser.add_argument('--reset', action='store_true', help='Remove previously seeded users and their tasks first')
+        parser.add_argument('--force', action='store_true',
+                            help='Seed even if the database name does not mention "bench" or "test"')
+
+    def handle(self, *args, **options):
+        # Seeded users share a known password, so keep them out of real databases
+        db_name = get_db().name
+        if not is_scratch_database(db_name) and not options['force']:
+            raise CommandError(
+                f'Refusing to seed database "{db_name}"; point MONGODB_URI at a *_bench or *_test '
+                'database or pass --force'
+            )
+
+        if options['reset']:
+            removed = clear_seeded(options['email_prefix'])
+            self.stdout.write(f'Removed {removed} seeded users and their tasks')
+
+        Task.ensure_indexes()
+        start = time.perf_counter()
+        try:
+            users = seed_users(options['users'], options['password'], options['email_prefix'])
+        except BulkWriteError:
+            raise CommandError('Seeded users already exist; pass --reset to replace them')
+        inserted = seed_tasks([doc['_id'] for doc in users], options['tasks'], seed=options['seed'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {len(users)} users and {inserted} tasks in {time.perf_counter() - start:.1f}s '
+            f'(emails {options["email_prefix"]}-<n>@example.com, password {options["password"]!r})'
+        ))
@@ -1,14 +1,18 @@
-from mongoengine import Document, StringField, DateTimeField, ReferenceField
+from mongoengine import Document, StringField, DateTimeField, DictField, IntField
 from datetime import datetime
-from users.models import User
+from django.conf import settings
+from .queries import TASK_TEXT_INDEX
+
+TASK_STATUSES = ['pending', 'in-progress', 'completed']
+TASK_PRIORITIES = ['low', 'medium', 'high']
 
 
 class Task(Document):
     
     title = StringField(required=True, max_length=255)
     description = StringField(max_length=1000)
-    status = StringField(choices=['pending', 'in-progress', 'completed'], default='pending')
-    priority = StringField(choices=['low', 'medium', 'high'], default='medium')
+    status = StringField(choices=TASK_STATUSES, default='pending')
+    priority = StringField(choices=TASK_PRIORITIES, default='medium')
     due_date = DateTimeField()
     
     user_id = StringField(required=True)
@@ -19,12 +23,61 @@ class Task(Document):
     
     meta = {
         'collection': 'tasks',
-        'indexes': ['user_id', 'status', 'priority', 'created_at']
+        'indexes': [
+            # get_tasks, newest first (page and cursor modes)
+            ('user_id', '-created_at', '-id'),
+            # get_tasks filtered by status or priority
+            ('user_id', 'status', '-created_at', '-id'),
+            ('user_id', 'priority', '-created_at', '-id'),
+            # get_task_stats and overdue counts (covers status and due_date)
+            ('user_id', 'status', 'due_date'),
+            # Conditional GET validators and the changes feed
+            ('user_id', 'updated_at', 'id'),
+            # get_tasks?q= full-text search
+            dict(TASK_TEXT_INDEX),
+        ]
     }
     
     def save(self, *args, **kwargs):
+        from .counters import COUNTED_FIELDS, apply_delta, counter_delta, record_created
+        from .events import task_saved
+        
+        created = self.id is None
+        before = None
+        if not created and any(field in self._get_changed_fields() for field in COUNTED_FIELDS):
+            # The stored values, so a status or priority change is counted
+            before = Task._get_collection().find_one({'_id': self.id}, dict.fromkeys(COUNTED_FIELDS, 1))
         self.updated_at = datetime.utcnow()
-        return super().save(*args, **kwargs)
+        result = super().save(*args, **kwargs)
+        doc = self.to_mongo().to_dict()
+        if created:
+            record_created([doc])
+        elif before is not None:
+            apply_delta(self.user_id, counter_delta(before, doc))
+        task_saved(doc, created=created)
+        return result
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        Task.record_deletion(self.user_id, [{'_id': self.id, 'status': self.status, 'priority': self.priority}])
+        return result
+    
+    @staticmethod
+    def record_deletion(user_id, docs, count=True):
+        """
+        Bookkeeping for deleted tasks (docs need _id, status and priority):
+        uncount them, leave tombstones for the changes feed and notify
+        subscribers. Pass count=False when the caller rebuilds the counters.
+        """
+        from .counters import record_deleted
+        from .events import tasks_deleted
+        
+        docs = list(docs)
+        task_ids = [doc['_id'] for doc in docs]
+        if count:
+            record_deleted(user_id, docs)
+        TaskTombstone.record(user_id, task_ids)
+        tasks_deleted(user_id, task_ids)
     
     def to_dict(self):
         return {
@@ -40,4 +93,79 @@ class Task(Document):
         }
     
     def __str__(self):
-        return f"{self.title} ({self.status})"
\ No newline at end of file
+        return f"{self.title} ({self.status})"
+
+
+class TaskTombstone(Document):
+    """
+    Record of a deleted task so sync clients can learn about deletions
+    """
+    task_id = StringField(required=True)
+    user_id = StringField(required=True)
+    deleted_at = DateTimeField(default=datetime.utcnow)
+    
+    meta = {
+        'collection': 'task_tombstones',
+        'indexes': [
+            ('user_id', 'deleted_at'),
+            {
+                'fields': ['deleted_at'],
+                'expireAfterSeconds': settings.TASK_TOMBSTONE_TTL_DAYS * 24 * 60 * 60,
+            },
+        ]
+    }
+    
+    @staticmethod
+    def documents(user_id, task_ids):
+        """Raw tombstone documents for deleted task ids"""
+        now = datetime.utcnow()
+        return [
+            {'task_id': str(task_id), 'user_id': user_id, 'deleted_at': now}
+            for task_id in task_ids
+        ]
+    
+    @classmethod
+    def record(cls, user_id, task_ids):
+        """Insert tombstones for deleted task ids in one round trip"""
+        docs = cls.documents(user_id, task_ids)
+        if docs:
+            cls._get_collection().insert_many(docs, ordered=False)
+
+
+class UserTaskStats(Document):
+    """
+    Per-user task counters kept up to date with $inc by the write paths
+    (tasks.counters), so get_task_stats reads one document by _id instead
+    of scanning the user's tasks
+    """
+    user_id = StringField(primary_key=True)
+    total = IntField(default=0)
+    # {status: count} and {priority: count}
+    status = DictField()
+    priority = DictField()
+    rebuilt_at = DateTimeField()
+    
+    meta = {
+        'collection': 'user_task_stats',
+    }
+
+
+class EventStreamTicket(Document):
+    """
+    Single-use credential for opening the task event stream. EventSource
+    cannot send an Authorization header, so the browser trades its JWT for
+    a ticket and puts that in the URL instead; a ticket that ends up in an
+    access log is already spent or about to expire.
+    """
+    ticket = StringField(primary_key=True)
+    user_id = StringField(required=True)
+    expires_at = DateTimeField(required=True)
+    
+    meta = {
+        'collection': 'event_stream_tickets',
+        'indexes': [
+            # Mongo's TTL sweep runs about once a minute, so readers still
+            # check expires_at themselves
+            {'fields': ['expires_at'], 'expireAfterSeconds': 0},
+        ]
+    }
@@ -0,0 +1,83 @@
+import base64
+import json
+from datetime import datetime
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from django.conf import settings
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class InvalidPageParameter(ValueError):
+    pass
+
+
+def _positive_int(params, name, default):
+    value = params.get(name)
+    if value in (None, ''):
+        return default
+    try:
+        return max(int(value), 1)
+    except ValueError:
+        raise InvalidPageParameter(f'{name} must be an integer')
+
+
+def parse_page_params(params):
+    """
+    (page, limit) from query parameters: page is at least 1 and limit is
+    clamped to 1..TASK_MAX_PAGE_SIZE. Raises InvalidPageParameter when
+    either is not an integer.
+    """
+    page = _positive_int(params, 'page', 1)
+    limit = min(_positive_int(params, 'limit', 10), settings.TASK_MAX_PAGE_SIZE)
+    return page, limit
+
+
+def encode_cursor(created_at, task_id):
+    """Opaque cursor pointing just past the (created_at, _id) of the last row"""
+    payload = json.dumps([created_at.isoformat(), str(task_id)], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Inverse of encode_cursor; raises InvalidCursor on malformed input"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, task_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), ObjectId(task_id)
+    except (ValueError, TypeError, InvalidId) as e:
+        raise InvalidCursor(str(e))
+
+
+def encode_search_cursor(score, task_id):
+    """Cursor for search results, ranked by (text score, _id)"""
+    payload = json.dumps([score, str(task_id)], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_search_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        score, task_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return float(score), ObjectId(task_id)
+    except (ValueError, TypeError, InvalidId) as e:
+        raise InvalidCursor(str(e))
+
+
+def keyset_filter(created_at, task_id):
+    """Rows that sort after the cursor under ('-created_at', '-_id')"""
+    return {
+        '$or': [
+            {'created_at': {'$lt': created_at}},
+            {'created_at': created_at, '_id': {'$lt': task_id}},
+        ]
+    }
+
+
+def parse_bool(value, default=True):
+    if value is None:
+        return default
+    return value.lower() not in ('false', '0', 'no', 'off')
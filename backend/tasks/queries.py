@@ -0,0 +1,75 @@
+"""Query shapes shared by the task views and the index audit command"""
+from datetime import datetime
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+TASK_LIST_SORT = [('created_at', -1), ('_id', -1)]
+
+# Index used by the overdue count; it covers every field the filter reads
+TASK_STATS_HINT = [('user_id', 1), ('status', 1), ('due_date', 1)]
+
+
+def task_overdue_filter(user_id, now):
+    """Unfinished tasks past their due date; the one stat that changes with the clock"""
+    return {'user_id': user_id, 'status': {'$ne': 'completed'}, 'due_date': {'$lt': now}}
+
+
+def task_list_filter(user_id, status=None, priority=None):
+    """Filter used by get_tasks"""
+    query = {'user_id': user_id}
+    if status:
+        query['status'] = status
+    if priority:
+        query['priority'] = priority
+    return query
+
+
+# Text index on title and description; user_id is an equality prefix so a
+# search only walks the requesting user's entries
+TASK_TEXT_INDEX = {
+    'fields': ['user_id', '$title', '$description'],
+    'weights': {'title': 10, 'description': 2},
+    'default_language': 'english',
+    'name': 'task_text_search',
+}
+TASK_SEARCH_MAX_LENGTH = 200
+
+
+def task_search_pipeline(user_id, q, status=None, priority=None, after=None, limit=10, projection=None):
+    """
+    Aggregation returning up to limit + 1 matches ranked by text score,
+    then _id. after=(score, _id) continues from a previous page.
+    """
+    match = dict(task_list_filter(user_id, status, priority), **{'$text': {'$search': q}})
+    pipeline = [
+        {'$match': match},
+        {'$addFields': {'score': {'$meta': 'textScore'}}},
+    ]
+    if after is not None:
+        score, last_id = after
+        pipeline.append({'$match': {'$or': [
+            {'score': {'$lt': score}},
+            {'score': score, '_id': {'$lt': last_id}},
+        ]}})
+    pipeline += [
+        {'$sort': {'score': -1, '_id': -1}},
+        {'$limit': limit + 1},
+    ]
+    if projection:
+        pipeline.append({'$project': dict(projection, score=1)})
+    return pipeline
+
+
+def parse_object_id(value):
+    """ObjectId for a task id from the URL or body, or None if malformed"""
+    try:
+        return ObjectId(value)
+    except (InvalidId, TypeError):
+        return None
+
+
+def mongo_now():
+    """utcnow() truncated to the millisecond precision BSON dates store"""
+    now = datetime.utcnow()
+    return now.replace(microsecond=now.microsecond - now.microsecond % 1000)
@@ -0,0 +1,36 @@
+"""
+Full-text task search for get_tasks?q=.
+
+Matches come from the weighted text index, ranked by text score and
+paginated with a (score, _id) keyset cursor, always scoped to one user.
+"""
+from .models import Task
+from .pagination import decode_search_cursor, encode_search_cursor
+from .queries import task_search_pipeline
+from .serializers import TASK_FIELDS
+
+PROJECTION = {field: 1 for field in TASK_FIELDS}
+
+
+def search_pipeline(user_id, q, status=None, priority=None, cursor=None, limit=10):
+    """Pipeline for a search page; raises InvalidCursor for a malformed cursor"""
+    after = decode_search_cursor(cursor) if cursor else None
+    return task_search_pipeline(user_id, q, status, priority, after, limit, PROJECTION)
+
+
+def search_page(docs, limit):
+    """(page docs, has_more, next_cursor) from up to limit + 1 ranked docs"""
+    has_more = len(docs) > limit
+    docs = docs[:limit]
+    next_cursor = encode_search_cursor(docs[-1]['score'], docs[-1]['_id']) if has_more else None
+    return docs, has_more, next_cursor
+
+
+def search_tasks(user_id, q, status=None, priority=None, cursor=None, limit=10):
+    pipeline = search_pipeline(user_id, q, status, priority, cursor, limit)
+    return search_page(list(Task._get_collection().aggregate(pipeline)), limit)
+
+
+def count_matches(user_id, q, status=None, priority=None):
+    query = task_search_pipeline(user_id, q, status, priority)[0]['$match']
+    return Task._get_collection().count_documents(query)
@@ -0,0 +1,110 @@
+"""
+Synthetic users and tasks with realistic shapes, for the seed_tasks and
+bench_api commands.
+
+Most tasks are recent, a large share are completed, about two thirds have
+a due date and open tasks are more likely to be overdue than completed
+ones, so filters, deep pages and stats see data like production's.
+"""
+import random
+from datetime import datetime, timedelta
+
+from django.contrib.auth.hashers import make_password
+
+from users.models import User
+from .counters import forget_counters
+from .models import Task
+
+STATUS_WEIGHTS = {'pending': 35, 'in-progress': 20, 'completed': 45}
+PRIORITY_WEIGHTS = {'low': 30, 'medium': 50, 'high': 20}
+DUE_DATE_SHARE = 0.65
+HISTORY_DAYS = 365
+
+VERBS = ['Review', 'Write', 'Fix', 'Plan', 'Update', 'Call', 'Prepare', 'Test', 'Deploy', 'Refactor']
+OBJECTS = ['report', 'invoice', 'release notes', 'login bug', 'sprint board', 'client', 'slides',
+           'backups', 'API docs', 'onboarding checklist', 'budget', 'dashboard']
+
+
+def is_scratch_database(db_name):
+    """Seeding and benchmarks only write to databases named like *bench* or *test*"""
+    return 'bench' in db_name or 'test' in db_name
+
+
+def _weighted(rng, weights):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def make_task_document(rng, user_id, now):
+    # Exponential age: most tasks are recent, a long tail goes back a year
+    age = timedelta(days=min(rng.expovariate(1 / 30.0), HISTORY_DAYS), seconds=rng.randint(0, 86399))
+    created_at = now - age
+    status = _weighted(rng, STATUS_WEIGHTS)
+    updated_at = created_at
+    if status != 'pending':
+        updated_at = min(now, created_at + timedelta(hours=rng.expovariate(1 / 48.0)))
+
+    due_date = None
+    if rng.random() < DUE_DATE_SHARE:
+        # Completed work was mostly due before now; open work straddles it
+        offset = rng.gauss(-7, 10) if status == 'completed' else rng.gauss(5, 14)
+        due_date = max(created_at, now + timedelta(days=offset)).replace(microsecond=0)
+
+    title = f'{rng.choice(VERBS)} {rng.choice(OBJECTS)}'
+    return {
+        'title': title,
+        'description': f'{title} before the next check-in' if rng.random() < 0.6 else '',
+        'status': status,
+        'priority': _weighted(rng, PRIORITY_WEIGHTS),
+        'due_date': due_date,
+        'user_id': user_id,
+        'created_at': created_at,
+        'updated_at': updated_at,
+    }
+
+
+def seed_users(count, password, email_prefix='seed-user'):
+    """Create count users sharing one password hash; returns their documents"""
+    encoded = make_password(password)
+    now = datetime.utcnow()
+    docs = [
+        User(name=f'Seed User {i}', email=f'{email_prefix}-{i}@example.com', password=encoded,
+             created_at=now, updated_at=now).to_mongo().to_dict()
+        for i in range(count)
+    ]
+    if docs:
+        User._get_collection().insert_many(docs)
+    return docs
+
+
+def seed_tasks(user_ids, tasks_per_user, seed=0, batch_size=5000):
+    """Insert tasks_per_user tasks for each user id; returns the number inserted"""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    collection = Task._get_collection()
+    batch = []
+    inserted = 0
+    for user_id in user_ids:
+        for _ in range(tasks_per_user):
+            batch.append(make_task_document(rng, str(user_id), now))
+            if len(batch) >= batch_size:
+                collection.insert_many(batch, ordered=False)
+                inserted += len(batch)
+                batch = []
+    if batch:
+        collection.insert_many(batch, ordered=False)
+        inserted += len(batch)
+    # Raw inserts bypass the counters; they are rebuilt on the next stats read
+    forget_counters(user_ids)
+    return inserted
+
+
+def clear_seeded(email_prefix='seed-user'):
+    """Remove users created by seed_users and all of their tasks"""
+    users = User._get_collection()
+    ids = [doc['_id'] for doc in users.find({'email': {'$regex': f'^{email_prefix}-\\d+@example\\.com$'}}, {'_id': 1})]
+    if not ids:
+        return 0
+    Task._get_collection().delete_many({'user_id': {'$in': [str(user_id) for user_id in ids]}})
+    forget_counters(ids)
+    users.delete_many({'_id': {'$in': ids}})
+    return len(ids)
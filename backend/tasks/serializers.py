@@ -0,0 +1,25 @@
+"""Compact serializers for raw (as_pymongo) task documents"""
+
+TASK_FIELDS = (
+    'title', 'description', 'status', 'priority', 'due_date',
+    'user_id', 'created_at', 'updated_at',
+)
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+def serialize_task(doc):
+    """Raw Mongo document to the same dict Task.to_dict() produces"""
+    return {
+        'id': str(doc['_id']),
+        'title': doc.get('title'),
+        'description': doc.get('description'),
+        'status': doc.get('status', 'pending'),
+        'priority': doc.get('priority', 'medium'),
+        'due_date': _isoformat(doc.get('due_date')),
+        'user_id': doc.get('user_id'),
+        'created_at': _isoformat(doc.get('created_at')),
+        'updated_at': _isoformat(doc.get('updated_at')),
+    }
@@ -0,0 +1,202 @@
+"""
+Server-Sent Events stream of task changes: GET /api/tasks/events.
+
+Django 3.2 cannot stream from an async view, so this is a plain ASGI app
+that backend_project.asgi mounts in front of Django. Each connection
+parks on an asyncio queue instead of holding a worker thread, so one
+uvicorn worker serves many idle subscribers.
+
+EventSource cannot set headers, and a JWT in the query string would be
+written to every access log, so browsers first POST to
+/api/tasks/events/ticket/ for a short-lived single-use ticket and open
+the stream with ?ticket=. Other clients may send the Authorization header.
+"""
+import asyncio
+import secrets
+from datetime import datetime, timedelta
+from urllib.parse import parse_qs
+
+import jwt
+from django.conf import settings
+
+from backend_project.async_db import get_collection
+from backend_project.responses import dumps
+from users.cache import user_cache
+from users.tokens import verify_token
+from .events import TASKS_RESET, broker, ensure_watcher
+from .models import EventStreamTicket
+
+EVENTS_PATH = '/api/tasks/events'
+
+
+def _headers(scope):
+    return {name.decode('latin-1').lower(): value.decode('latin-1') for name, value in scope['headers']}
+
+
+def _cors_headers(headers):
+    origin = headers.get('origin')
+    if not origin or origin not in settings.CORS_ALLOWED_ORIGINS:
+        return []
+    cors = [(b'access-control-allow-origin', origin.encode('latin-1')), (b'vary', b'Origin')]
+    if settings.CORS_ALLOW_CREDENTIALS:
+        cors.append((b'access-control-allow-credentials', b'true'))
+    return cors
+
+
+def _ticket(scope):
+    ticket = parse_qs(scope.get('query_string', b'').decode('latin-1')).get('ticket')
+    return ticket[0] if ticket else None
+
+
+def _token(headers):
+    token_type, _, token = headers.get('authorization', '').partition(' ')
+    if token_type.lower() == 'bearer' and token:
+        return token
+    return None
+
+
+def issue_ticket(user_id):
+    """New stream ticket for user_id, valid once for TASK_EVENTS_TICKET_SECONDS"""
+    ticket = secrets.token_urlsafe(32)
+    EventStreamTicket._get_collection().insert_one({
+        '_id': ticket,
+        'user_id': str(user_id),
+        'expires_at': datetime.utcnow() + timedelta(seconds=settings.TASK_EVENTS_TICKET_SECONDS),
+    })
+    return ticket
+
+
+async def _redeem_ticket(ticket):
+    """User id for an unused, unexpired ticket (which this spends), or an error message"""
+    doc = await get_collection(EventStreamTicket).find_one_and_delete(
+        {'_id': ticket, 'expires_at': {'$gt': datetime.utcnow()}}
+    )
+    if doc is None:
+        return None, 'Invalid ticket'
+    return doc['user_id'], None
+
+
+async def _authenticate(token):
+    """User id for a valid token, or an error message"""
+    if not token:
+        return None, 'No token provided'
+    try:
+        claims = verify_token(token)
+    except jwt.ExpiredSignatureError:
+        return None, 'Token expired'
+    except jwt.InvalidTokenError:
+        return None, 'Invalid token'
+    try:
+        user = await user_cache.aget(claims['user_id'])
+    except Exception:
+        user = None
+    if user is None:
+        return None, 'Invalid token'
+    return str(user.id), None
+
+
+async def _json_response(send, status, message, extra_headers):
+    body = dumps({'success': False, 'message': message})
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode()),
+        ] + extra_headers,
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+def format_event(event_type, data):
+    return b'event: ' + event_type.encode() + b'\ndata: ' + dumps(data) + b'\n\n'
+
+
+async def task_events_app(scope, receive, send):
+    headers = _headers(scope)
+    cors = _cors_headers(headers)
+
+    if scope['method'] == 'OPTIONS':
+        await send({
+            'type': 'http.response.start',
+            'status': 204,
+            'headers': cors + [
+                (b'access-control-allow-methods', b'GET, OPTIONS'),
+                (b'access-control-allow-headers', b'authorization'),
+            ],
+        })
+        await send({'type': 'http.response.body', 'body': b''})
+        return
+    if scope['method'] != 'GET':
+        await _json_response(send, 405, 'Method not allowed', cors)
+        return
+
+    ticket = _ticket(scope)
+    if ticket:
+        user_id, error = await _redeem_ticket(ticket)
+    else:
+        user_id, error = await _authenticate(_token(headers))
+    if error:
+        await _json_response(send, 401, error, cors)
+        return
+    if broker.connection_count() >= settings.TASK_EVENTS_MAX_CONNECTIONS:
+        await _json_response(send, 503, 'Too many event streams', cors + [(b'retry-after', b'5')])
+        return
+
+    ensure_watcher()
+    subscription = broker.subscribe(user_id)
+    try:
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': cors + [
+                (b'content-type', b'text/event-stream'),
+                (b'cache-control', b'no-cache'),
+                # Stop nginx from buffering the stream
+                (b'x-accel-buffering', b'no'),
+            ],
+        })
+        await send({
+            'type': 'http.response.body',
+            'body': f'retry: {settings.TASK_EVENTS_RETRY_MS}\n\n'.encode() + format_event('ready', {}),
+            'more_body': True,
+        })
+        await _stream(subscription, receive, send)
+    finally:
+        broker.unsubscribe(subscription)
+
+
+async def _stream(subscription, receive, send):
+    """Forward queued events until the client disconnects"""
+    disconnected = asyncio.ensure_future(_wait_for_disconnect(receive))
+    try:
+        while not disconnected.done():
+            get_event = asyncio.ensure_future(subscription.queue.get())
+            await asyncio.wait({get_event, disconnected}, timeout=settings.TASK_EVENTS_HEARTBEAT_SECONDS,
+                               return_when=asyncio.FIRST_COMPLETED)
+            if not get_event.done():
+                get_event.cancel()
+                if disconnected.done():
+                    break
+                # Comment line keeps proxies from closing an idle stream
+                await send({'type': 'http.response.body', 'body': b': keep-alive\n\n', 'more_body': True})
+                continue
+
+            if subscription.overflowed:
+                # The client missed events; tell it to refetch and start over
+                subscription.overflowed = False
+                while not subscription.queue.empty():
+                    subscription.queue.get_nowait()
+                body = format_event(TASKS_RESET, {})
+            else:
+                body = format_event(*get_event.result())
+            await send({'type': 'http.response.body', 'body': body, 'more_body': True})
+    finally:
+        disconnected.cancel()
+
+
+async def _wait_for_disconnect(receive):
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return
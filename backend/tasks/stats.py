@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from .counters import read_counters
+from .models import TASK_STATUSES, Task
+from .queries import TASK_STATS_HINT, task_overdue_filter
+
+
+def build_stats(status_counts, overdue):
+    """Shape counters the way both the API and Dashboard.js expect them"""
+    counts = {name: status_counts.get(name, 0) for name in TASK_STATUSES}
+    total = sum(status_counts.values())
+    return {
+        'total': total,
+        'pending': counts['pending'],
+        'inProgress': counts['in-progress'],
+        'completed': counts['completed'],
+        'overdue': overdue,
+        # Shape consumed by frontend/src/pages/Dashboard.js
+        'totalTasks': total,
+        'overdueTasks': overdue,
+        'statusBreakdown': [
+            {'_id': name, 'count': counts[name]} for name in TASK_STATUSES
+        ],
+    }
+
+
+def stats_from_counters(counters, overdue):
+    return build_stats(counters.get('status', {}), overdue)
+
+
+def compute_task_stats(user_id, now=None):
+    """
+    Dashboard counters from the user's UserTaskStats document plus one
+    covered count for overdue tasks, which depends on the clock
+    """
+    if now is None:
+        now = datetime.utcnow()
+
+    overdue = Task._get_collection().count_documents(task_overdue_filter(user_id, now), hint=TASK_STATS_HINT)
+    return stats_from_counters(read_counters(user_id), overdue)
@@ -0,0 +1,81 @@
+"""
+Test case running the task views against an in-memory mongomock database.
+
+    python manage.py test tasks
+"""
+import mongomock
+from django.test import Client, SimpleTestCase
+from mongoengine import connect, disconnect
+
+from tasks.models import EventStreamTicket, Task, TaskTombstone, UserTaskStats
+from users.cache import user_cache
+from users.models import User
+from users.views import get_tokens_for_user
+
+
+class AsyncCursor:
+    """Motor-style cursor: chains synchronously, to_list is awaitable"""
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def __getattr__(self, name):
+        method = getattr(self.cursor, name)
+
+        def chain(*args, **kwargs):
+            return AsyncCursor(method(*args, **kwargs))
+        return chain
+
+    async def to_list(self, length):
+        docs = list(self.cursor)
+        return docs if length is None else docs[:length]
+
+
+class AsyncCollection:
+    """Awaitable facade over a mongomock collection, standing in for Motor"""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    def find(self, *args, **kwargs):
+        return AsyncCursor(self.collection.find(*args, **kwargs))
+
+    def aggregate(self, *args, **kwargs):
+        return AsyncCursor(self.collection.aggregate(*args, **kwargs))
+
+    def __getattr__(self, name):
+        method = getattr(self.collection, name)
+
+        async def call(*args, **kwargs):
+            return method(*args, **kwargs)
+        return call
+
+
+def async_collection(document):
+    """Drop-in for backend_project.async_db.get_collection in tests"""
+    return AsyncCollection(document._get_collection())
+
+
+class MongoTestCase(SimpleTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        disconnect()
+        connect('test_tasks', host='mongodb://localhost', mongo_client_class=mongomock.MongoClient)
+
+    @classmethod
+    def tearDownClass(cls):
+        disconnect()
+        super().tearDownClass()
+
+    def setUp(self):
+        for document in (User, Task, TaskTombstone, UserTaskStats, EventStreamTicket):
+            document.drop_collection()
+        user_cache.clear()
+        self.user = User(name='Test User', email='test@example.com')
+        self.user.set_password('password123')
+        self.user.save()
+        self.user_id = str(self.user.id)
+        self.token = get_tokens_for_user(self.user)['access']
+        self.api = Client(HTTP_HOST='localhost', HTTP_AUTHORIZATION=f'Bearer {self.token}')
@@ -0,0 +1,108 @@
+import json
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+from tasks.models import Task, TaskTombstone
+from .base import MongoTestCase, async_collection
+
+
+class AsyncTaskViewTests(MongoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client = AsyncClient()
+        self.headers = {'authorization': f'Bearer {self.token}'}
+        for target in ('backend_project.async_db.get_collection', 'tasks.async_views.get_collection'):
+            patcher = mock.patch(target, async_collection)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def call(self, method, path, body=None, **headers):
+        kwargs = dict(self.headers, **headers)
+        if body is not None:
+            kwargs.update(data=body, content_type='application/json')
+        return async_to_sync(getattr(self.client, method))(f'/api/async/tasks/{path}', **kwargs)
+
+    def create(self, **fields):
+        response = self.call('post', 'create/', dict({'title': 'Task'}, **fields))
+        self.assertEqual(response.status_code, 201, response.content)
+        return json.loads(response.content)['data']
+
+    def test_requires_a_token(self):
+        self.headers = {}
+        self.assertEqual(self.call('get', '').status_code, 401)
+        self.assertEqual(self.call('post', 'create/', {'title': 'x'}).status_code, 401)
+        self.assertFalse(Task.objects.count())
+
+    def test_create_and_get(self):
+        created = self.create(title='Async', priority='high')
+        self.assertEqual((created['title'], created['priority'], created['status']), ('Async', 'high', 'pending'))
+        self.assertEqual(Task.objects.get(id=created['id']).user_id, self.user_id)
+
+        response = self.call('get', f"{created['id']}/")
+        self.assertEqual(response.status_code, 200)
+        fetched = json.loads(response.content)['data']
+        self.assertEqual({k: fetched[k] for k in ('id', 'title', 'priority', 'user_id')},
+                         {k: created[k] for k in ('id', 'title', 'priority', 'user_id')})
+        self.assertTrue(response['ETag'])
+
+        self.assertEqual(self.call('post', 'create/', {'title': ''}).status_code, 400)
+        self.assertEqual(self.call('get', 'not-an-id/').status_code, 404)
+
+    def test_other_users_tasks_are_hidden(self):
+        theirs = Task(user_id='someone-else', title='Theirs')
+        theirs.save()
+        self.assertEqual(self.call('get', f'{theirs.id}/').status_code, 404)
+        self.assertEqual(self.call('put', f'{theirs.id}/update/', {'title': 'x'}).status_code, 404)
+        self.assertEqual(self.call('delete', f'{theirs.id}/delete/').status_code, 404)
+        self.assertEqual(Task.objects.get(id=theirs.id).title, 'Theirs')
+
+    def test_list_pages(self):
+        ids = [self.create(title=f'Task {i}')['id'] for i in range(3)]
+        Task(user_id='someone-else', title='Theirs').save()
+
+        data = json.loads(self.call('get', '?limit=2&with_total=true').content)
+        self.assertEqual([task['id'] for task in data['data']], ids[::-1][:2])
+        self.assertEqual((data['pagination']['total'], data['pagination']['pages']), (3, 2))
+
+        seen, cursor = [], ''
+        while True:
+            data = json.loads(self.call('get', f'?limit=2&cursor={cursor}').content)
+            seen += [task['id'] for task in data['data']]
+            if not data['pagination']['has_more']:
+                break
+            cursor = data['pagination']['next_cursor']
+        self.assertEqual(seen, ids[::-1])
+
+        self.assertEqual(self.call('get', '?cursor=garbage').status_code, 400)
+
+    def test_update_with_if_match(self):
+        task_id = self.create()['id']
+        etag = self.call('get', f'{task_id}/')['ETag']
+
+        response = self.call('put', f'{task_id}/update/', {'status': 'completed'}, if_match=etag)
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(json.loads(response.content)['data']['status'], 'completed')
+        self.assertNotEqual(response['ETag'], etag)
+
+        # The old ETag is now stale, and a foreign one never matches
+        for stale in (etag, '"not-one-of-ours"'):
+            response = self.call('put', f'{task_id}/update/', {'title': 'Lost'}, if_match=stale)
+            self.assertEqual(response.status_code, 412, stale)
+        self.assertEqual(Task.objects.get(id=task_id).title, 'Task')
+
+    def test_delete_records_a_tombstone(self):
+        task_id = self.create()['id']
+        self.assertEqual(self.call('delete', f'{task_id}/delete/').status_code, 200)
+        self.assertEqual(self.call('delete', f'{task_id}/delete/').status_code, 404)
+        self.assertFalse(Task.objects.count())
+        self.assertEqual([str(t.task_id) for t in TaskTombstone.objects(user_id=self.user_id)], [task_id])
+
+    def test_stats(self):
+        self.create()
+        Task(user_id='someone-else', title='Theirs').save()
+        response = self.call('get', 'stats/')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(json.loads(response.content)['data']['total'], 1)
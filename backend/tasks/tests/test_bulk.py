@@ -0,0 +1,80 @@
+from django.test import override_settings
+
+from tasks.models import Task
+from .base import MongoTestCase
+
+
+class BulkEndpointTests(MongoTestCase):
+
+    def send(self, method, path, body):
+        return getattr(self.api, method)(path, body, content_type='application/json')
+
+    def test_create(self):
+        response = self.send('post', '/api/tasks/bulk/create/', {'tasks': [
+            {'title': 'First', 'priority': 'high'},
+            {'title': 'Second', 'dueDate': '2030-01-01T00:00:00Z'},
+        ]})
+        self.assertEqual(response.status_code, 201, response.content)
+        results = response.json()['data']['results']
+        self.assertEqual([result['index'] for result in results], [0, 1])
+        self.assertEqual([result['data']['title'] for result in results], ['First', 'Second'])
+        self.assertEqual(Task.objects(user_id=self.user_id).count(), 2)
+
+    def test_create_reports_invalid_items(self):
+        response = self.send('post', '/api/tasks/bulk/create/', {'tasks': [
+            {'title': 'Good'}, {'title': ''}, {'title': 'Bad priority', 'priority': 'urgent'},
+        ]})
+        self.assertEqual(response.status_code, 207)
+        data = response.json()['data']
+        self.assertEqual((data['succeeded'], data['failed']), (1, 2))
+        self.assertEqual([result['success'] for result in data['results']], [True, False, False])
+        self.assertEqual(Task.objects(user_id=self.user_id).count(), 1)
+
+    def test_nothing_succeeded(self):
+        response = self.send('post', '/api/tasks/bulk/create/', {'tasks': [{'title': ''}]})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.json()['success'])
+
+    @override_settings(TASK_BULK_MAX_ITEMS=2)
+    def test_batch_size_limit(self):
+        response = self.send('post', '/api/tasks/bulk/create/', {'tasks': [{'title': 'x'}] * 3})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['message'], 'At most 2 items per request')
+        self.assertEqual(Task.objects.count(), 0)
+
+    def test_malformed_requests(self):
+        for body in ({'tasks': []}, {'tasks': 'x'}, {}, []):
+            self.assertEqual(self.send('post', '/api/tasks/bulk/create/', body).status_code, 400, body)
+        response = self.api.post('/api/tasks/bulk/create/', '{', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_update(self):
+        mine = Task(user_id=self.user_id, title='Mine')
+        mine.save()
+        theirs = Task(user_id='someone-else', title='Theirs')
+        theirs.save()
+        response = self.send('put', '/api/tasks/bulk/update/', {'tasks': [
+            {'id': str(mine.id), 'status': 'completed', 'title': 'Done'},
+            {'id': str(theirs.id), 'status': 'completed'},
+            {'id': 'not-an-id', 'status': 'completed'},
+            {'id': str(mine.id), 'status': 'bogus'},
+        ]})
+        self.assertEqual(response.status_code, 207, response.content)
+        results = response.json()['data']['results']
+        self.assertEqual([result['success'] for result in results], [True, False, False, False])
+        self.assertEqual(results[1]['message'], 'Task not found')
+        mine.reload()
+        self.assertEqual((mine.title, mine.status), ('Done', 'completed'))
+        self.assertEqual(Task.objects.get(id=theirs.id).status, 'pending')
+
+    def test_delete(self):
+        mine = Task(user_id=self.user_id, title='Mine')
+        mine.save()
+        theirs = Task(user_id='someone-else', title='Theirs')
+        theirs.save()
+        response = self.send('post', '/api/tasks/bulk/delete/', {'ids': [str(mine.id), str(theirs.id)]})
+        self.assertEqual(response.status_code, 207, response.content)
+        results = response.json()['data']['results']
+        self.assertEqual([(result['id'], result['success']) for result in results],
+                         [(str(mine.id), True), (str(theirs.id), False)])
+        self.assertEqual(list(Task.objects.scalar('title')), ['Theirs'])
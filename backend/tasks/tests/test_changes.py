@@ -0,0 +1,37 @@
+from datetime import datetime, timedelta
+
+from tasks.models import Task, TaskTombstone
+from .base import MongoTestCase
+
+
+class TaskChangesTests(MongoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.since = (datetime.utcnow() - timedelta(minutes=1)).isoformat()
+        self.task = Task(user_id=self.user_id, title='Doomed')
+        self.task.save()
+        self.kept = Task(user_id=self.user_id, title='Kept')
+        self.kept.save()
+
+    def changes(self):
+        response = self.api.get('/api/tasks/changes/', {'since': self.since})
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()['data']
+
+    def test_model_delete_is_in_the_changes_feed(self):
+        self.task.delete()
+        data = self.changes()
+        self.assertEqual(data['deleted'], [str(self.task.id)])
+        self.assertEqual([task['id'] for task in data['changed']], [str(self.kept.id)])
+
+    def test_view_delete_leaves_one_tombstone(self):
+        self.assertEqual(self.api.delete(f'/api/tasks/{self.task.id}/delete/').status_code, 200)
+        self.assertEqual(TaskTombstone.objects(task_id=str(self.task.id)).count(), 1)
+        self.assertEqual(self.changes()['deleted'], [str(self.task.id)])
+
+    def test_bulk_delete_leaves_tombstones(self):
+        response = self.api.post('/api/tasks/bulk/delete/', {'ids': [str(self.task.id), str(self.kept.id)]},
+                                 content_type='application/json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(sorted(self.changes()['deleted']), sorted([str(self.task.id), str(self.kept.id)]))
@@ -0,0 +1,44 @@
+from tasks.models import Task
+from .base import MongoTestCase
+
+
+class ConditionalGetTests(MongoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.task = Task(user_id=self.user_id, title='Task')
+        self.task.save()
+
+    def get(self, path, etag=None):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        return self.api.get(path, **headers)
+
+    def test_unchanged_list_is_not_modified(self):
+        etag = self.get('/api/tasks/')['ETag']
+        self.assertEqual(self.get('/api/tasks/', etag).status_code, 304)
+
+    def test_no_last_modified(self):
+        for path in ('/api/tasks/', f'/api/tasks/{self.task.id}/', '/api/tasks/stats/'):
+            response = self.get(path)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('Last-Modified', response)
+
+    def test_write_in_the_same_second_changes_the_etag(self):
+        etag = self.get('/api/tasks/')['ETag']
+        detail_etag = self.get(f'/api/tasks/{self.task.id}/')['ETag']
+        self.api.put(f'/api/tasks/{self.task.id}/update/', {'title': 'Renamed'}, content_type='application/json')
+        self.assertEqual(self.get('/api/tasks/', etag).status_code, 200)
+        self.assertEqual(self.get(f'/api/tasks/{self.task.id}/', detail_etag).status_code, 200)
+
+    def test_delete_changes_the_etag(self):
+        Task(user_id=self.user_id, title='Other').save()
+        etag = self.get('/api/tasks/')['ETag']
+        stats_etag = self.get('/api/tasks/stats/')['ETag']
+        self.task.delete()
+        self.assertEqual(self.get('/api/tasks/', etag).status_code, 200)
+        self.assertEqual(self.get('/api/tasks/stats/', stats_etag).status_code, 200)
+
+    def test_other_users_writes_do_not_change_the_etag(self):
+        etag = self.get('/api/tasks/')['ETag']
+        Task(user_id='someone-else', title='Not mine').save()
+        self.assertEqual(self.get('/api/tasks/', etag).status_code, 304)
@@ -0,0 +1,191 @@
+"""
+Every write path must leave the incremental counters equal to a recount.
+"""
+import json
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+from tasks import bulk
+from tasks.counters import apply_delta, counter_delta, read_counters, rebuild_counters
+from tasks.models import Task
+from .base import MongoTestCase, async_collection
+
+
+def _counts(counters):
+    return (counters['total'],) + tuple(
+        {key: value for key, value in counters[field].items() if value}
+        for field in ('status', 'priority')
+    )
+
+
+class CounterTests(MongoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # Materialise the counters document so writes increment it
+        read_counters(self.user_id)
+
+    def assertCountersMatchTasks(self):
+        counted = _counts(read_counters(self.user_id))
+        self.assertEqual(counted, _counts(rebuild_counters(self.user_id)))
+        return counted
+
+    def create(self, **fields):
+        response = self.api.post('/api/tasks/create/', dict({'title': 'Task'}, **fields),
+                                 content_type='application/json')
+        self.assertEqual(response.status_code, 201, response.content)
+        return json.loads(response.content)['data']['id']
+
+    def test_create(self):
+        self.create(priority='high')
+        self.create()
+        self.assertEqual(self.assertCountersMatchTasks()[0], 2)
+
+    def test_update(self):
+        task_id = self.create()
+        response = self.api.put(f'/api/tasks/{task_id}/update/', {'status': 'completed', 'priority': 'low'},
+                                content_type='application/json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self.assertCountersMatchTasks()[1], {'completed': 1})
+
+    def test_delete(self):
+        task_id = self.create()
+        self.create()
+        self.assertEqual(self.api.delete(f'/api/tasks/{task_id}/delete/').status_code, 200)
+        self.assertEqual(self.assertCountersMatchTasks()[0], 1)
+
+    def test_async_create_update_delete(self):
+        client = AsyncClient()
+        headers = {'authorization': f'Bearer {self.token}'}
+        with mock.patch('backend_project.async_db.get_collection', async_collection), \
+                mock.patch('tasks.async_views.get_collection', async_collection):
+            response = async_to_sync(client.post)('/api/async/tasks/create/', {'title': 'Async'},
+                                                  content_type='application/json', **headers)
+            self.assertEqual(response.status_code, 201, response.content)
+            task_id = json.loads(response.content)['data']['id']
+            self.create()
+            self.assertCountersMatchTasks()
+
+            response = async_to_sync(client.put)(f'/api/async/tasks/{task_id}/update/', {'status': 'in-progress'},
+                                                 content_type='application/json', **headers)
+            self.assertEqual(response.status_code, 200, response.content)
+            self.assertEqual(self.assertCountersMatchTasks()[1], {'in-progress': 1, 'pending': 1})
+
+            response = async_to_sync(client.delete)(f'/api/async/tasks/{task_id}/delete/', **headers)
+            self.assertEqual(response.status_code, 200, response.content)
+            self.assertEqual(self.assertCountersMatchTasks()[0], 1)
+
+    def test_bulk_create(self):
+        response = self.api.post('/api/tasks/bulk/create/', {'tasks': [{'title': 'A'}, {'title': ''}, {'title': 'B'}]},
+                                 content_type='application/json')
+        self.assertEqual(response.status_code, 207, response.content)
+        self.assertEqual(self.assertCountersMatchTasks()[0], 2)
+
+    def test_bulk_update(self):
+        ids = [self.create(), self.create(), self.create()]
+        response = self.api.put('/api/tasks/bulk/update/', {'tasks': [
+            {'id': ids[0], 'status': 'completed'},
+            {'id': ids[1], 'priority': 'high'},
+            {'id': ids[2], 'title': 'Renamed'},
+        ]}, content_type='application/json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self.assertCountersMatchTasks()[1:], (
+            {'completed': 1, 'pending': 2}, {'high': 1, 'medium': 2},
+        ))
+
+    def test_bulk_delete(self):
+        ids = [self.create(), self.create(), self.create()]
+        response = self.api.post('/api/tasks/bulk/delete/', {'ids': ids[:2] + ['missing']},
+                                 content_type='application/json')
+        self.assertEqual(response.status_code, 207, response.content)
+        self.assertEqual(self.assertCountersMatchTasks()[0], 1)
+
+    def test_import(self):
+        body = b'{"title": "one", "priority": "low"}\n{"title": ""}\n{"title": "two"}\n'
+        response = self.api.post('/api/tasks/import/?type=ndjson', body, content_type='application/octet-stream')
+        self.assertEqual(response.status_code, 207, response.content)
+        self.assertEqual(self.assertCountersMatchTasks()[0], 2)
+
+    def test_model_save_and_delete(self):
+        task = Task(user_id=self.user_id, title='Model')
+        task.save()
+        self.assertCountersMatchTasks()
+        task.status = 'completed'
+        task.priority = 'high'
+        task.save()
+        self.assertEqual(self.assertCountersMatchTasks()[1:], ({'completed': 1}, {'high': 1}))
+        task.title = 'Renamed'
+        task.save()
+        self.assertCountersMatchTasks()
+        task.delete()
+        self.assertEqual(self.assertCountersMatchTasks()[0], 0)
+
+
+class BulkUpdateRaceTests(MongoTestCase):
+    """A task changed between bulk_update's read and its write"""
+
+    def setUp(self):
+        super().setUp()
+        read_counters(self.user_id)
+        self.raced = Task(user_id=self.user_id, title='Raced')
+        self.raced.save()
+        self.other = Task(user_id=self.user_id, title='Other')
+        self.other.save()
+
+    def race(self, write):
+        """Run write right after bulk_update has read the tasks"""
+        real_existing = bulk._existing
+
+        def existing_then_write(*args):
+            result = real_existing(*args)
+            write()
+            return result
+        return mock.patch.object(bulk, '_existing', existing_then_write)
+
+    def concurrent_update(self):
+        collection = Task._get_collection()
+        before = collection.find_one({'_id': self.raced.id})
+        collection.update_one({'_id': self.raced.id}, {'$set': {'status': 'in-progress'}})
+        apply_delta(self.user_id, counter_delta(before, dict(before, status='in-progress')))
+
+    def bulk_update(self):
+        return bulk.bulk_update(self.user_id, [
+            {'id': str(self.raced.id), 'status': 'completed'},
+            {'id': str(self.other.id), 'priority': 'high'},
+        ])
+
+    def test_modified_task_is_reported_not_silently_skipped(self):
+        with self.race(self.concurrent_update):
+            results = self.bulk_update()
+        self.assertEqual(results[0], {
+            'index': 0, 'id': str(self.raced.id), 'success': False,
+            'message': 'Task was modified by another request',
+        })
+        self.assertTrue(results[1]['success'])
+        # The concurrent write stands and the other item was applied
+        self.assertEqual(Task.objects.get(id=self.raced.id).status, 'in-progress')
+        self.assertEqual(Task.objects.get(id=self.other.id).priority, 'high')
+        self.assertEqual(_counts(read_counters(self.user_id)), _counts(rebuild_counters(self.user_id)))
+
+    def test_duplicate_id_is_rejected(self):
+        results = bulk.bulk_update(self.user_id, [
+            {'id': str(self.raced.id), 'status': 'completed'},
+            {'id': str(self.raced.id), 'priority': 'high'},
+        ])
+        self.assertTrue(results[0]['success'])
+        self.assertEqual(results[1], {
+            'index': 1, 'id': str(self.raced.id), 'success': False, 'message': 'Duplicate task id',
+        })
+        raced = Task.objects.get(id=self.raced.id)
+        self.assertEqual((raced.status, raced.priority), ('completed', 'medium'))
+        self.assertEqual(_counts(read_counters(self.user_id)), _counts(rebuild_counters(self.user_id)))
+
+    def test_deleted_task_is_reported_as_not_found(self):
+        with self.race(lambda: Task.objects.get(id=self.raced.id).delete()):
+            results = self.bulk_update()
+        self.assertEqual(results[0]['message'], 'Task not found')
+        self.assertFalse(results[0]['success'])
+        self.assertTrue(results[1]['success'])
+        self.assertEqual(_counts(read_counters(self.user_id)), _counts(rebuild_counters(self.user_id)))
@@ -0,0 +1,71 @@
+import json
+from datetime import datetime, timedelta
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+from tasks import sse
+from tasks.models import EventStreamTicket
+from .base import MongoTestCase, async_collection
+
+
+def _call_app(query_string, headers=()):
+    """Status and JSON body of a request the events app refuses"""
+    sent = []
+
+    async def receive():
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        'type': 'http', 'method': 'GET', 'path': sse.EVENTS_PATH,
+        'query_string': query_string.encode(), 'headers': list(headers),
+    }
+    async_to_sync(sse.task_events_app)(scope, receive, send)
+    return sent[0]['status'], json.loads(sent[1]['body'])
+
+
+class EventStreamTicketTests(MongoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(sse, 'get_collection', async_collection)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_wsgi_server_does_not_issue_tickets(self):
+        response = self.api.post('/api/tasks/events/ticket/')
+        self.assertEqual(response.status_code, 501)
+        self.assertEqual(EventStreamTicket.objects.count(), 0)
+
+    def test_asgi_server_issues_a_ticket(self):
+        response = async_to_sync(AsyncClient().post)(
+            '/api/tasks/events/ticket/', authorization=f'Bearer {self.token}'
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        data = json.loads(response.content)['data']
+        self.assertNotIn(self.token, data['ticket'])
+        self.assertEqual(EventStreamTicket.objects.get(ticket=data['ticket']).user_id, self.user_id)
+
+    def test_ticket_works_once(self):
+        ticket = sse.issue_ticket(self.user_id)
+        self.assertEqual(async_to_sync(sse._redeem_ticket)(ticket), (self.user_id, None))
+        self.assertEqual(async_to_sync(sse._redeem_ticket)(ticket), (None, 'Invalid ticket'))
+
+    def test_expired_ticket_is_refused(self):
+        ticket = sse.issue_ticket(self.user_id)
+        EventStreamTicket._get_collection().update_one(
+            {'_id': ticket}, {'$set': {'expires_at': datetime.utcnow() - timedelta(seconds=1)}}
+        )
+        self.assertEqual(async_to_sync(sse._redeem_ticket)(ticket), (None, 'Invalid ticket'))
+
+    def test_stream_refuses_unknown_ticket(self):
+        self.assertEqual(_call_app('ticket=nope')[0], 401)
+
+    def test_stream_ignores_token_in_query_string(self):
+        status, body = _call_app(f'token={self.token}')
+        self.assertEqual(status, 401)
+        self.assertEqual(body['message'], 'No token provided')
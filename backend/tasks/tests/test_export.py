@@ -0,0 +1,96 @@
+import csv
+import gzip
+import io
+import json
+import random
+import tracemalloc
+from datetime import datetime
+from unittest import mock
+
+from tasks import export
+from tasks.models import Task
+from tasks.seeding import make_task_document
+from .base import MongoTestCase
+
+
+class ExportTasksViewTests(MongoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        for i in range(3):
+            Task(user_id=self.user_id, title=f'Task {i}', status='completed' if i else 'pending').save()
+        Task(user_id='someone-else', title='Not mine').save()
+
+    def export(self, **params):
+        response = self.api.get('/api/tasks/export/', params)
+        self.assertEqual(response.status_code, 200, getattr(response, 'content', b''))
+        return response, b''.join(response.streaming_content)
+
+    def test_ndjson_is_the_default(self):
+        response, body = self.export()
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(sorted(row['title'] for row in rows), ['Task 0', 'Task 1', 'Task 2'])
+
+    def test_type_ndjson(self):
+        _, body = self.export(type='ndjson')
+        self.assertEqual(len(body.splitlines()), 3)
+
+    def test_type_csv(self):
+        response, body = self.export(type='csv')
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        rows = list(csv.DictReader(io.StringIO(body.decode())))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual({row['user_id'] for row in rows}, {self.user_id})
+
+    def test_gzip(self):
+        response, body = self.export(type='csv', gzip='true')
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertIn('.csv.gz', response['Content-Disposition'])
+        self.assertEqual(len(gzip.decompress(body).decode().splitlines()), 4)
+
+    def test_unknown_type(self):
+        response = self.api.get('/api/tasks/export/', {'type': 'xml'})
+        self.assertEqual(response.status_code, 400)
+
+
+class ExportMemoryTests(MongoTestCase):
+    """Peak memory while exporting must not grow with the number of tasks"""
+    rows = 5000
+
+    def setUp(self):
+        super().setUp()
+        rng, now = random.Random(0), datetime.utcnow()
+        Task._get_collection().insert_many([make_task_document(rng, self.user_id, now) for _ in range(self.rows)])
+        # mongomock sorts the whole result set up front, unlike a server
+        # cursor, so fetch the rows before measuring and hand them over
+        # one at a time
+        self.docs = list(export.export_cursor(self.user_id))
+
+    def peak_while_exporting(self, rows, **params):
+        with mock.patch.object(export, 'export_cursor', lambda user_id: iter(self.docs[:rows])):
+            response = self.api.get('/api/tasks/export/', params)
+            self.assertEqual(response.status_code, 200)
+            tracemalloc.start()
+            try:
+                total = sum(len(chunk) for chunk in response.streaming_content)
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+        return total, peak
+
+    def assertFlat(self, **params):
+        small_total, small_peak = self.peak_while_exporting(self.rows // 5, **params)
+        total, peak = self.peak_while_exporting(self.rows, **params)
+        self.assertGreater(total, 4 * small_total)
+        # Five times the rows, at most one more chunk in flight
+        self.assertLess(peak, small_peak + export.CHUNK_SIZE)
+
+    def test_ndjson(self):
+        self.assertFlat(type='ndjson')
+
+    def test_csv(self):
+        self.assertFlat(type='csv')
+
+    def test_gzip(self):
+        self.assertFlat(type='ndjson', gzip='true')
@@ -0,0 +1,73 @@
+import gzip
+import io
+import json
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from tasks import importer
+from tasks.importer import MAX_LINE_BYTES, csv_rows, ndjson_rows
+from tasks.models import Task
+from .base import MongoTestCase
+
+
+class LineLimitTests(MongoTestCase):
+
+    def test_ndjson_long_line_is_rejected_with_its_line_number(self):
+        body = b'{"title": "a"}\n' + b'x' * (MAX_LINE_BYTES * 3) + b'\n{"title": "b"}\n'
+        rows = list(ndjson_rows(io.BytesIO(body)))
+        self.assertEqual(rows, [(1, {'title': 'a'}), (2, importer.LINE_TOO_LONG), (3, {'title': 'b'})])
+
+    def test_line_of_exactly_the_limit_is_accepted(self):
+        line = b'{"title": "a"}'.ljust(MAX_LINE_BYTES)
+        self.assertEqual(list(ndjson_rows(io.BytesIO(line + b'\n'))), [(1, {'title': 'a'})])
+
+    def test_csv_long_line_is_rejected_with_its_line_number(self):
+        body = b'title,priority\nfirst,low\n' + b'y' * (MAX_LINE_BYTES + 10) + b'\nsecond,high\n'
+        rows = list(csv_rows(io.BytesIO(body)))
+        self.assertEqual(rows, [
+            (2, {'title': 'first', 'priority': 'low'}),
+            (3, importer.LINE_TOO_LONG),
+            (4, {'title': 'second', 'priority': 'high'}),
+        ])
+
+    def test_csv_long_last_line(self):
+        body = b'title\nfirst\n' + b'y' * (MAX_LINE_BYTES + 10)
+        self.assertEqual(list(csv_rows(io.BytesIO(body)))[-1], (3, importer.LINE_TOO_LONG))
+
+
+class ImportTasksViewTests(MongoTestCase):
+
+    def post_raw(self, body, content_type, **params):
+        query = '&'.join(f'{key}={value}' for key, value in params.items())
+        return self.api.post(f'/api/tasks/import/?{query}', body, content_type=content_type)
+
+    def test_type_ndjson(self):
+        body = b'{"title": "one"}\n{"title": "two", "priority": "high"}\n'
+        response = self.post_raw(body, 'application/octet-stream', type='ndjson')
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(Task.objects(user_id=self.user_id).count(), 2)
+
+    def test_type_csv(self):
+        response = self.post_raw(b'title,priority\none,high\n', 'application/octet-stream', type='csv')
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(Task.objects(user_id=self.user_id).first().priority, 'high')
+
+    def test_type_overrides_the_filename(self):
+        upload = SimpleUploadedFile('tasks.txt', gzip.compress(b'title\nfrom csv\n'))
+        upload.name = 'tasks.gz'
+        response = self.api.post('/api/tasks/import/?type=csv', {'file': upload})
+        self.assertEqual(response.status_code, 201, response.content)
+
+    def test_unknown_type(self):
+        response = self.post_raw(b'{}', 'application/octet-stream', type='xml')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(json.loads(response.content)['message'], 'type must be ndjson or csv')
+
+    def test_oversized_line_is_reported_and_the_rest_imported(self):
+        body = b'{"title": "one"}\n' + b' ' * (MAX_LINE_BYTES + 1) + b'\n{"title": "two"}\n'
+        upload = SimpleUploadedFile('tasks.ndjson', body)
+        response = self.api.post('/api/tasks/import/', {'file': upload})
+        self.assertEqual(response.status_code, 207, response.content)
+        data = json.loads(response.content)['data']
+        self.assertEqual(data['imported'], 2)
+        self.assertEqual(data['errors'], [{'line': 2, 'message': importer.LINE_TOO_LONG}])
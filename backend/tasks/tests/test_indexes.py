@@ -0,0 +1,62 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+
+from tasks.models import Task
+from .base import MongoTestCase
+
+
+def _plan(*stages):
+    """explain() output whose winning plan is stages[0] <- stages[1] <- ..."""
+    node = None
+    for stage in reversed(stages):
+        node = dict({'stage': stage}, **({'inputStage': node} if node else {}))
+    return {'queryPlanner': {'winningPlan': node, 'rejectedPlans': [{'stage': 'COLLSCAN'}]}}
+
+
+class TaskIndexTests(MongoTestCase):
+
+    def test_compound_indexes_match_the_query_shapes(self):
+        Task.ensure_indexes()
+        keys = [info['key'] for info in Task._get_collection().index_information().values()]
+        for expected in (
+            [('user_id', 1), ('created_at', -1), ('_id', -1)],
+            [('user_id', 1), ('status', 1), ('created_at', -1), ('_id', -1)],
+            [('user_id', 1), ('priority', 1), ('created_at', -1), ('_id', -1)],
+            [('user_id', 1), ('status', 1), ('due_date', 1)],
+        ):
+            self.assertIn(expected, keys)
+
+
+class AuditIndexesCommandTests(MongoTestCase):
+
+    def audit(self, find_plan, *args):
+        collection = mock.MagicMock(name='tasks')
+        collection.find.return_value.sort.return_value.limit.return_value.explain.return_value = find_plan
+
+        def command(spec):
+            if 'aggregate' in spec:
+                return _plan('SORT', 'TEXT_MATCH', 'TEXT_OR', 'IXSCAN')
+            return _plan('COUNT', 'COUNT_SCAN')
+        collection.database.command.side_effect = command
+
+        out = StringIO()
+        with mock.patch('tasks.management.commands.audit_indexes.Task._get_collection', return_value=collection):
+            call_command('audit_indexes', '--user-id', 'u1', *args, stdout=out)
+        return out.getvalue()
+
+    def test_indexed_plans_pass(self):
+        output = self.audit(_plan('LIMIT', 'FETCH', 'IXSCAN'))
+        self.assertEqual(output.count(': ok'), 7)
+        self.assertIn('get_tasks?q: ok', output)
+
+    def test_collscan_and_memory_sort_are_flagged(self):
+        output = self.audit(_plan('SORT', 'COLLSCAN'))
+        self.assertIn('get_tasks: COLLSCAN, SORT (SORT <- COLLSCAN)', output)
+        # Rejected plans are not held against the query
+        self.assertIn('get_task_stats overdue: ok', output)
+
+    def test_strict_fails_on_flagged_queries(self):
+        with self.assertRaises(CommandError):
+            self.audit(_plan('SORT', 'COLLSCAN'), '--strict')
@@ -0,0 +1,47 @@
+from django.test import override_settings
+
+from tasks.models import Task
+from tasks.pagination import InvalidPageParameter, parse_page_params
+from .base import MongoTestCase
+
+
+class ParsePageParamsTests(MongoTestCase):
+
+    def test_defaults(self):
+        self.assertEqual(parse_page_params({}), (1, 10))
+
+    @override_settings(TASK_MAX_PAGE_SIZE=50)
+    def test_limit_is_clamped(self):
+        self.assertEqual(parse_page_params({'limit': '0'}), (1, 1))
+        self.assertEqual(parse_page_params({'limit': '-5', 'page': '-2'}), (1, 1))
+        self.assertEqual(parse_page_params({'limit': '1000'}), (1, 50))
+
+    def test_non_integer(self):
+        with self.assertRaises(InvalidPageParameter):
+            parse_page_params({'limit': 'ten'})
+        with self.assertRaises(InvalidPageParameter):
+            parse_page_params({'page': '1.5'})
+
+
+class GetTasksLimitTests(MongoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        for i in range(3):
+            Task(user_id=self.user_id, title=f'Task {i}').save()
+
+    def test_cursor_mode_with_zero_limit(self):
+        response = self.api.get('/api/tasks/', {'cursor': '', 'limit': '0'})
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(len(body['data']), 1)
+        self.assertTrue(body['pagination']['has_more'])
+
+    def test_negative_limit_returns_one_page(self):
+        response = self.api.get('/api/tasks/', {'limit': '-1'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['data']), 1)
+
+    def test_non_integer_limit(self):
+        response = self.api.get('/api/tasks/', {'limit': 'abc'})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,26 @@
+from io import StringIO
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+
+from tasks.models import Task
+from users.models import User
+from .base import MongoTestCase
+
+
+class SeedTasksCommandTests(MongoTestCase):
+
+    def test_seeds_scratch_database(self):
+        call_command('seed_tasks', users=2, tasks=5, stdout=StringIO())
+        self.assertEqual(User.objects(email__startswith='seed-user-').count(), 2)
+        self.assertEqual(Task.objects.count(), 10)
+
+    def test_refuses_other_databases(self):
+        with mock.patch('tasks.management.commands.seed_tasks.get_db',
+                        return_value=SimpleNamespace(name='taskmanager')):
+            with self.assertRaises(CommandError):
+                call_command('seed_tasks', users=1, tasks=1, stdout=StringIO())
+            self.assertEqual(Task.objects.count(), 0)
+            call_command('seed_tasks', users=1, tasks=1, force=True, stdout=StringIO())
+        self.assertEqual(Task.objects.count(), 1)
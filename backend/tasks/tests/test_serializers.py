@@ -0,0 +1,49 @@
+from datetime import datetime
+
+from tasks.models import Task
+from tasks.serializers import serialize_task
+from .base import MongoTestCase
+
+
+class SerializeTaskTests(MongoTestCase):
+
+    def test_matches_to_dict(self):
+        full = Task(user_id=self.user_id, title='Full', description='All fields', status='completed',
+                    priority='high', due_date=datetime(2030, 1, 2, 3, 4, 5))
+        full.save()
+        bare = Task(user_id=self.user_id, title='Bare')
+        bare.save()
+        for task in (full, bare):
+            raw = Task.objects(id=task.id).as_pymongo().first()
+            self.assertEqual(serialize_task(raw), Task.objects.get(id=task.id).to_dict())
+
+    def test_defaults_for_missing_fields(self):
+        raw = {'_id': Task(user_id=self.user_id, title='x').save().id, 'title': 'x', 'user_id': self.user_id}
+        data = serialize_task(raw)
+        self.assertEqual((data['status'], data['priority']), ('pending', 'medium'))
+        self.assertIsNone(data['due_date'])
+
+
+class TaskListSerializationTests(MongoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        for i in range(3):
+            Task(user_id=self.user_id, title=f'Task {i}', priority='high' if i else 'low',
+                 due_date=datetime(2030, 1, i + 1)).save()
+        self.tasks = list(Task.objects(user_id=self.user_id).order_by('-created_at', '-id'))
+        # A field outside the projection must not leak into responses
+        Task._get_collection().update_many({}, {'$set': {'internal_note': 'not for clients'}})
+
+    def expected(self):
+        return [task.to_dict() for task in self.tasks]
+
+    def test_page_mode(self):
+        response = self.api.get('/api/tasks/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data'], self.expected())
+
+    def test_cursor_mode(self):
+        response = self.api.get('/api/tasks/', {'cursor': ''})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data'], self.expected())
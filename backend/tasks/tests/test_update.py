@@ -0,0 +1,77 @@
+from tasks.models import Task
+from .base import MongoTestCase
+
+
+class UpdateTaskTests(MongoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.task = Task(user_id=self.user_id, title='Original', description='Keep me')
+        self.task.save()
+        self.path = f'/api/tasks/{self.task.id}/update/'
+
+    def put(self, body, **headers):
+        return self.api.put(self.path, body, content_type='application/json', **headers)
+
+    def etag(self):
+        return self.api.get(f'/api/tasks/{self.task.id}/')['ETag']
+
+    def test_sets_only_the_given_fields(self):
+        response = self.put({'status': 'completed'})
+        self.assertEqual(response.status_code, 200, response.content)
+        data = response.json()['data']
+        self.assertEqual((data['title'], data['description'], data['status']), ('Original', 'Keep me', 'completed'))
+        self.task.reload()
+        self.assertEqual((self.task.description, self.task.status), ('Keep me', 'completed'))
+        # The returned ETag is the one get_task now serves
+        self.assertEqual(response['ETag'], self.etag())
+
+    def test_matching_if_match(self):
+        response = self.put({'title': 'Renamed'}, HTTP_IF_MATCH=self.etag())
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(Task.objects.get(id=self.task.id).title, 'Renamed')
+
+    def test_if_match_any(self):
+        self.assertEqual(self.put({'title': 'Renamed'}, HTTP_IF_MATCH='*').status_code, 200)
+
+    def test_stale_if_match(self):
+        stale = self.etag()
+        self.assertEqual(self.put({'title': 'First'}).status_code, 200)
+        response = self.put({'title': 'Second'}, HTTP_IF_MATCH=stale)
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(response.json()['message'], 'Task was modified by another request')
+        self.assertEqual(Task.objects.get(id=self.task.id).title, 'First')
+
+    def test_foreign_etag(self):
+        for etag in ('"not-one-of-ours"', 'W/"xyz"'):
+            response = self.put({'title': 'Renamed'}, HTTP_IF_MATCH=etag)
+            self.assertEqual(response.status_code, 412, etag)
+        self.assertEqual(Task.objects.get(id=self.task.id).title, 'Original')
+
+    def test_other_users_task(self):
+        theirs = Task(user_id='someone-else', title='Theirs')
+        theirs.save()
+        path = f'/api/tasks/{theirs.id}/update/'
+        self.assertEqual(self.api.put(path, {'title': 'x'}, content_type='application/json').status_code, 404)
+        # A precondition does not reveal that the task exists
+        response = self.api.put(path, {'title': 'x'}, content_type='application/json', HTTP_IF_MATCH=self.etag())
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(Task.objects.get(id=theirs.id).title, 'Theirs')
+
+    def test_validation(self):
+        self.assertEqual(self.put({'status': 'bogus'}).status_code, 400)
+        self.assertEqual(self.api.put(self.path, '{', content_type='application/json').status_code, 400)
+
+
+class DeleteTaskTests(MongoTestCase):
+
+    def test_deletes_own_task_only(self):
+        mine = Task(user_id=self.user_id, title='Mine')
+        mine.save()
+        theirs = Task(user_id='someone-else', title='Theirs')
+        theirs.save()
+        self.assertEqual(self.api.delete(f'/api/tasks/{theirs.id}/delete/').status_code, 404)
+        self.assertEqual(self.api.delete(f'/api/tasks/{mine.id}/delete/').status_code, 200)
+        self.assertEqual(self.api.delete(f'/api/tasks/{mine.id}/delete/').status_code, 404)
+        self.assertEqual(self.api.delete('/api/tasks/not-an-id/delete/').status_code, 404)
+        self.assertEqual(list(Task.objects.scalar('title')), ['Theirs'])
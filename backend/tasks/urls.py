@@ -4,8 +4,16 @@ from . import views
 urlpatterns = [
     path('', views.get_tasks, name='get_tasks'),
     path('create/', views.create_task, name='create_task'),
+    path('stats/', views.get_task_stats, name='get_task_stats'),
+    path('changes/', views.get_task_changes, name='get_task_changes'),
+    path('events/', views.task_events, name='task_events'),
+    path('events/ticket/', views.task_events_ticket, name='task_events_ticket'),
+    path('export/', views.export_tasks, name='export_tasks'),
+    path('import/', views.import_tasks, name='import_tasks'),
+    path('bulk/create/', views.bulk_create_tasks, name='bulk_create_tasks'),
+    path('bulk/update/', views.bulk_update_tasks, name='bulk_update_tasks'),
+    path('bulk/delete/', views.bulk_delete_tasks, name='bulk_delete_tasks'),
     path('<str:task_id>/', views.get_task, name='get_task'),
     path('<str:task_id>/update/', views.update_task, name='update_task'),
     path('<str:task_id>/delete/', views.delete_task, name='delete_task'),
-    path('stats/', views.get_task_stats, name='get_task_stats'),
 ]
\ No newline at end of file
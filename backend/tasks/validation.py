@@ -0,0 +1,74 @@
+"""Validation rules for task payloads shared by the single, bulk and import paths"""
+from datetime import datetime
+
+from .models import TASK_PRIORITIES, TASK_STATUSES, Task
+
+
+class TaskValidationError(ValueError):
+    pass
+
+
+def parse_due_date(value):
+    """Parse an ISO 8601 due date; empty values clear it"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (ValueError, AttributeError):
+        raise TaskValidationError('Invalid date format')
+
+
+def _clean_text(data, key, required=False):
+    value = data.get(key)
+    if required and not value:
+        raise TaskValidationError(f'{key.capitalize()} is required')
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        raise TaskValidationError(f'{key.capitalize()} must be a string')
+    max_length = Task._fields[key].max_length
+    if len(value) > max_length:
+        raise TaskValidationError(f'{key.capitalize()} must be at most {max_length} characters')
+    return value
+
+
+def _clean_choice(data, key, choices):
+    value = data[key]
+    if value not in choices:
+        raise TaskValidationError(f'Invalid {key}')
+    return value
+
+
+def clean_new_task(data):
+    """Validate a create payload and return Task field values"""
+    if not isinstance(data, dict):
+        raise TaskValidationError('Task must be an object')
+
+    fields = {
+        'title': _clean_text(data, 'title', required=True),
+        'description': _clean_text(data, 'description') or '',
+        'priority': 'medium',
+        'due_date': parse_due_date(data.get('dueDate')),
+    }
+    if data.get('priority') is not None:
+        fields['priority'] = _clean_choice(data, 'priority', TASK_PRIORITIES)
+    return fields
+
+
+def clean_task_update(data):
+    """Validate an update payload and return only the fields being changed"""
+    if not isinstance(data, dict):
+        raise TaskValidationError('Task must be an object')
+
+    fields = {}
+    if 'title' in data:
+        fields['title'] = _clean_text(data, 'title', required=True)
+    if 'description' in data:
+        fields['description'] = _clean_text(data, 'description')
+    if 'status' in data:
+        fields['status'] = _clean_choice(data, 'status', TASK_STATUSES)
+    if 'priority' in data:
+        fields['priority'] = _clean_choice(data, 'priority', TASK_PRIORITIES)
+    if 'dueDate' in data:
+        fields['due_date'] = parse_due_date(data['dueDate'])
+    return fields
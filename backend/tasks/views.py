@@ -1,35 +1,101 @@
-from django.http import JsonResponse
+from backend_project.responses import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.response import Response
-from rest_framework import status
-from .models import Task
-from users.models import User
-from mongoengine import DoesNotExist, ValidationError
-from datetime import datetime
+from .models import Task, TaskTombstone
+from .stats import compute_task_stats
+from .queries import TASK_SEARCH_MAX_LENGTH, mongo_now, parse_object_id, task_list_filter
+from .search import count_matches, search_tasks
+from .export import EXPORT_FORMATS, export_stream
+from .importer import IMPORT_FORMATS, detect_format, import_stream
+from .conditional import (
+    STALE, conditional, expected_version, task_detail_etag, task_etag, task_list_etag, task_stats_etag,
+)
+from .serializers import TASK_FIELDS, serialize_task
+from .validation import TaskValidationError, clean_new_task, clean_task_update
+from .bulk import bulk_create, bulk_delete, bulk_update
+from .events import task_saved
+from .sse import issue_ticket
+from .counters import apply_delta, counter_delta
+from .pagination import (
+    InvalidCursor, InvalidPageParameter, decode_cursor, encode_cursor, keyset_filter, parse_bool, parse_page_params,
+)
+from monitoring.diagnostics import query_budget
+from mongoengine import DoesNotExist
+from datetime import datetime, timedelta, timezone
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.utils.http import quote_etag
+from pymongo import ReturnDocument
 import json
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional(etag_func=task_list_etag)
+@query_budget(5)
 def get_tasks(request):
     try:
         user_id = str(request.user.id)
         
         status_filter = request.GET.get('status')
         priority_filter = request.GET.get('priority')
-        page = int(request.GET.get('page', 1))
-        limit = int(request.GET.get('limit', 10))
+        try:
+            page, limit = parse_page_params(request.GET)
+        except InvalidPageParameter as e:
+            return JsonResponse({
+                'success': False,
+                'message': str(e)
+            }, status=400)
+        with_total = parse_bool(request.GET.get('with_total'))
+        
+        # Full-text search: ranked by relevance, always cursor paginated
+        search = request.GET.get('q', '').strip()
+        if search:
+            return _search_response(request, user_id, search, status_filter, priority_filter, limit, with_total)
         
-        query = {'user_id': user_id}
-        if status_filter:
-            query['status'] = status_filter
-        if priority_filter:
-            query['priority'] = priority_filter
+        query = task_list_filter(user_id, status_filter, priority_filter)
+        
+        # Raw documents skip building a Task per row; serialize_task matches to_dict()
+        tasks = Task.objects(**query).order_by('-created_at', '-id').only(*TASK_FIELDS).as_pymongo()
+        
+        # Cursor mode: ?cursor= (empty for the first page) walks the list by
+        # (created_at, _id) instead of skipping over earlier pages
+        if 'cursor' in request.GET:
+            cursor = request.GET.get('cursor')
+            if cursor:
+                try:
+                    created_at, last_id = decode_cursor(cursor)
+                except InvalidCursor:
+                    return JsonResponse({
+                        'success': False,
+                        'message': 'Invalid cursor'
+                    }, status=400)
+                tasks = tasks.filter(__raw__=keyset_filter(created_at, last_id))
+            
+            page_tasks = list(tasks.limit(limit + 1))
+            has_more = len(page_tasks) > limit
+            page_tasks = page_tasks[:limit]
+            next_cursor = None
+            if has_more:
+                next_cursor = encode_cursor(page_tasks[-1]['created_at'], page_tasks[-1]['_id'])
+            
+            pagination = {
+                'limit': limit,
+                'next_cursor': next_cursor,
+                'has_more': has_more,
+            }
+            if with_total:
+                pagination['total'] = Task.objects(**query).count()
+            
+            return JsonResponse({
+                'success': True,
+                'data': [serialize_task(task) for task in page_tasks],
+                'pagination': pagination
+            })
         
-        tasks = Task.objects(**query).order_by('-created_at')
-        total = tasks.count()
+        total = tasks.count() if with_total else None
         
         start = (page - 1) * limit
         end = start + limit
@@ -37,12 +103,12 @@ def get_tasks(request):
         
         return JsonResponse({
             'success': True,
-            'data': [task.to_dict() for task in paginated_tasks],
+            'data': [serialize_task(task) for task in paginated_tasks],
             'pagination': {
                 'page': page,
                 'limit': limit,
                 'total': total,
-                'pages': (total + limit - 1) // limit
+                'pages': (total + limit - 1) // limit if with_total else None
             }
         })
         
@@ -53,45 +119,57 @@ def get_tasks(request):
         }, status=500)
 
 
+def _search_response(request, user_id, search, status_filter, priority_filter, limit, with_total):
+    """get_tasks?q= results ranked by text score"""
+    if len(search) > TASK_SEARCH_MAX_LENGTH:
+        return JsonResponse({
+            'success': False,
+            'message': 'Search query is too long'
+        }, status=400)
+    try:
+        page_tasks, has_more, next_cursor = search_tasks(
+            user_id, search, status_filter, priority_filter, request.GET.get('cursor'), limit)
+    except InvalidCursor:
+        return JsonResponse({
+            'success': False,
+            'message': 'Invalid cursor'
+        }, status=400)
+    
+    pagination = {
+        'limit': limit,
+        'next_cursor': next_cursor,
+        'has_more': has_more,
+    }
+    if with_total:
+        pagination['total'] = count_matches(user_id, search, status_filter, priority_filter)
+    
+    return JsonResponse({
+        'success': True,
+        'data': [serialize_task(task) for task in page_tasks],
+        'pagination': pagination
+    })
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 @csrf_exempt
+@query_budget(3)
 def create_task(request):
     """Create new task"""
     try:
         data = json.loads(request.body)
         user_id = str(request.user.id)
         
-        title = data.get('title')
-        description = data.get('description', '')
-        priority = data.get('priority', 'medium')
-        due_date_str = data.get('dueDate')
-        
-        if not title:
+        try:
+            fields = clean_new_task(data)
+        except TaskValidationError as e:
             return JsonResponse({
                 'success': False,
-                'message': 'Title is required'
+                'message': str(e)
             }, status=400)
         
-        # Parse due date if provided
-        due_date = None
-        if due_date_str:
-            try:
-                due_date = datetime.fromisoformat(due_date_str.replace('Z', '+00:00'))
-            except ValueError:
-                return JsonResponse({
-                    'success': False,
-                    'message': 'Invalid date format'
-                }, status=400)
-        
         # Create task
-        task = Task(
-            title=title,
-            description=description,
-            priority=priority,
-            due_date=due_date,
-            user_id=user_id
-        )
+        task = Task(user_id=user_id, **fields)
         task.save()
         
         return JsonResponse({
@@ -114,6 +192,8 @@ def create_task(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional(etag_func=task_detail_etag)
+@query_budget(3)
 def get_task(request, task_id):
     """Get specific task"""
     try:
@@ -140,41 +220,68 @@ def get_task(request, task_id):
 @api_view(['PUT'])
 @permission_classes([IsAuthenticated])
 @csrf_exempt
+@query_budget(4)
 def update_task(request, task_id):
     """Update task"""
     try:
         data = json.loads(request.body)
         user_id = str(request.user.id)
-        task = Task.objects.get(id=task_id, user_id=user_id)
         
-        # Update allowed fields
-        if 'title' in data:
-            task.title = data['title']
-        if 'description' in data:
-            task.description = data['description']
-        if 'status' in data:
-            task.status = data['status']
-        if 'priority' in data:
-            task.priority = data['priority']
-        if 'dueDate' in data:
-            if data['dueDate']:
-                try:
-                    task.due_date = datetime.fromisoformat(data['dueDate'].replace('Z', '+00:00'))
-                except ValueError:
-                    return JsonResponse({
-                        'success': False,
-                        'message': 'Invalid date format'
-                    }, status=400)
-            else:
-                task.due_date = None
+        object_id = parse_object_id(task_id)
+        if object_id is None:
+            raise DoesNotExist
         
-        task.save()
+        try:
+            fields = clean_task_update(data)
+        except TaskValidationError as e:
+            return JsonResponse({
+                'success': False,
+                'message': str(e)
+            }, status=400)
         
-        return JsonResponse({
+        task_filter = {'_id': object_id, 'user_id': user_id}
+        
+        # Optimistic concurrency: If-Match carries the ETag from get_task,
+        # which encodes the updated_at the client last saw
+        expected = expected_version(request)
+        if expected is STALE:
+            return JsonResponse({
+                'success': False,
+                'message': 'Task was modified by another request'
+            }, status=412)
+        if expected is not None:
+            task_filter['updated_at'] = expected
+        
+        # Single round trip: $set only the changed fields and return the
+        # previous version, so status/priority transitions can be counted;
+        # the updated document is the previous one plus the $set fields
+        changes = dict(fields, updated_at=mongo_now())
+        collection = Task._get_collection()
+        before = collection.find_one_and_update(
+            task_filter,
+            {'$set': changes},
+            projection=TASK_FIELDS,
+            return_document=ReturnDocument.BEFORE,
+        )
+        if before is None:
+            if 'updated_at' in task_filter and collection.count_documents(
+                    {'_id': object_id, 'user_id': user_id}, limit=1):
+                return JsonResponse({
+                    'success': False,
+                    'message': 'Task was modified by another request'
+                }, status=412)
+            raise DoesNotExist
+        doc = dict(before, **changes)
+        apply_delta(user_id, counter_delta(before, doc))
+        task_saved(dict(doc, user_id=user_id))
+        
+        response = JsonResponse({
             'success': True,
             'message': 'Task updated successfully',
-            'data': task.to_dict()
+            'data': serialize_task(doc)
         })
+        response['ETag'] = quote_etag(task_etag(doc['updated_at']))
+        return response
         
     except DoesNotExist:
         return JsonResponse({
@@ -196,12 +303,24 @@ def update_task(request, task_id):
 @api_view(['DELETE'])
 @permission_classes([IsAuthenticated])
 @csrf_exempt
+@query_budget(4)
 def delete_task(request, task_id):
     """Delete task"""
     try:
         user_id = str(request.user.id)
-        task = Task.objects.get(id=task_id, user_id=user_id)
-        task.delete()
+        
+        object_id = parse_object_id(task_id)
+        if object_id is None:
+            raise DoesNotExist
+        
+        # find_one_and_delete returns what was removed, for the counters
+        deleted = Task._get_collection().find_one_and_delete(
+            {'_id': object_id, 'user_id': user_id},
+            projection={'status': 1, 'priority': 1},
+        )
+        if deleted is None:
+            raise DoesNotExist
+        Task.record_deletion(user_id, [deleted])
         
         return JsonResponse({
             'success': True,
@@ -222,40 +341,357 @@ def delete_task(request, task_id):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional(etag_func=task_stats_etag)
+@query_budget(5)
 def get_task_stats(request):
     """Get task statistics"""
     try:
         user_id = str(request.user.id)
         
-        # Get all tasks for user
-        all_tasks = Task.objects(user_id=user_id)
+        # One aggregation round trip instead of a count() per counter
+        return JsonResponse({
+            'success': True,
+            'data': compute_task_stats(user_id)
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': 'Server error'
+        }, status=500)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@query_budget(3)
+def get_task_changes(request):
+    """Tasks created, updated or deleted since a timestamp"""
+    try:
+        user_id = str(request.user.id)
+        server_time = datetime.utcnow()
         
-        # Calculate statistics
-        total = all_tasks.count()
-        pending = all_tasks.filter(status='pending').count()
-        in_progress = all_tasks.filter(status='in-progress').count()
-        completed = all_tasks.filter(status='completed').count()
+        since_str = request.GET.get('since')
+        if not since_str:
+            return JsonResponse({
+                'success': False,
+                'message': 'since is required'
+            }, status=400)
+        try:
+            since = datetime.fromisoformat(since_str.replace('Z', '+00:00'))
+        except ValueError:
+            return JsonResponse({
+                'success': False,
+                'message': 'Invalid date format'
+            }, status=400)
+        if since.tzinfo is not None:
+            since = since.astimezone(timezone.utc).replace(tzinfo=None)
+        
+        # Tombstones older than this have expired, so deletions may be missing
+        if since < server_time - timedelta(days=settings.TASK_TOMBSTONE_TTL_DAYS):
+            return JsonResponse({
+                'success': False,
+                'message': 'Sync window expired, reload all tasks'
+            }, status=410)
+        
+        tasks = Task.objects(user_id=user_id, updated_at__gte=since).order_by('updated_at', 'id')
+        cursor = request.GET.get('cursor')
+        if cursor:
+            try:
+                updated_at, last_id = decode_cursor(cursor)
+            except InvalidCursor:
+                return JsonResponse({
+                    'success': False,
+                    'message': 'Invalid cursor'
+                }, status=400)
+            tasks = tasks.filter(__raw__={
+                '$or': [
+                    {'updated_at': {'$gt': updated_at}},
+                    {'updated_at': updated_at, '_id': {'$gt': last_id}},
+                ]
+            })
         
-        # Count overdue tasks
-        now = datetime.utcnow()
-        overdue = all_tasks.filter(
-            due_date__lt=now,
-            status__ne='completed'
-        ).count()
+        limit = settings.TASK_SYNC_PAGE_SIZE
+        changed = list(tasks.only(*TASK_FIELDS).as_pymongo().limit(limit + 1))
+        has_more = len(changed) > limit
+        changed = changed[:limit]
+        next_cursor = None
+        if has_more:
+            next_cursor = encode_cursor(changed[-1]['updated_at'], changed[-1]['_id'])
+        
+        # Every page repeats the deletions since `since`; they are few and
+        # clients apply them idempotently
+        deleted = TaskTombstone.objects(user_id=user_id, deleted_at__gte=since).only('task_id').as_pymongo()
         
         return JsonResponse({
             'success': True,
             'data': {
-                'total': total,
-                'pending': pending,
-                'inProgress': in_progress,
-                'completed': completed,
-                'overdue': overdue
-            }
+                'changed': [serialize_task(task) for task in changed],
+                'deleted': sorted({tombstone['task_id'] for tombstone in deleted}),
+            },
+            'has_more': has_more,
+            'next_cursor': next_cursor,
+            'next_since': (server_time - timedelta(seconds=settings.TASK_SYNC_OVERLAP_SECONDS)).isoformat()
         })
         
     except Exception as e:
         return JsonResponse({
             'success': False,
             'message': 'Server error'
-        }, status=500)
\ No newline at end of file
+        }, status=500)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+# The export cursor only runs while the body streams, after the request
+# has been recorded, so there is nothing for a budget to count
+@query_budget(0)
+def export_tasks(request):
+    """Stream all of the user's tasks as NDJSON or CSV"""
+    try:
+        # Not ?format=, which DRF reserves for its renderer override
+        export_format = request.GET.get('type', 'ndjson')
+        if export_format not in EXPORT_FORMATS:
+            return JsonResponse({
+                'success': False,
+                'message': 'type must be ndjson or csv'
+            }, status=400)
+        gzip = parse_bool(request.GET.get('gzip'), default=False)
+        
+        filename = f'tasks-{datetime.utcnow():%Y%m%d}.{export_format}'
+        content_type = EXPORT_FORMATS[export_format]
+        if gzip:
+            filename += '.gz'
+            content_type = 'application/gzip'
+        
+        response = StreamingHttpResponse(
+            export_stream(str(request.user.id), export_format, gzip),
+            content_type=content_type,
+        )
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        response['Cache-Control'] = 'no-store'
+        return response
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': 'Server error'
+        }, status=500)
+
+
+EVENTS_NEED_ASGI = 'Task events need the ASGI server (GUNICORN_WORKER_MODE=asgi)'
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def task_events(request):
+    """Live task events are streamed by backend_project.asgi; WSGI workers cannot hold them open"""
+    return JsonResponse({
+        'success': False,
+        'message': EVENTS_NEED_ASGI
+    }, status=501)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@csrf_exempt
+@query_budget(2)
+def task_events_ticket(request):
+    """Single-use ticket for opening the event stream (?ticket=), so the JWT stays out of URLs"""
+    # The stream is only mounted by the ASGI app; tell WSGI clients not to bother
+    if not isinstance(request._request, ASGIRequest):
+        return JsonResponse({
+            'success': False,
+            'message': EVENTS_NEED_ASGI
+        }, status=501)
+    try:
+        return JsonResponse({
+            'success': True,
+            'data': {
+                'ticket': issue_ticket(request.user.id),
+                'expires_in': settings.TASK_EVENTS_TICKET_SECONDS,
+            }
+        }, status=201)
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': 'Server error'
+        }, status=500)
+
+
+IMPORT_CONTENT_TYPES = {
+    'application/x-ndjson': 'ndjson',
+    'application/jsonl': 'ndjson',
+    'text/csv': 'csv',
+}
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@csrf_exempt
+@query_budget(0)  # one insert per batch, so the count scales with the upload
+def import_tasks(request):
+    """Import tasks from an NDJSON or CSV upload (multipart 'file' or raw body)"""
+    try:
+        # Read from the Django request so DRF does not parse the body into
+        # request.data. Django has already spooled large multipart uploads
+        # (and, under ASGI, raw bodies) to a temporary file.
+        django_request = request._request
+        if django_request.content_type == 'multipart/form-data':
+            upload = django_request.FILES.get('file')
+            if upload is None:
+                return JsonResponse({
+                    'success': False,
+                    'message': 'file is required'
+                }, status=400)
+            stream, filename = upload, upload.name
+            compressed = filename.lower().endswith('.gz')
+        else:
+            stream, filename = django_request, None
+            compressed = django_request.META.get('HTTP_CONTENT_ENCODING') == 'gzip'
+        
+        # Not ?format=, which DRF reserves for its renderer override
+        import_format = (request.GET.get('type') or detect_format(filename)
+                         or IMPORT_CONTENT_TYPES.get(django_request.content_type))
+        if import_format not in IMPORT_FORMATS:
+            return JsonResponse({
+                'success': False,
+                'message': 'type must be ndjson or csv'
+            }, status=400)
+        
+        result = import_stream(str(request.user.id), stream, import_format, compressed,
+                               max_rows=settings.TASK_IMPORT_MAX_ROWS)
+        
+        if result['rejected'] == 0 and not result['read_error']:
+            response_status = 201
+        elif result['imported'] == 0:
+            response_status = 400
+        else:
+            response_status = 207
+        return JsonResponse({
+            'success': response_status == 201,
+            'message': f"Imported {result['imported']} tasks, rejected {result['rejected']}",
+            'data': result
+        }, status=response_status)
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': 'Server error'
+        }, status=500)
+
+
+def _bulk_items(request, key):
+    """Items list from a bulk request body, or an error response"""
+    data = json.loads(request.body)
+    items = data.get(key) if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return None, JsonResponse({
+            'success': False,
+            'message': f'{key} must be a non-empty list'
+        }, status=400)
+    if len(items) > settings.TASK_BULK_MAX_ITEMS:
+        return None, JsonResponse({
+            'success': False,
+            'message': f'At most {settings.TASK_BULK_MAX_ITEMS} items per request'
+        }, status=400)
+    return items, None
+
+
+def _bulk_response(results, message, success_status=200):
+    """Per-item results; 207 when only some items succeeded"""
+    succeeded = sum(1 for result in results if result['success'])
+    failed = len(results) - succeeded
+    if failed == 0:
+        response_status = success_status
+    elif succeeded == 0:
+        response_status = 400
+    else:
+        response_status = 207
+    return JsonResponse({
+        'success': failed == 0,
+        'message': message,
+        'data': {
+            'succeeded': succeeded,
+            'failed': failed,
+            'results': results,
+        }
+    }, status=response_status)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@csrf_exempt
+@query_budget(3)
+def bulk_create_tasks(request):
+    """Create many tasks in one request"""
+    try:
+        items, error = _bulk_items(request, 'tasks')
+        if error:
+            return error
+        
+        results = bulk_create(str(request.user.id), items)
+        return _bulk_response(results, 'Tasks created', success_status=201)
+        
+    except json.JSONDecodeError:
+        return JsonResponse({
+            'success': False,
+            'message': 'Invalid JSON'
+        }, status=400)
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': 'Server error'
+        }, status=500)
+
+
+@api_view(['PUT'])
+@permission_classes([IsAuthenticated])
+@csrf_exempt
+@query_budget(4)
+def bulk_update_tasks(request):
+    """Update many tasks in one request"""
+    try:
+        items, error = _bulk_items(request, 'tasks')
+        if error:
+            return error
+        
+        results = bulk_update(str(request.user.id), items)
+        return _bulk_response(results, 'Tasks updated')
+        
+    except json.JSONDecodeError:
+        return JsonResponse({
+            'success': False,
+            'message': 'Invalid JSON'
+        }, status=400)
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': 'Server error'
+        }, status=500)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@csrf_exempt
+@query_budget(5)
+def bulk_delete_tasks(request):
+    """Delete many tasks in one request"""
+    try:
+        items, error = _bulk_items(request, 'ids')
+        if error:
+            return error
+        
+        results = bulk_delete(str(request.user.id), items)
+        return _bulk_response(results, 'Tasks deleted')
+        
+    except json.JSONDecodeError:
+        return JsonResponse({
+            'success': False,
+            'message': 'Invalid JSON'
+        }, status=400)
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': 'Server error'
+        }, status=500)
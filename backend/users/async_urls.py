@@ -0,0 +1,6 @@
+from django.urls import path
+from . import async_views
+
+urlpatterns = [
+    path('me/', async_views.get_user_profile, name='async_get_user_profile'),
+]
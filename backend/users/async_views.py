@@ -0,0 +1,12 @@
+"""Async (ASGI) user views backed by Motor"""
+from backend_project.responses import JsonResponse
+from .async_auth import async_api_view
+
+
+@async_api_view(['GET'])
+async def get_user_profile(request):
+    """Get user profile endpoint"""
+    return JsonResponse({
+        'success': True,
+        'user': request.user.to_dict()
+    })
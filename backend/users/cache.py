@@ -0,0 +1,190 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+class LRUCache:
+    """
+    Thread-safe in-process LRU cache with per-entry expiry
+    """
+
+    def __init__(self, max_size=1024, ttl=60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value or None if missing/expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        """Store a value, evicting the least recently used entry when full"""
+        if ttl is None:
+            ttl = self.ttl
+        if ttl <= 0 or self.max_size <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Hit/miss counters for measuring cache effectiveness"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+class SharedCache:
+    """
+    LRUCache-compatible view over a Django cache alias, so entries and
+    invalidations are shared by every worker using that cache
+    """
+
+    def __init__(self, alias, ttl=60, prefix='user-cache:'):
+        self.alias = alias
+        self.ttl = ttl
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def _backend(self):
+        from django.core.cache import caches
+        return caches[self.alias]
+
+    def get(self, key):
+        value = self._backend.get(self.prefix + key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key, value, ttl=None):
+        self._backend.set(self.prefix + key, value, self.ttl if ttl is None else ttl)
+
+    def delete(self, key):
+        self._backend.delete(self.prefix + key)
+
+    def clear(self):
+        """Reset the counters; entries expire on their own in the shared cache"""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'backend': self.alias,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+class UserCache:
+    """
+    Cache of authenticated users keyed by user_id, in-process by default
+    or in a shared Django cache (USER_CACHE_BACKEND).
+
+    Stores the raw Mongo document rather than the User instance so that
+    every request gets its own object and views can mutate request.user
+    without touching other threads.
+    """
+
+    def __init__(self):
+        ttl = getattr(settings, 'USER_CACHE_TTL', 60)
+        backend = getattr(settings, 'USER_CACHE_BACKEND', 'local')
+        if backend == 'local':
+            self._cache = LRUCache(max_size=getattr(settings, 'USER_CACHE_MAX_SIZE', 1024), ttl=ttl)
+        else:
+            self._cache = SharedCache(backend, ttl=ttl)
+
+    @property
+    def enabled(self):
+        return getattr(settings, 'USER_CACHE_ENABLED', True)
+
+    def get(self, user_id):
+        """Return a User for user_id, loading it from Mongo on a miss"""
+        from .models import User
+
+        user_id = str(user_id)
+        if not self.enabled:
+            return User.objects.get(id=user_id)
+
+        son = self._cache.get(user_id)
+        if son is not None:
+            return User._from_son(son)
+
+        user = User.objects.get(id=user_id)
+        self._cache.set(user_id, user.to_mongo().to_dict())
+        return user
+
+    async def aget(self, user_id):
+        """Async variant of get() for the ASGI views; None if the user is gone"""
+        from bson import ObjectId
+        from backend_project.async_db import get_collection
+        from .models import User
+
+        user_id = str(user_id)
+        son = self._cache.get(user_id) if self.enabled else None
+        if son is None:
+            son = await get_collection(User).find_one({'_id': ObjectId(user_id)})
+            if son is None:
+                return None
+            if self.enabled:
+                self._cache.set(user_id, son)
+        return User._from_son(son)
+
+    def invalidate(self, user_id):
+        self._cache.delete(str(user_id))
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self):
+        return dict(self._cache.stats(), enabled=self.enabled)
+
+
+user_cache = UserCache()
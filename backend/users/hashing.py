@@ -0,0 +1,47 @@
+"""
+Password hashing off the request thread.
+
+PBKDF2 runs in a small per-process thread pool (hashlib releases the GIL
+while it iterates), so a login burst can only occupy
+PASSWORD_HASH_WORKERS cores per worker. Calls that cannot get a slot
+within PASSWORD_HASH_QUEUE_TIMEOUT raise HashingBusy, which the views
+turn into a 503 instead of piling up behind the pool.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+
+class HashingBusy(Exception):
+    pass
+
+
+_lock = threading.Lock()
+_pool = None
+_pool_pid = None
+_slots = None
+
+
+def _get_pool():
+    # Created lazily and per process; gunicorn forks workers after import
+    global _pool, _pool_pid, _slots
+    with _lock:
+        if _pool is None or _pool_pid != os.getpid():
+            workers = settings.PASSWORD_HASH_WORKERS
+            _pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+            _slots = threading.BoundedSemaphore(workers + settings.PASSWORD_HASH_QUEUE_SIZE)
+            _pool_pid = os.getpid()
+        return _pool, _slots
+
+
+def run_hasher(func, *args):
+    """Run a hashing call such as user.check_password in the pool and wait for it"""
+    pool, slots = _get_pool()
+    if not slots.acquire(timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT):
+        raise HashingBusy()
+    try:
+        return pool.submit(func, *args).result()
+    finally:
+        slots.release()
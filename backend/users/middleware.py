@@ -1,38 +1,89 @@
-from django.http import JsonResponse
-from rest_framework_simplejwt.tokens import UntypedToken
-from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
-from django.conf import settings
+import asyncio
+import time
+
 import jwt
+from django.conf import settings
+
+from backend_project.responses import JsonResponse
+from .tokens import get_bearer_token, verify_token
+
+# Skips JWT auth only while METRICS_ENABLED; the view applies its own guard
+METRICS_PATH = '/api/metrics/'
+
+PUBLIC_PATHS = {
+    '/api/health/',
+    '/api/users/register/',
+    '/api/users/login/',
+    '/api/users/oauth-login/',
+}
+
 
 class JWTAuthenticationMiddleware:
+    """
+    Verifies the bearer token once per request and stores the claims on
+    request.jwt_claims, where MongoEngineJWTAuthentication and the async
+    views pick them up instead of decoding the token again.
+
+    Time spent authenticating is reported in a Server-Timing header.
+    """
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if asyncio.iscoroutinefunction(self.get_response):
+            # Lets Django call this middleware natively under ASGI
+            self._is_coroutine = asyncio.coroutines._is_coroutine
 
     def __call__(self, request):
-        # Process the request before the view
-        if request.path.startswith('/api/') and request.path not in ['/api/health/', '/api/users/register/', '/api/users/login/', '/api/users/oauth-login/']:
-            auth_header = request.META.get('HTTP_AUTHORIZATION')
-            if auth_header and auth_header.startswith('Bearer '):
-                token = auth_header.split(' ')[1]
-                try:
-                    # Verify and decode JWT token
-                    decoded_token = jwt.decode(token, settings.SECRET_KEY, algorithms=['HS256'])
-                    request.user = decoded_token
-                except jwt.ExpiredSignatureError:
-                    return JsonResponse({
-                        'success': False,
-                        'message': 'Token expired'
-                    }, status=401)
-                except jwt.InvalidTokenError:
-                    return JsonResponse({
-                        'success': False,
-                        'message': 'Invalid token'
-                    }, status=401)
-            else:
-                return JsonResponse({
-                    'success': False,
-                    'message': 'No token provided'
-                }, status=401)
-
-        response = self.get_response(request)
-        return response
\ No newline at end of file
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        error_response = self.process_request(request)
+        if error_response is not None:
+            return error_response
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        error_response = self.process_request(request)
+        if error_response is not None:
+            return error_response
+        return self.process_response(request, await self.get_response(request))
+
+    def process_request(self, request):
+        start = time.perf_counter()
+        request.jwt_claims = None
+        token = get_bearer_token(request)
+        error = None
+        if token:
+            try:
+                request.jwt_claims = verify_token(token)
+            except jwt.ExpiredSignatureError:
+                error = 'Token expired'
+            except jwt.InvalidTokenError:
+                error = 'Invalid token'
+        request.auth_duration = time.perf_counter() - start
+
+        path = request.path.rstrip('/') + '/'
+        if not path.startswith('/api/') or path in PUBLIC_PATHS:
+            return None
+        if path == METRICS_PATH and settings.METRICS_ENABLED:
+            return None
+        if error:
+            return JsonResponse({
+                'success': False,
+                'message': error
+            }, status=401)
+        if not token:
+            return JsonResponse({
+                'success': False,
+                'message': 'No token provided'
+            }, status=401)
+        return None
+
+    def process_response(self, request, response):
+        duration = getattr(request, 'auth_duration', None)
+        if duration is not None:
+            entry = f'auth;dur={duration * 1000:.3f}'
+            existing = response.get('Server-Timing')
+            response['Server-Timing'] = f'{existing}, {entry}' if existing else entry
+        return response
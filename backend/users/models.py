@@ -1,6 +1,7 @@
 from mongoengine import Document, StringField, BooleanField, DateTimeField
 from django.contrib.auth.hashers import make_password, check_password
 from datetime import datetime
+from .cache import user_cache
 
 
 class User(Document):
@@ -35,12 +36,26 @@ class User(Document):
         """Check if provided password matches stored password"""
         if not self.password:
             return False
-        return check_password(raw_password, self.password)
+        return check_password(raw_password, self.password, setter=self._rehash_password)
+
+    def _rehash_password(self, raw_password):
+        """Store a hash using the current hasher policy after a successful check"""
+        self.password = make_password(raw_password)
+        User.objects(id=self.id).update_one(set__password=self.password)
+        user_cache.invalidate(self.id)
     
     def save(self, *args, **kwargs):
         """Override save to update timestamp"""
         self.updated_at = datetime.utcnow()
-        return super().save(*args, **kwargs)
+        result = super().save(*args, **kwargs)
+        user_cache.invalidate(self.id)
+        return result
+    
+    def delete(self, *args, **kwargs):
+        """Override delete to drop the cached copy"""
+        result = super().delete(*args, **kwargs)
+        user_cache.invalidate(self.id)
+        return result
     
     # Django compatibility methods for REST Framework
     @property
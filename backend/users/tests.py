@@ -0,0 +1,324 @@
+import threading
+import time
+from unittest import mock
+
+import jwt
+from asgiref.sync import async_to_sync
+from bson import ObjectId
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.test import Client, override_settings
+from mongoengine import DoesNotExist
+
+from tasks.tests.base import MongoTestCase, async_collection
+from users import hashing, oauth, tokens
+from users.cache import LRUCache, user_cache
+from users.models import User
+
+
+def _token(user_id, expires_in):
+    return jwt.encode({'user_id': user_id, 'exp': int(time.time()) + expires_in}, settings.SECRET_KEY, 'HS256')
+
+
+STUB_CLAIMS = {}
+verifier_calls = []
+
+
+def stub_verifier(id_token):
+    verifier_calls.append(id_token)
+    if id_token not in STUB_CLAIMS:
+        raise ValueError('unknown token')
+    return dict(STUB_CLAIMS[id_token])
+
+
+class LRUCacheTests(MongoTestCase):
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_size=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual((cache.get('a'), cache.get('b'), cache.get('c')), (1, None, 3))
+
+    def test_entries_expire(self):
+        cache = LRUCache(ttl=60)
+        with mock.patch('users.cache.time.monotonic', return_value=1000.0):
+            cache.set('a', 1)
+        with mock.patch('users.cache.time.monotonic', return_value=1059.0):
+            self.assertEqual(cache.get('a'), 1)
+        with mock.patch('users.cache.time.monotonic', return_value=1060.0):
+            self.assertIsNone(cache.get('a'))
+
+
+class UserCacheTests(MongoTestCase):
+
+    def test_get_reads_mongo_once(self):
+        self.assertEqual(user_cache.get(self.user_id).email, 'test@example.com')
+        with mock.patch.object(User, 'objects') as objects:
+            cached = user_cache.get(self.user_id)
+        objects.get.assert_not_called()
+        self.assertEqual(cached.email, 'test@example.com')
+        self.assertEqual(user_cache.stats()['hits'], 1)
+
+    def test_each_get_returns_its_own_instance(self):
+        first = user_cache.get(self.user_id)
+        first.name = 'Changed in one request'
+        self.assertEqual(user_cache.get(self.user_id).name, 'Test User')
+
+    def test_save_invalidates(self):
+        user_cache.get(self.user_id)
+        user = User.objects.get(id=self.user_id)
+        user.name = 'Renamed'
+        user.save()
+        self.assertEqual(user_cache.get(self.user_id).name, 'Renamed')
+
+    def test_delete_invalidates(self):
+        user_cache.get(self.user_id)
+        User.objects.get(id=self.user_id).delete()
+        with self.assertRaises(DoesNotExist):
+            user_cache.get(self.user_id)
+
+    @override_settings(USER_CACHE_ENABLED=False)
+    def test_disabled(self):
+        user_cache.get(self.user_id)
+        User._get_collection().update_one({'_id': self.user.id}, {'$set': {'name': 'Raw write'}})
+        self.assertEqual(user_cache.get(self.user_id).name, 'Raw write')
+
+    def test_aget(self):
+        with mock.patch('backend_project.async_db.get_collection', async_collection):
+            self.assertEqual(async_to_sync(user_cache.aget)(self.user_id).email, 'test@example.com')
+            self.assertIsNone(async_to_sync(user_cache.aget)(str(ObjectId())))
+        # Served from the cache without Motor
+        self.assertEqual(async_to_sync(user_cache.aget)(self.user_id).email, 'test@example.com')
+
+    def test_aget_after_save_sees_the_change(self):
+        with mock.patch('backend_project.async_db.get_collection', async_collection):
+            async_to_sync(user_cache.aget)(self.user_id)
+            self.user.name = 'Renamed'
+            self.user.save()
+            self.assertEqual(async_to_sync(user_cache.aget)(self.user_id).name, 'Renamed')
+
+    def test_stats_are_not_served_to_users(self):
+        self.assertEqual(self.api.get('/api/users/cache-stats/').status_code, 404)
+
+
+class JWTAuthenticationMiddlewareTests(MongoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.anonymous = Client(HTTP_HOST='localhost')
+
+    def message(self, response):
+        return response.json()['message']
+
+    def test_protected_path_without_token(self):
+        response = self.anonymous.get('/api/tasks/')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(self.message(response), 'No token provided')
+
+    def test_public_paths_skip_authentication(self):
+        self.assertEqual(self.anonymous.get('/api/health/').status_code, 200)
+        response = self.anonymous.post('/api/users/login/', {'email': 'test@example.com', 'password': 'password123'},
+                                       content_type='application/json')
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def test_public_path_ignores_a_bad_token(self):
+        response = self.anonymous.get('/api/health/', HTTP_AUTHORIZATION=f'Bearer {_token(self.user_id, -60)}')
+        self.assertEqual(response.status_code, 200)
+
+    def test_non_api_paths_are_not_checked(self):
+        self.assertEqual(self.anonymous.get('/not-an-api/').status_code, 404)
+
+    def test_expired_token(self):
+        response = self.anonymous.get('/api/tasks/', HTTP_AUTHORIZATION=f'Bearer {_token(self.user_id, -60)}')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(self.message(response), 'Token expired')
+
+    def test_invalid_token(self):
+        response = self.anonymous.get('/api/tasks/', HTTP_AUTHORIZATION='Bearer not.a.token')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(self.message(response), 'Invalid token')
+
+    def test_valid_token_reports_auth_timing(self):
+        response = self.api.get('/api/users/me/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('auth;dur=', response['Server-Timing'])
+
+    def test_metrics_path_needs_a_token_while_disabled(self):
+        self.assertEqual(self.anonymous.get('/api/metrics/').status_code, 401)
+
+    @override_settings(METRICS_ENABLED=True, METRICS_TOKEN='', METRICS_ALLOWED_IPS=['127.0.0.1'])
+    def test_metrics_path_is_left_to_the_view_when_enabled(self):
+        self.assertEqual(self.anonymous.get('/api/metrics/').status_code, 200)
+        # The view's own guard still applies
+        self.assertEqual(self.anonymous.get('/api/metrics/', REMOTE_ADDR='10.1.2.3').status_code, 403)
+
+
+class VerifyTokenTests(MongoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        tokens._verified.clear()
+
+    def test_claims_are_cached_until_exp(self):
+        token = _token(self.user_id, 30)
+        with mock.patch('users.tokens.jwt.decode', wraps=jwt.decode) as decode:
+            with mock.patch('users.cache.time.monotonic', return_value=1000.0):
+                self.assertEqual(tokens.verify_token(token)['user_id'], self.user_id)
+                tokens.verify_token(token)
+            self.assertEqual(decode.call_count, 1)
+            with mock.patch('users.cache.time.monotonic', return_value=1025.0):
+                tokens.verify_token(token)
+            self.assertEqual(decode.call_count, 1)
+            # Past the token's exp the entry is gone and the token is checked again
+            with mock.patch('users.cache.time.monotonic', return_value=1031.0):
+                tokens.verify_token(token)
+            self.assertEqual(decode.call_count, 2)
+
+    def test_expired_token_is_not_cached(self):
+        token = _token(self.user_id, -1)
+        with self.assertRaises(jwt.ExpiredSignatureError):
+            tokens.verify_token(token)
+        self.assertIsNone(tokens._verified.get(token))
+
+    def test_tampered_token_is_rejected(self):
+        token = _token(self.user_id, 30)
+        with self.assertRaises(jwt.InvalidTokenError):
+            tokens.verify_token(token[:-2] + ('AA' if not token.endswith('AA') else 'BB'))
+
+
+@override_settings(RATELIMIT_ENABLE=False, PASSWORD_HASH_ITERATIONS=1000)
+class PasswordHashingTests(MongoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # Each test sizes its own pool from the overridden settings
+        hashing._pool = None
+        self.addCleanup(setattr, hashing, '_pool', None)
+        self.anonymous = Client(HTTP_HOST='localhost')
+
+    def login(self, password='password123'):
+        return self.anonymous.post('/api/users/login/', {'email': self.user.email, 'password': password},
+                                   content_type='application/json')
+
+    def test_hashing_runs_in_the_pool(self):
+        self.assertTrue(hashing.run_hasher(lambda: threading.current_thread().name).startswith('password-hash'))
+
+    @override_settings(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_QUEUE_SIZE=0, PASSWORD_HASH_QUEUE_TIMEOUT=0.05)
+    def test_saturated_pool_returns_503(self):
+        started, release = threading.Event(), threading.Event()
+
+        def occupy():
+            started.set()
+            release.wait(5)
+
+        holder = threading.Thread(target=hashing.run_hasher, args=(occupy,))
+        holder.start()
+        try:
+            self.assertTrue(started.wait(5))
+            with self.assertRaises(hashing.HashingBusy):
+                hashing.run_hasher(len, 'x')
+            response = self.login()
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response['Retry-After'], '1')
+            response = self.anonymous.post('/api/users/register/',
+                                           {'name': 'New', 'email': 'new@example.com', 'password': 'secret123'},
+                                           content_type='application/json')
+            self.assertEqual(response.status_code, 503)
+            self.assertFalse(User.objects(email='new@example.com').count())
+        finally:
+            release.set()
+            holder.join()
+        # The slot is given back once the hash finishes
+        self.assertEqual(self.login().status_code, 200)
+
+    def test_login_rehashes_with_the_current_iterations(self):
+        with override_settings(PASSWORD_HASH_ITERATIONS=500):
+            self.user.set_password('password123')
+        self.user.save()
+        self.assertEqual(self.login('wrong-password').status_code, 401)
+        self.assertIn('$500$', User.objects.get(id=self.user.id).password)
+        self.assertEqual(self.login().status_code, 200)
+        self.assertTrue(User.objects.get(id=self.user.id).password.startswith('pbkdf2_sha256$1000$'))
+
+    def test_login_upgrades_legacy_hashes(self):
+        self.user.password = make_password('password123', hasher='pbkdf2_sha1')
+        self.user.save()
+        self.assertEqual(self.login().status_code, 200)
+        self.assertTrue(User.objects.get(id=self.user.id).password.startswith('pbkdf2_sha256$1000$'))
+
+
+@override_settings(RATELIMIT_ENABLE=False, FIREBASE_TOKEN_VERIFIER='users.tests.stub_verifier',
+                   OAUTH_TOKEN_CACHE_TTL=300)
+class OAuthLoginTests(MongoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        oauth._claims.clear()
+        verifier_calls.clear()
+        STUB_CLAIMS.clear()
+        self.addCleanup(STUB_CLAIMS.clear)
+        self.claims = {'uid': 'google-1', 'email': 'oauth@example.com', 'name': 'OAuth User',
+                       'picture': 'https://example.com/a.png', 'exp': time.time() + 3600}
+        STUB_CLAIMS['good-token'] = self.claims
+        self.anonymous = Client(HTTP_HOST='localhost')
+
+    def login(self, id_token='good-token'):
+        return self.anonymous.post('/api/users/oauth-login/', {'idToken': id_token}, content_type='application/json')
+
+    def test_claims_are_cached_by_token_hash(self):
+        self.assertEqual(oauth.verify_oauth_token('good-token')['uid'], 'google-1')
+        self.assertEqual(oauth.verify_oauth_token('good-token')['uid'], 'google-1')
+        self.assertEqual(verifier_calls, ['good-token'])
+        # The raw token is never used as a key
+        self.assertIsNone(oauth._claims.get('good-token'))
+
+    def test_cache_ttl_is_capped_by_exp(self):
+        self.claims['exp'] = 1000060.0
+        with mock.patch('users.oauth.time.time', return_value=1000000.0), \
+                mock.patch('users.cache.time.monotonic', return_value=500.0):
+            oauth.verify_oauth_token('good-token')
+        with mock.patch('users.cache.time.monotonic', return_value=559.0):
+            oauth.verify_oauth_token('good-token')
+        self.assertEqual(len(verifier_calls), 1)
+        with mock.patch('users.cache.time.monotonic', return_value=560.0):
+            oauth.verify_oauth_token('good-token')
+        self.assertEqual(len(verifier_calls), 2)
+
+    @override_settings(OAUTH_TOKEN_CACHE_TTL=10)
+    def test_cache_ttl_is_capped_by_setting(self):
+        with mock.patch('users.cache.time.monotonic', return_value=500.0):
+            oauth.verify_oauth_token('good-token')
+        with mock.patch('users.cache.time.monotonic', return_value=510.0):
+            oauth.verify_oauth_token('good-token')
+        self.assertEqual(len(verifier_calls), 2)
+
+    def test_rejected_tokens_are_not_cached(self):
+        self.assertEqual(self.login('bad-token').status_code, 401)
+        self.assertEqual(self.login('bad-token').status_code, 401)
+        self.assertEqual(verifier_calls, ['bad-token', 'bad-token'])
+
+    def test_login_creates_then_reuses_the_user(self):
+        response = self.login()
+        self.assertEqual(response.status_code, 200, response.content)
+        user = User.objects.get(email='oauth@example.com')
+        self.assertEqual((user.google_id, user.is_oauth_user), ('google-1', True))
+
+        # Nothing changed, so the second login does not write the user
+        with mock.patch.object(User, 'save') as save:
+            self.assertEqual(self.login().status_code, 200)
+        save.assert_not_called()
+        self.assertEqual(len(verifier_calls), 1)
+
+    def test_login_saves_changed_profile(self):
+        self.assertEqual(self.login().status_code, 200)
+        STUB_CLAIMS['new-token'] = dict(self.claims, picture='https://example.com/b.png')
+        self.assertEqual(self.login('new-token').status_code, 200)
+        self.assertEqual(User.objects.get(email='oauth@example.com').profile_picture, 'https://example.com/b.png')
+
+    def test_existing_password_user_is_linked(self):
+        STUB_CLAIMS['linked-token'] = dict(self.claims, email=self.user.email)
+        self.assertEqual(self.login('linked-token').status_code, 200)
+        user = User.objects.get(id=self.user.id)
+        self.assertEqual((user.google_id, user.is_oauth_user), ('google-1', True))
@@ -0,0 +1,50 @@
+"""
+Single place where bearer tokens are verified.
+
+Verified claims are kept in an LRU keyed by the token itself until the
+token's own expiry, so repeat requests with the same token skip the HMAC
+check and JSON parsing.
+"""
+import time
+
+import jwt
+from django.conf import settings
+
+from .cache import LRUCache
+
+_verified = LRUCache(max_size=getattr(settings, 'JWT_VERIFY_CACHE_SIZE', 4096))
+
+
+def get_bearer_token(request):
+    """Token from an 'Authorization: Bearer <token>' header, or None"""
+    auth_header = request.META.get('HTTP_AUTHORIZATION')
+    if not auth_header:
+        return None
+    try:
+        token_type, token = auth_header.split(' ')
+    except ValueError:
+        return None
+    if token_type.lower() != 'bearer':
+        return None
+    return token
+
+
+def verify_token(token):
+    """
+    Claims of a valid HS256 token. Raises jwt.ExpiredSignatureError or
+    jwt.InvalidTokenError otherwise. The returned dict is shared between
+    requests and must not be mutated.
+    """
+    claims = _verified.get(token)
+    if claims is not None:
+        return claims
+
+    claims = jwt.decode(token, settings.SECRET_KEY, algorithms=['HS256'])
+    exp = claims.get('exp')
+    if exp:
+        _verified.set(token, claims, ttl=exp - time.time())
+    return claims
+
+
+def verified_token_stats():
+    return _verified.stats()
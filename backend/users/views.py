@@ -1,4 +1,4 @@
-from django.http import JsonResponse
+from backend_project.responses import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -6,27 +6,13 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework_simplejwt.tokens import RefreshToken
 import json
-import firebase_admin
-from firebase_admin import auth, credentials
-from django.conf import settings
 from .models import User
+from .hashing import HashingBusy, run_hasher
+from .oauth import InvalidOAuthToken, verify_oauth_token
+from monitoring.diagnostics import query_budget
 from mongoengine import DoesNotExist, ValidationError
 from django_ratelimit.decorators import ratelimit
 
-if not firebase_admin._apps:
-    cred_dict = {
-        "type": "service_account",
-        "project_id": settings.FIREBASE_PROJECT_ID,
-        "private_key_id": settings.FIREBASE_PRIVATE_KEY_ID,
-        "private_key": settings.FIREBASE_PRIVATE_KEY,
-        "client_email": settings.FIREBASE_CLIENT_EMAIL,
-        "client_id": settings.FIREBASE_CLIENT_ID,
-        "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-        "token_uri": "https://oauth2.googleapis.com/token",
-    }
-    cred = credentials.Certificate(cred_dict)
-    firebase_admin.initialize_app(cred)
-
 def get_tokens_for_user(user):
     refresh = RefreshToken()
     refresh['user_id'] = str(user.id)
@@ -36,10 +22,19 @@ def get_tokens_for_user(user):
         'access': str(refresh.access_token),
     }
 
+def _busy_response():
+    response = JsonResponse({
+        'success': False,
+        'message': 'Server busy, please try again'
+    }, status=503)
+    response['Retry-After'] = '1'
+    return response
+
 @api_view(['POST'])
 @permission_classes([AllowAny])
 @csrf_exempt
 @ratelimit(key='ip', rate='5/m', method='POST')
+@query_budget(2)
 def register(request):
     try:
         data = json.loads(request.body)
@@ -70,7 +65,7 @@ def register(request):
             pass
         
         user = User(name=name, email=email)
-        user.set_password(password)
+        run_hasher(user.set_password, password)
         user.save()
         
         tokens = get_tokens_for_user(user)
@@ -87,6 +82,8 @@ def register(request):
             'success': False,
             'message': 'Invalid JSON'
         }, status=400)
+    except HashingBusy:
+        return _busy_response()
     except Exception as e:
         return JsonResponse({
             'success': False,
@@ -97,6 +94,7 @@ def register(request):
 @permission_classes([AllowAny])
 @csrf_exempt
 @ratelimit(key='ip', rate='5/m', method='POST')
+@query_budget(2)
 def login(request):
     """User login endpoint"""
     try:
@@ -112,7 +110,7 @@ def login(request):
         
         try:
             user = User.objects.get(email=email)
-            if user.check_password(password):
+            if run_hasher(user.check_password, password):
                 tokens = get_tokens_for_user(user)
                 return JsonResponse({
                     'success': True,
@@ -136,6 +134,8 @@ def login(request):
             'success': False,
             'message': 'Invalid JSON'
         }, status=400)
+    except HashingBusy:
+        return _busy_response()
     except Exception as e:
         return JsonResponse({
             'success': False,
@@ -146,6 +146,7 @@ def login(request):
 @permission_classes([AllowAny])
 @csrf_exempt
 @ratelimit(key='ip', rate='5/m', method='POST')
+@query_budget(2)
 def oauth_login(request):
     """OAuth login endpoint"""
     try:
@@ -159,7 +160,7 @@ def oauth_login(request):
             }, status=400)
         
         # Verify Firebase token
-        decoded_token = auth.verify_id_token(id_token)
+        decoded_token = verify_oauth_token(id_token)
         uid = decoded_token['uid']
         email = decoded_token.get('email')
         name = decoded_token.get('name', '')
@@ -174,11 +175,14 @@ def oauth_login(request):
         # Find or create user
         try:
             user = User.objects.get(email=email)
+            changed = user.google_id != uid or not user.is_oauth_user
             user.google_id = uid
             user.is_oauth_user = True
-            if picture:
+            if picture and picture != user.profile_picture:
                 user.profile_picture = picture
-            user.save()
+                changed = True
+            if changed:
+                user.save()
         except DoesNotExist:
             user = User(
                 name=name,
@@ -198,7 +202,7 @@ def oauth_login(request):
             'user': user.to_dict()
         })
         
-    except auth.InvalidIdTokenError as e:
+    except InvalidOAuthToken as e:
         return JsonResponse({
             'success': False,
             'message': 'Invalid ID token'
@@ -216,6 +220,7 @@ def oauth_login(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@query_budget(1)
 def get_user_profile(request):
     """Get user profile endpoint"""
     try:
@@ -240,6 +245,7 @@ def get_user_profile(request):
 @api_view(['PUT'])
 @permission_classes([IsAuthenticated])
 @csrf_exempt
+@query_budget(2)
 def update_profile(request):
     """Update user profile endpoint"""
     try:
@@ -251,7 +257,7 @@ def update_profile(request):
         if 'profile_picture' in data:
             user.profile_picture = data['profile_picture']
         
-        user.save()
+        user.save()  # also drops the cached copy used by authentication
         
         return JsonResponse({
             'success': True,
@@ -273,4 +279,4 @@ def update_profile(request):
         return JsonResponse({
             'success': False,
             'message': 'Server error'
-        }, status=500)
\ No newline at end of file
+        }, status=500)
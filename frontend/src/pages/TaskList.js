@@ -1,8 +1,11 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { Container, Row, Col, Card, Button, Form, Alert, Badge, Modal } from 'react-bootstrap';
 import { taskAPI } from '../services/api';
 import LoadingSpinner from '../components/LoadingSpinner';
 
+// Bursts of events (bulk edits, imports) are folded into one refetch
+const EVENT_REFETCH_DELAY_MS = 500;
+
 const TaskList = () => {
   const [tasks, setTasks] = useState([]);
   const [loading, setLoading] = useState(true);
@@ -21,6 +24,21 @@ const TaskList = () => {
     fetchTasks();
   }, [filters]);
 
+  // Refresh when tasks change in another tab or device. One stream for the
+  // page's lifetime; the ref always points at the fetch for current filters.
+  const fetchTasksRef = useRef(null);
+  useEffect(() => {
+    let refetchTimer = null;
+    const unsubscribe = taskAPI.subscribeEvents(() => {
+      clearTimeout(refetchTimer);
+      refetchTimer = setTimeout(() => fetchTasksRef.current(), EVENT_REFETCH_DELAY_MS);
+    });
+    return () => {
+      clearTimeout(refetchTimer);
+      unsubscribe();
+    };
+  }, []);
+
   const fetchTasks = async () => {
     try {
       setLoading(true);
@@ -35,6 +53,7 @@ const TaskList = () => {
       setLoading(false);
     }
   };
+  fetchTasksRef.current = fetchTasks;
 
   const handleFilterChange = (e) => {
     const { name, value } = e.target;
@@ -42,6 +42,11 @@ export const authAPI = {
   updateProfile: (userData) => API.put('/users/profile', userData),
 };
 
+const TASK_EVENT_TYPES = ['task.created', 'task.updated', 'task.deleted', 'tasks.reset'];
+const EVENTS_RETRY_MS = 5000;
+// Set once the server answers 501, so later pages do not ask again
+let eventsUnavailable = false;
+
 // Task API calls
 export const taskAPI = {
   getTasks: (params) => API.get('/tasks', { params }),
@@ -50,6 +55,64 @@ export const taskAPI = {
   updateTask: (id, taskData) => API.put(`/tasks/${id}/update/`, taskData),
   deleteTask: (id) => API.delete(`/tasks/${id}/delete/`),
   getStats: () => API.get('/tasks/stats'),
+  // Live task changes over Server-Sent Events; returns a function that closes the stream
+  subscribeEvents: (onEvent) => {
+    if (eventsUnavailable || !localStorage.getItem('token') || typeof EventSource === 'undefined') {
+      return () => {};
+    }
+    let source = null;
+    let retryTimer = null;
+    let closed = false;
+
+    const open = (reconnecting) => {
+      // EventSource cannot send the Authorization header, so trade the JWT
+      // for a single-use ticket rather than putting it in the URL
+      API.post('/tasks/events/ticket/')
+        .then((response) => {
+          if (closed) {
+            return;
+          }
+          source = new EventSource(
+            `${API.defaults.baseURL}/tasks/events?ticket=${encodeURIComponent(response.data.data.ticket)}`
+          );
+          TASK_EVENT_TYPES.forEach((type) => {
+            source.addEventListener(type, (event) => onEvent(type, JSON.parse(event.data)));
+          });
+          if (reconnecting) {
+            // Changes made while disconnected were missed
+            source.addEventListener('ready', () => onEvent('tasks.reset', {}));
+          }
+          // The ticket is spent, so the browser's own reconnect would be
+          // refused; reconnect with a fresh one instead
+          source.onerror = () => {
+            source.close();
+            retry();
+          };
+        })
+        .catch((error) => {
+          if (error.response?.status === 501) {
+            // This server does not stream events (WSGI workers)
+            eventsUnavailable = true;
+          } else if (!closed) {
+            retry();
+          }
+        });
+    };
+
+    const retry = () => {
+      clearTimeout(retryTimer);
+      retryTimer = setTimeout(() => open(true), EVENTS_RETRY_MS);
+    };
+
+    open(false);
+    return () => {
+      closed = true;
+      clearTimeout(retryTimer);
+      if (source) {
+        source.close();
+      }
+    };
+  },
 };
 
 // User API calls
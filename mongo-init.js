@@ -13,13 +13,27 @@ db.createUser({
   ]
 });
 
-// Create indexes for better performance
+// Create indexes for better performance (kept in sync with the MongoEngine models)
 db.users.createIndex({ "email": 1 }, { unique: true });
-db.users.createIndex({ "isActive": 1 });
+db.users.createIndex({ "google_id": 1 });
 
-db.tasks.createIndex({ "assignedTo": 1, "status": 1 });
-db.tasks.createIndex({ "createdBy": 1 });
-db.tasks.createIndex({ "dueDate": 1 });
-db.tasks.createIndex({ "createdAt": -1 });
+// get_tasks, newest first (page and cursor modes)
+db.tasks.createIndex({ "user_id": 1, "created_at": -1, "_id": -1 });
+// get_tasks filtered by status or priority
+db.tasks.createIndex({ "user_id": 1, "status": 1, "created_at": -1, "_id": -1 });
+db.tasks.createIndex({ "user_id": 1, "priority": 1, "created_at": -1, "_id": -1 });
+// get_task_stats and overdue counts
+db.tasks.createIndex({ "user_id": 1, "status": 1, "due_date": 1 });
+// Conditional GET validators and the changes feed
+db.tasks.createIndex({ "user_id": 1, "updated_at": 1, "_id": 1 });
+// get_tasks?q= full-text search, scoped by user_id
+db.tasks.createIndex(
+  { "user_id": 1, "title": "text", "description": "text" },
+  { name: "task_text_search", weights: { title: 10, description: 2 }, default_language: "english" }
+);
 
-print('Database initialized successfully');
\ No newline at end of file
+// Deleted-task tombstones for GET /api/tasks/changes/ (expire after 30 days)
+db.task_tombstones.createIndex({ "user_id": 1, "deleted_at": 1 });
+db.task_tombstones.createIndex({ "deleted_at": 1 }, { expireAfterSeconds: 30 * 24 * 60 * 60 });
+
+print('Database initialized successfully');